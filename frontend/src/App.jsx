@@ -5,7 +5,7 @@ import StatsCard from './components/StatsCard';
 import PerformanceChart from './components/PerformanceChart';
 import RiskHeatmap from './components/RiskHeatmap';
 import ReasoningChain from './components/ReasoningChain';
-import { fetchEvaluations, evaluateSample } from './services/api';
+import { fetchEvaluations, fetchEvaluationById, streamSampleEvaluation } from './services/api';
 
 function App() {
     const [contracts, setContracts] = useState([]);
@@ -48,12 +48,35 @@ function App() {
         };
 
         const sampleName = nameMap[contract.vendor_name];
-        if (!sampleName) return;
+        if (!sampleName) {
+            // The dashboard list leaves out justification; load the stored result
+            try {
+                const stored = await fetchEvaluationById(contract.contract_id);
+                setSelectedContract(prev =>
+                    prev && prev.contract_id === contract.contract_id ? { ...prev, ...stored } : prev
+                );
+            } catch (err) {
+                setError(err.message);
+            }
+            return;
+        }
+
+        // Reasoning steps are filled in as they stream from the server
+        setSelectedContract({ ...contract, reasoning_chain: [], recommendation: null });
+
+        const appendStep = ({ index, step }) => {
+            setSelectedContract(prev => {
+                if (!prev || prev.contract_id !== contract.contract_id) return prev;
+                const reasoningChain = [...(prev.reasoning_chain || [])];
+                reasoningChain[index] = step;
+                return { ...prev, reasoning_chain: reasoningChain };
+            });
+        };
 
         try {
             setAnalyzingId(contract.contract_id);
             setError(null);
-            const updatedData = await evaluateSample(sampleName);
+            const updatedData = await streamSampleEvaluation(sampleName, { onStep: appendStep });
             setContracts(prev => prev.map(c =>
                 c.contract_id === contract.contract_id ? updatedData : c
             ));
@@ -6,7 +6,8 @@ import React from 'react';
 import { Brain, Shield, Target, AlertCircle, TrendingUp, Info, CheckCircle2, Search, XCircle, Sparkles } from 'lucide-react';
 
 const ReasoningChain = ({ reasoning, isAnalyzing }) => {
-    if (isAnalyzing) {
+    // Skeleton until the first streamed reasoning step arrives
+    if (isAnalyzing && !reasoning?.reasoning_chain?.length) {
         return (
             <div className="card mt-2 border-t-2 border-t-daleel-500 animate-pulse">
                 <div className="flex items-center gap-4 mb-8 pb-6 border-b border-slate-700/50">
@@ -95,7 +96,7 @@ const ReasoningChain = ({ reasoning, isAnalyzing }) => {
                                     <div className="flex-shrink-0 w-8 h-8 bg-slate-800 border border-slate-700 rounded-full flex items-center justify-center group-hover:border-daleel-500/50 transition-colors">
                                         {getStepIcon(idx)}
                                     </div>
-                                    {idx < reasoning.reasoning_chain.length - 1 && (
+                                    {(idx < reasoning.reasoning_chain.length - 1 || isAnalyzing) && (
                                         <div className="w-0.5 h-full bg-slate-700 mt-2"></div>
                                     )}
                                 </div>
@@ -104,6 +105,17 @@ const ReasoningChain = ({ reasoning, isAnalyzing }) => {
                                 </div>
                             </div>
                         ))}
+                        {isAnalyzing && (
+                            <div className="flex gap-4 animate-pulse">
+                                <div className="flex-shrink-0 w-8 h-8 bg-slate-800 border border-slate-700 rounded-full flex items-center justify-center">
+                                    <Sparkles className="w-5 h-5 text-daleel-400 animate-spin-slow" />
+                                </div>
+                                <div className="flex-1 space-y-2 p-4">
+                                    <div className="h-4 bg-slate-800 rounded w-full"></div>
+                                    <div className="h-4 bg-slate-800 rounded w-3/4"></div>
+                                </div>
+                            </div>
+                        )}
                     </div>
                 </div>
 
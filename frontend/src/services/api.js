@@ -5,17 +5,51 @@
 
 const API_BASE_URL = '/api';
 
+// Columns the dashboard table renders; justification is fetched with
+// fetchEvaluationById when a contract is selected
+const DASHBOARD_FIELDS = [
+    'contract_id',
+    'vendor_name',
+    'performance_score',
+    'grade',
+    'risk_level',
+    'recommendation',
+    'status',
+    'timestamp',
+    'confidence_level'
+];
+
+const RESULTS_PAGE_SIZE = 500;
+
 /**
- * Fetch all evaluation results from backend
- * Endpoint: GET /results
+ * Fetch all evaluation results from backend, following pagination cursors
+ * Endpoint: GET /results?fields=...&limit=...&cursor=...
+ *
+ * Pages carry an ETag, so the browser revalidates unchanged pages with
+ * If-None-Match and gets a bodiless 304 back.
  */
-export const fetchEvaluations = async () => {
-    const response = await fetch(`${API_BASE_URL}/results`);
-    if (!response.ok) {
-        throw new Error('Failed to fetch evaluations');
-    }
-    const data = await response.json();
-    return data.results || [];
+export const fetchEvaluations = async (filters = {}) => {
+    const results = [];
+    let cursor = null;
+
+    do {
+        const params = new URLSearchParams({
+            fields: DASHBOARD_FIELDS.join(','),
+            limit: String(RESULTS_PAGE_SIZE),
+            ...filters
+        });
+        if (cursor) params.set('cursor', cursor);
+
+        const response = await fetch(`${API_BASE_URL}/results?${params}`);
+        if (!response.ok) {
+            throw new Error('Failed to fetch evaluations');
+        }
+        const data = await response.json();
+        results.push(...(data.results || []));
+        cursor = data.next_cursor;
+    } while (cursor);
+
+    return results;
 };
 
 /**
@@ -32,6 +66,36 @@ export const evaluateSample = async (sampleName) => {
     return await response.json();
 };
 
+/**
+ * Evaluate a sample contract, receiving reasoning steps as they are generated
+ * Endpoint: GET /evaluate-sample/{name}/stream (Server-Sent Events)
+ *
+ * Resolves with the evaluation summary once the final result arrives.
+ */
+export const streamSampleEvaluation = (sampleName, { onStep } = {}) => {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(`${API_BASE_URL}/evaluate-sample/${sampleName}/stream`);
+
+        source.addEventListener('step', (event) => {
+            if (onStep) {
+                onStep(JSON.parse(event.data));
+            }
+        });
+
+        source.addEventListener('result', (event) => {
+            source.close();
+            resolve(JSON.parse(event.data));
+        });
+
+        source.addEventListener('error', (event) => {
+            // Close so the browser does not reconnect and start another evaluation
+            source.close();
+            const detail = event.data ? JSON.parse(event.data).detail : null;
+            reject(new Error(detail || `Failed to evaluate vendor: ${sampleName}`));
+        });
+    });
+};
+
 /**
  * Fetch specific evaluation by contract ID
  * Endpoint: GET /results/{contract_id}
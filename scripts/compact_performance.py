@@ -0,0 +1,44 @@
+"""
+Performance History Compaction CLI
+Builds the memory-mapped columnar store from the per-contract performance CSVs
+
+Usage:
+    python scripts/compact_performance.py
+    python scripts/compact_performance.py --source data/performance --output data/performance_store
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ingestion import compact_performance
+from src.llm import load_config
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compact performance CSVs into the columnar store")
+    parser.add_argument("--source", default="data/performance", help="Folder with {contract_id}_history.csv files")
+    parser.add_argument("--output", help="Store directory (default: data.performance_store)")
+    parser.add_argument("--config", default="config.yaml", help="Path to configuration file")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    output = args.output or load_config(args.config).get("data", {}).get("performance_store")
+    if not output:
+        print("Error: no --output given and data.performance_store is not configured", file=sys.stderr)
+        return 1
+
+    stats = compact_performance(args.source, output)
+    print(
+        f"Compacted {stats['contracts']} contract(s), {stats['rows']} month(s): "
+        f"{stats['csv_bytes']:,} CSV bytes -> {stats['store_bytes']:,} store bytes in {output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
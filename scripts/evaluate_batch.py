@@ -0,0 +1,86 @@
+"""
+Batch Contract Evaluation CLI
+Evaluates a contract portfolio and writes one NDJSON line per contract
+
+Usage:
+    python scripts/evaluate_batch.py --dir data/samples --concurrency 4
+    python scripts/evaluate_batch.py --ids CNT-2024-001 CNT-2024-002
+    python scripts/evaluate_batch.py --force  # Include contracts whose inputs are unchanged
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm import load_config
+from src.pipeline import EvaluationPipeline, BatchEvaluator
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Evaluate a portfolio of contracts")
+    parser.add_argument("--ids", nargs="+", help="Contract IDs to evaluate (default: all in --dir)")
+    parser.add_argument("--dir", help="Folder with contract JSON files (default: data.sample_folder)")
+    parser.add_argument("--concurrency", type=int, help="Evaluations in flight (default: batch.concurrency)")
+    parser.add_argument("--config", default="config.yaml", help="Path to configuration file")
+    parser.add_argument("--output", help="Write NDJSON to this file instead of stdout")
+    parser.add_argument("--force", action="store_true", help="Re-evaluate contracts whose inputs have not changed")
+    parser.add_argument("--export-csv", help="Export all stored results to this CSV file afterwards")
+    return parser.parse_args()
+
+
+async def run_batch(args, out) -> int:
+    pipeline = EvaluationPipeline.from_config(args.config)
+    batch_config = load_config(args.config).get("batch", {})
+    concurrency = args.concurrency or batch_config.get("concurrency", 4)
+    
+    contracts, missing = pipeline.load_contracts(args.ids, args.dir)
+    for contract_id in missing:
+        out.write(json.dumps({"contract_id": contract_id, "status": "not_found"}) + "\n")
+    
+    contracts, unchanged = await asyncio.to_thread(pipeline.select_changed, contracts, args.force)
+    for contract_id in unchanged:
+        out.write(json.dumps({"contract_id": contract_id, "status": "unchanged"}) + "\n")
+    
+    failures = len(missing)
+    evaluator = BatchEvaluator(
+        pipeline,
+        concurrency=concurrency,
+        loader_threads=batch_config.get("loader_threads", 8),
+        loader_processes=batch_config.get("loader_processes")
+    )
+    async for result in evaluator.run(contracts, refresh=args.force):
+        if result["status"] != "completed":
+            failures += 1
+        out.write(json.dumps(pipeline.summarize(result)) + "\n")
+        out.flush()
+    
+    print(
+        f"Evaluated {len(contracts)} contract(s), skipped {len(unchanged)} unchanged, "
+        f"{failures} failed or missing",
+        file=sys.stderr
+    )
+    
+    if args.export_csv:
+        exported = await asyncio.to_thread(pipeline.result_store.export_csv, args.export_csv)
+        print(f"Exported results to {exported}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    args = parse_args()
+    
+    with contextlib.ExitStack() as stack:
+        out = stack.enter_context(open(args.output, "w", encoding="utf-8")) if args.output else sys.stdout
+        
+        # Agent progress messages go to stderr so stdout stays valid NDJSON
+        stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        return asyncio.run(run_batch(args, out))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,16 @@ from .data_intake import DataIntakeAgent
 from .performance_analysis import PerformanceAnalysisAgent
 from .risk_assessment import RiskAssessmentAgent
 from .reasoning_agent import ReasoningAgent
+from .kpi_scoring import KPIScoringEngine
+from .narrative import NARRATIVE_MODES, narrative_mode
 
 __all__ = [
     "OrchestratorAgent",
     "DataIntakeAgent", 
     "PerformanceAnalysisAgent",
     "RiskAssessmentAgent",
-    "ReasoningAgent"
+    "ReasoningAgent",
+    "KPIScoringEngine",
+    "NARRATIVE_MODES",
+    "narrative_mode"
 ]
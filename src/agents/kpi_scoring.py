@@ -0,0 +1,253 @@
+"""
+Vectorized KPI Scoring
+Scores a whole portfolio's KPIs in bulk with the same rules as PerformanceAnalysisAgent
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class KPIScoringEngine:
+    """
+    Columnar counterpart of PerformanceAnalysisAgent.score()
+    
+    All KPIs of all contracts are flattened into arrays (contract index,
+    target, actual, direction flag) and scored, checked for compliance and
+    graded with array operations. Results are identical to the scalar
+    path: per-KPI scores are rounded the way round() rounds, and overall
+    scores are summed in the same left-to-right order.
+    """
+    
+    def __init__(self, grade_thresholds: Tuple[Tuple[float, str], ...], pass_score: float):
+        """
+        Initialize engine
+        
+        Args:
+            grade_thresholds: (minimum score, grade) pairs, highest first
+            pass_score: Minimum KPI score for PASS compliance
+        """
+        self.grade_thresholds = grade_thresholds
+        self.pass_score = pass_score
+    
+    def flatten(self, contracts: List[Dict]) -> pd.DataFrame:
+        """
+        Flatten every contract's KPIs into one columnar table
+        
+        Args:
+            contracts: Contract dictionaries
+        
+        Returns:
+            DataFrame with one row per KPI: contract (index into contracts),
+            kpi_name, target, actual, unit and higher_is_better
+        """
+        return _kpi_frame(_flatten(contracts))
+    
+    def score_frame(self, contracts: List[Dict]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Score a portfolio into DataFrames only (no per-KPI dictionaries or reasons)
+        
+        Args:
+            contracts: Contract dictionaries
+        
+        Returns:
+            Tuple of (KPI table from flatten() plus score and compliance
+            columns; portfolio table with one row per contract: contract_id,
+            vendor_name, overall_score, grade, kpi_count and kpis_failed)
+        """
+        columns = _flatten(contracts)
+        scored = self._score_columns(columns, len(contracts))
+        
+        kpis = _kpi_frame(columns)
+        kpis["score"] = scored["scores"]
+        kpis["compliance"] = np.where(scored["passed"], "PASS", "FAIL")
+        return kpis, self._portfolio(contracts, scored)
+    
+    def score(self, contracts: List[Dict]) -> Tuple[List[Dict], pd.DataFrame]:
+        """
+        Score a portfolio
+        
+        Args:
+            contracts: Contract dictionaries
+        
+        Returns:
+            Tuple of (per-contract results in input order, each equal to
+            PerformanceAnalysisAgent.score(); portfolio table as returned
+            by score_frame())
+        """
+        columns = _flatten(contracts)
+        scored = self._score_columns(columns, len(contracts))
+        return self._build_results(columns, scored), self._portfolio(contracts, scored)
+    
+    def _score_columns(self, columns: Dict, contract_count: int) -> Dict[str, np.ndarray]:
+        """Compute KPI scores, compliance, overall scores and grades"""
+        contract = columns["contract"]
+        target = np.asarray(columns["target"], dtype=np.float64)
+        actual = np.asarray(columns["actual"], dtype=np.float64)
+        higher = columns["higher_is_better"]
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            higher_ratio = (actual / target) * 100
+            lower_ratio = (target / actual) * 100
+        higher_score = np.minimum(100, higher_ratio)
+        lower_score = np.where(actual == 0, 100, np.maximum(0, np.minimum(100, lower_ratio)))
+        raw_scores = np.where(target == 0, 0.0, np.where(higher, higher_score, lower_score))
+        
+        # Scores clamped to 0 or 100 are ints on the scalar path (min/max return the int bound)
+        clamped = (target == 0) | np.where(
+            higher,
+            higher_ratio >= 100,
+            (actual == 0) | (lower_ratio >= 100) | (lower_ratio <= 0)
+        )
+        
+        scores = round_like_builtin(raw_scores, 1)
+        passed = raw_scores >= self.pass_score
+        counts = np.bincount(contract, minlength=contract_count)
+        
+        # Overall score: mean of the rounded KPI scores, summed left to right
+        # per contract (one vectorized add per KPI position, not per KPI)
+        starts = np.cumsum(counts) - counts
+        positions = np.arange(len(contract)) - starts[contract]
+        matrix = np.zeros((contract_count, counts.max(initial=0)))
+        matrix[contract, positions] = scores
+        totals = np.zeros(contract_count)
+        for column in matrix.T:
+            totals += column
+        with np.errstate(divide="ignore", invalid="ignore"):
+            overall = np.where(counts > 0, totals / counts, 0.0)
+        
+        grades = np.select(
+            [overall >= threshold for threshold, _ in self.grade_thresholds],
+            [grade for _, grade in self.grade_thresholds],
+            default="F"
+        ).astype(object)
+        grades[counts == 0] = "F"
+        
+        return {
+            "scores": scores,
+            "clamped": clamped,
+            "passed": passed,
+            "counts": counts,
+            "failed": np.bincount(contract, weights=~passed, minlength=contract_count).astype(np.int64),
+            "overall": round_like_builtin(overall, 1),
+            "grades": grades
+        }
+    
+    def _portfolio(self, contracts: List[Dict], scored: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """One row per contract"""
+        return pd.DataFrame({
+            "contract_id": [contract.get("contract_id") for contract in contracts],
+            "vendor_name": [contract.get("vendor_name") for contract in contracts],
+            "overall_score": scored["overall"],
+            "grade": scored["grades"],
+            "kpi_count": scored["counts"],
+            "kpis_failed": scored["failed"]
+        })
+    
+    def _build_results(self, columns: Dict, scored: Dict[str, np.ndarray]) -> List[Dict]:
+        """Assemble per-contract result dictionaries from the scored columns"""
+        results = [
+            {"overall_score": overall, "grade": grade, "kpi_scores": []}
+            if count else
+            {"overall_score": 0, "grade": "F", "kpi_scores": [], "justification": "No KPIs available for evaluation"}
+            for overall, grade, count in zip(scored["overall"].tolist(), scored["grades"].tolist(), scored["counts"].tolist())
+        ]
+        
+        rows = zip(
+            columns["contract"].tolist(), columns["kpi_name"], columns["target"], columns["actual"],
+            columns["unit"], columns["higher_is_better"].tolist(), scored["scores"].tolist(),
+            scored["clamped"].tolist(), scored["passed"].tolist()
+        )
+        for contract, name, target, actual, unit, higher_is_better, score, clamped, passed in rows:
+            results[contract]["kpi_scores"].append({
+                "kpi_name": name,
+                "target": target,
+                "actual": actual,
+                "unit": unit,
+                "score": int(score) if clamped else score,
+                "compliance": "PASS" if passed else "FAIL",
+                "reason": kpi_reason(target, actual, unit, higher_is_better)
+            })
+        return results
+
+
+def is_higher_better(name: str) -> bool:
+    """Lower is better for time-based KPIs (e.g. response time), except satisfaction scores"""
+    name = name.lower()
+    return "time" not in name or "satisfaction" in name
+
+
+def kpi_reason(target, actual, unit: str, higher_is_better: bool) -> str:
+    """
+    Describe a KPI result against its target
+    
+    Args:
+        target: Target value
+        actual: Actual value
+        unit: Unit label
+        higher_is_better: Whether exceeding the target is good
+    
+    Returns:
+        Short reason such as "Exceeded target by 1.2% (99.7% vs 98.5%)"
+    """
+    if higher_is_better:
+        diff = actual - target
+        diff_pct = (diff / target) * 100 if target > 0 else 0
+        if diff >= 0:
+            return f"Exceeded target by {abs(diff_pct):.1f}% ({actual}{unit} vs {target}{unit})"
+        return f"Below target by {abs(diff_pct):.1f}% ({actual}{unit} vs {target}{unit})"
+    
+    diff = target - actual
+    if diff >= 0:
+        return f"Better than target by {abs(diff):.1f}{unit} ({actual}{unit} vs {target}{unit})"
+    return f"Worse than target by {abs(diff):.1f}{unit} ({actual}{unit} vs {target}{unit})"
+
+
+def round_like_builtin(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Round an array exactly as round() rounds each element
+    
+    np.round scales by 10**ndigits before rounding, which can land on the
+    other side of a tie than the correctly rounded result. Values that are
+    that close to a tie are re-rounded with round().
+    """
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    near_tie = np.isfinite(scaled) & (np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6)
+    for index in np.flatnonzero(near_tie):
+        rounded[index] = round(float(values[index]), ndigits)
+    return rounded
+
+
+def _kpi_frame(columns: Dict) -> pd.DataFrame:
+    return pd.DataFrame({
+        "contract": columns["contract"],
+        "kpi_name": columns["kpi_name"],
+        "target": pd.Series(columns["target"], dtype=object),
+        "actual": pd.Series(columns["actual"], dtype=object),
+        "unit": columns["unit"],
+        "higher_is_better": columns["higher_is_better"]
+    })
+
+
+def _flatten(contracts: List[Dict]) -> Dict:
+    """KPI columns as lists (original target/actual objects) and index/flag arrays"""
+    contract, names, targets, actuals, units = [], [], [], [], []
+    for index, item in enumerate(contracts):
+        for kpi in item.get("kpis") or []:
+            contract.append(index)
+            names.append(kpi.get("name", "Unknown KPI"))
+            targets.append(kpi.get("target", 0))
+            actuals.append(kpi.get("actual", 0))
+            units.append(kpi.get("unit", ""))
+    
+    # KPI names repeat across a portfolio; classify each distinct name once
+    directions = {name: is_higher_better(name) for name in set(names)}
+    return {
+        "contract": np.array(contract, dtype=np.int64),
+        "kpi_name": names,
+        "target": targets,
+        "actual": actuals,
+        "unit": units,
+        "higher_is_better": np.fromiter((directions[name] for name in names), dtype=bool, count=len(names))
+    }
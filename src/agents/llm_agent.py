@@ -0,0 +1,67 @@
+"""
+LLM Agent Mixin
+Resolves an agent's LLM provider and settings through the shared registry
+"""
+from typing import Callable, Optional
+from src.agents.narrative import current_narrative_mode
+from src.llm import LLMProvider, get_llm_provider, get_llm_config, load_config
+
+
+class LLMAgentMixin:
+    """
+    Gives an agent llm_provider / llm_config properties backed by the
+    process-wide provider registry
+    
+    Nothing is captured at construction, so every call uses the provider
+    for the current config.yaml. Assigning llm_provider pins a specific
+    provider instead (e.g. a stub in tests).
+    
+    Agents set LLM_TASK to the name of their llm.profiles entry, which
+    selects the model, token cap and temperature for their prompt.
+    """
+    
+    LLM_TASK: Optional[str] = None
+    
+    def _init_llm(self, config_path: str) -> None:
+        """
+        Bind the agent to a configuration file
+        
+        Args:
+            config_path: Path to configuration file
+        """
+        self.config_path = config_path
+        self._llm_override: Optional[LLMProvider] = None
+        
+        # Fail fast on invalid provider settings (e.g. a missing API key)
+        get_llm_provider(config_path, self.LLM_TASK)
+    
+    @property
+    def llm_provider(self) -> LLMProvider:
+        """LLM provider for the current configuration"""
+        return self._llm_override or get_llm_provider(self.config_path, self.LLM_TASK)
+    
+    @llm_provider.setter
+    def llm_provider(self, provider: Optional[LLMProvider]) -> None:
+        self._llm_override = provider
+    
+    @property
+    def llm_config(self) -> dict:
+        """Temperature / max_tokens for the current configuration and task profile"""
+        return get_llm_config(self.config_path, self.LLM_TASK)
+    
+    def _wants_llm_narrative(self, is_borderline: Callable[[float], bool]) -> bool:
+        """
+        Decide whether narrative text comes from the LLM or from templates
+        
+        Args:
+            is_borderline: Called with narrative.boundary_margin; True when the
+                case sits near a grade or risk boundary
+            
+        Returns:
+            True to call the LLM (mode "llm", or "auto" for a borderline case)
+        """
+        narrative_config = load_config(self.config_path).get("narrative", {})
+        mode = current_narrative_mode(narrative_config.get("mode", "llm"))
+        if mode == "auto":
+            return is_borderline(narrative_config.get("boundary_margin", 2.0))
+        return mode == "llm"
@@ -0,0 +1,158 @@
+"""
+Narrative Templates
+Deterministic performance and risk summaries built from computed scores
+"""
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# deterministic: templates only; llm: always ask the LLM; auto: LLM only near a boundary
+NARRATIVE_MODES = ("deterministic", "llm", "auto")
+
+# Set inside narrative_mode(): overrides the configured mode for this request
+_override: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("narrative_mode", default=None)
+
+GRADE_VERDICTS = {
+    "A": "exceeding expectations",
+    "B": "meeting expectations",
+    "C": "partially meeting expectations",
+    "D": "falling short of expectations",
+    "F": "failing to meet expectations"
+}
+
+# How KPI values are written for each unit in the sample contracts
+UNIT_FORMATS = {
+    "percentage": "{}%",
+    "%": "{}%",
+    "hours": "{}h",
+    "rating": "{}"
+}
+
+NO_RISK_FACTORS = "No significant risk factors identified"
+
+
+@contextmanager
+def narrative_mode(mode: Optional[str]) -> Iterator[None]:
+    """
+    Override the configured narrative mode for work done inside this block
+    
+    Applies to the current thread/task and anything it starts. None keeps
+    the configured mode.
+    
+    Args:
+        mode: "deterministic", "llm", "auto" or None
+    """
+    if mode is not None and mode not in NARRATIVE_MODES:
+        raise ValueError(f"Unknown narrative mode: {mode}. Use {', '.join(NARRATIVE_MODES)}.")
+    
+    token = _override.set(mode)
+    try:
+        yield
+    finally:
+        _override.reset(token)
+
+
+def current_narrative_mode(default: str = "llm") -> str:
+    """Narrative mode for the current request (override, else the given default)"""
+    return _override.get() or default
+
+
+def is_near(value: float, thresholds: Iterable[float], margin: float) -> bool:
+    """Whether value lies within margin of any threshold"""
+    return any(abs(value - threshold) <= margin for threshold in thresholds)
+
+
+def describe_performance(
+    vendor_name: str,
+    overall_score: float,
+    grade: str,
+    kpi_scores: List[Dict]
+) -> str:
+    """
+    Summarize KPI results in two sentences
+    
+    Args:
+        vendor_name: Vendor name
+        overall_score: Overall performance score
+        grade: Letter grade for the score
+        kpi_scores: KPI score dictionaries from PerformanceAnalysisAgent
+    
+    Returns:
+        Summary naming the grade, pass count and the KPIs that drove it
+    """
+    passed = [k for k in kpi_scores if k["compliance"] == "PASS"]
+    failed = sorted((k for k in kpi_scores if k["compliance"] != "PASS"), key=lambda k: k["score"])
+    
+    summary = (
+        f"{vendor_name} scored {overall_score:.0f}/100 (grade {grade}), "
+        f"{GRADE_VERDICTS.get(grade, 'against expectations')}, "
+        f"with {len(passed)} of {len(kpi_scores)} KPIs passing."
+    )
+    
+    if failed:
+        shortfalls = [f"{k['kpi_name']} ({_kpi_result(k)})" for k in failed[:3]]
+        if len(failed) > 3:
+            shortfalls.append(f"{len(failed) - 3} more")
+        label = "Shortfall" if len(failed) == 1 else "Shortfalls"
+        return f"{summary} {label}: {_join(shortfalls)}."
+    
+    weakest = min(kpi_scores, key=lambda k: k["score"])
+    if weakest["score"] >= 100:
+        return f"{summary} Every KPI met or exceeded its target."
+    return f"{summary} The closest to missing its target was {weakest['kpi_name']} ({_kpi_result(weakest)})."
+
+
+def describe_risk(
+    vendor_name: str,
+    risk_level: str,
+    risk_factors: List[str],
+    recommendation: Optional[str] = None,
+    metrics: Optional[Dict] = None
+) -> str:
+    """
+    Explain a risk classification in one sentence
+    
+    Args:
+        vendor_name: Vendor name
+        risk_level: Risk level (LOW/MEDIUM/HIGH)
+        risk_factors: Risk factors from RiskAssessmentAgent
+        recommendation: Recommended contract action, if known
+        metrics: Risk metrics (performance_score is quoted when there are no factors)
+    
+    Returns:
+        Explanation naming every factor behind the classification
+    """
+    factors = [factor for factor in risk_factors if factor != NO_RISK_FACTORS]
+    
+    if factors:
+        sentence = f"{vendor_name} is rated {risk_level} risk due to {_join([_lower_first(f) for f in factors])}"
+    else:
+        sentence = f"{vendor_name} is rated {risk_level} risk with no significant risk factors"
+        score = (metrics or {}).get("performance_score")
+        if score is not None:
+            sentence += f" and a performance score of {score:.0f}/100"
+    
+    if recommendation:
+        sentence += f"; recommended action: {recommendation}"
+    return sentence + "."
+
+
+def _kpi_result(kpi: Dict) -> str:
+    unit = kpi.get("unit", "")
+    return f"{_format_value(kpi['actual'], unit)} against a target of {_format_value(kpi['target'], unit)}"
+
+
+def _format_value(value, unit: str) -> str:
+    number = f"{value:g}" if isinstance(value, (int, float)) else str(value)
+    return UNIT_FORMATS.get(unit, "{} " + unit if unit else "{}").format(number)
+
+
+def _lower_first(text: str) -> str:
+    return text[:1].lower() + text[1:]
+
+
+def _join(items: List[str]) -> str:
+    """Join as "a", "a and b" or "a, b and c" """
+    if len(items) <= 1:
+        return "".join(items)
+    return ", ".join(items[:-1]) + " and " + items[-1]
@@ -2,12 +2,16 @@
 Orchestrator Agent
 Coordinates agent workflow, manages state, and enforces audit compliance
 """
+import asyncio
 import json
 import hashlib
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
+from src.audit import AuditLogReader, AuditLogWriter, get_audit_writer
+from src.ingestion.document_loader import ContractBundle
+
 
 class OrchestratorAgent:
     """
@@ -15,20 +19,36 @@ class OrchestratorAgent:
     Manages routing, state, retry logic, and audit logging
     """
     
-    def __init__(self, audit_log_path: str = "data/audit_logs.jsonl", max_retries: int = 3):
+    def __init__(
+        self,
+        audit_log_path: str = "data/audit_logs.jsonl",
+        max_retries: int = 3,
+        step_timeouts: Optional[Dict[str, float]] = None,
+        default_step_timeout: Optional[float] = None,
+        audit_writer: Optional[AuditLogWriter] = None
+    ):
         """
         Initialize orchestrator
         
         Args:
             audit_log_path: Path to audit log file
             max_retries: Maximum retry attempts for failed operations
+            step_timeouts: Per-step LLM timeouts in seconds, keyed by step name
+                (performance_justification, risk_reason, reasoning)
+            default_step_timeout: Timeout for LLM steps not listed in step_timeouts
+            audit_writer: Background writer for the audit log (default: the
+                shared writer for audit_log_path)
         """
         self.audit_log_path = Path(audit_log_path)
         self.max_retries = max_retries
+        self.step_timeouts = step_timeouts or {}
+        self.default_step_timeout = default_step_timeout
         self.workflow_state = {}
         
         # Ensure audit log directory exists
         self.audit_log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.audit_writer = audit_writer or get_audit_writer(str(self.audit_log_path))
+        self.audit_reader = AuditLogReader(str(self.audit_log_path))
     
     def log_action(
         self,
@@ -37,7 +57,8 @@ class OrchestratorAgent:
         input_data: Dict,
         output_data: Dict,
         confidence: float = 1.0,
-        human_override: bool = False
+        human_override: bool = False,
+        contract_id: Optional[str] = None
     ) -> None:
         """
         Log agent action to immutable audit trail
@@ -49,6 +70,7 @@ class OrchestratorAgent:
             output_data: Output data dictionary
             confidence: Confidence score (0.0-1.0)
             human_override: Whether human overrode the decision
+            contract_id: Contract the action relates to (indexed for filtering)
         """
         log_entry = {
             "timestamp": datetime.utcnow().isoformat() + "Z",
@@ -59,10 +81,11 @@ class OrchestratorAgent:
             "confidence": round(confidence, 3),
             "human_override": human_override
         }
+        if contract_id:
+            log_entry["contract_id"] = contract_id
         
-        # Append to JSONL file (append-only, immutable)
-        with open(self.audit_log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        # Queued for the background writer (append-only, hash-chained segments)
+        self.audit_writer.write(log_entry)
     
     def _hash_data(self, data: Dict) -> str:
         """Generate SHA256 hash of data for audit trail"""
@@ -103,32 +126,41 @@ class OrchestratorAgent:
             action="escalate_to_human",
             input_data=context,
             output_data=escalation,
-            confidence=0.0  # Escalation means low confidence
+            confidence=0.0,  # Escalation means low confidence
+            contract_id=context.get("contract_id")
         )
         
         return escalation
     
-    def get_audit_trail(self, contract_id: Optional[str] = None) -> List[Dict]:
+    def get_audit_trail(
+        self,
+        contract_id: Optional[str] = None,
+        agent: Optional[str] = None,
+        action: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> List[Dict]:
         """
         Retrieve audit trail entries
         
         Args:
             contract_id: Optional filter by contract ID
+            agent: Optional filter by agent name
+            action: Optional filter by action
+            date_from: Optional earliest date (YYYY-MM-DD, inclusive)
+            date_to: Optional latest date (YYYY-MM-DD, inclusive)
             
         Returns:
-            List of audit log entries
+            List of audit log entries, oldest first
         """
-        if not self.audit_log_path.exists():
-            return []
-        
-        entries = []
-        with open(self.audit_log_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    entry = json.loads(line)
-                    entries.append(entry)
-        
-        return entries
+        self.audit_writer.flush()
+        return self.audit_reader.read_all({
+            "contract_id": contract_id,
+            "agent": agent,
+            "action": action,
+            "date_from": date_from,
+            "date_to": date_to
+        })
     
     def evaluate_contract(
         self,
@@ -146,84 +178,315 @@ class OrchestratorAgent:
         Returns:
             Evaluation result dictionary
         """
-        contract_id = contract.get("contract_id", "unknown")
-        vendor_name = contract.get("vendor_name", "unknown")
-        
-        result = {
-            "contract_id": contract_id,
-            "vendor_name": vendor_name,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "status": "in_progress",
-            "steps": []
-        }
+        result = self._start_evaluation(contract)
         
         try:
             # Step 1: Data Intake (validate contract)
-            data_intake_agent = agents.get("data_intake")
-            if data_intake_agent:
-                intake_result = data_intake_agent.process(contract)
-                result["steps"].append({
-                    "agent": "data_intake",
-                    "status": "completed",
-                    "output": intake_result
-                })
-                
-                # Check if validation failed
-                if not intake_result.get("valid", True):
-                    result["status"] = "failed"
-                    result["error"] = "Data validation failed"
-                    return result
+            if not self._run_data_intake(contract, agents, result):
+                return result
             
             # Step 2: Performance Analysis
             performance_agent = agents.get("performance")
             if performance_agent:
-                performance_result = performance_agent.evaluate(contract)
-                result["steps"].append({
-                    "agent": "performance_analysis",
-                    "status": "completed",
-                    "output": performance_result
-                })
-                result["performance_score"] = performance_result.get("overall_score", 0)
+                self._record_performance(result, performance_agent.evaluate(contract))
             
             # Step 3: Risk Assessment
             risk_agent = agents.get("risk")
             if risk_agent:
                 # Pass performance results to risk agent
-                risk_input = {
-                    "contract": contract,
-                    "performance_score": result.get("performance_score", 0)
-                }
-                risk_result = risk_agent.assess(risk_input)
-                result["steps"].append({
-                    "agent": "risk_assessment",
-                    "status": "completed",
-                    "output": risk_result
-                })
-                result["risk_level"] = risk_result.get("risk_level", "UNKNOWN")
-                result["recommendation"] = risk_result.get("recommendation", "REVIEW")
+                risk_result = risk_agent.assess(self._risk_input(contract, result))
+                self._record_risk(result, risk_result)
+            
+            # Step 4: Deep reasoning (LLM synthesis across all sources)
+            reasoning_agent = agents.get("reasoning")
+            if reasoning_agent:
+                try:
+                    self._record_reasoning(result, reasoning_agent.evaluate(result["contract_id"]))
+                except Exception as reasoning_err:
+                    print(f"Reasoning evaluation failed (non-critical): {reasoning_err}")
             
             result["status"] = "completed"
             
         except Exception as e:
-            result["status"] = "error"
-            result["error"] = str(e)
-            
-            # Log error
-            self.log_action(
-                agent_name="orchestrator",
-                action="evaluate_contract_error",
-                input_data={"contract_id": contract_id},
-                output_data={"error": str(e)},
-                confidence=0.0
+            self._record_error(result, e)
+        
+        self._log_evaluation(result)
+        return result
+    
+    async def aevaluate_contract(
+        self,
+        contract: Dict,
+        agents: Dict[str, Any],
+        on_reasoning_step: Optional[Callable[[int, str], None]] = None,
+        bundle: Optional[ContractBundle] = None
+    ) -> Dict:
+        """
+        Orchestrate contract evaluation as a dependency graph of steps
+        
+        Rule-based scoring runs first (microseconds). The three LLM
+        generations - performance justification, risk reason and deep
+        reasoning - only depend on that scoring or on the source files,
+        so they are dispatched concurrently, each with its own timeout.
+        End-to-end latency is bounded by the slowest call rather than
+        the sum of all three.
+        
+        Step graph:
+            performance_score -> risk_classification
+            performance_score -> performance_justification (LLM)
+            risk_classification -> risk_reason (LLM)
+            reasoning (LLM, depends only on source files)
+        
+        Args:
+            contract: Contract data dictionary
+            agents: Dictionary of initialized agents
+                Expected keys: 'data_intake', 'performance', 'risk',
+                optionally 'reasoning'
+            on_reasoning_step: Called with (index, step) as each deep
+                reasoning step streams in
+            bundle: Source data already loaded for deep reasoning (e.g.
+                from DocumentLoader.load_bundles()); loaded on demand if omitted
+        
+        Returns:
+            Evaluation result dictionary
+        """
+        result = self._start_evaluation(contract)
+        
+        try:
+            # Validation gates every other step
+            if not self._run_data_intake(contract, agents, result):
+                return result
+            
+            outputs = await self._run_step_graph(
+                self._build_step_graph(contract, agents, on_reasoning_step, bundle)
             )
+            
+            if "performance_score" in outputs:
+                performance_result = outputs["performance_score"]
+                if "performance_justification" in outputs:
+                    performance_result["justification"] = outputs["performance_justification"]
+                self._record_performance(result, performance_result)
+            
+            if "risk_classification" in outputs:
+                risk_result = outputs["risk_classification"]
+                if "risk_reason" in outputs:
+                    risk_result["reason"] = outputs["risk_reason"]
+                self._record_risk(result, risk_result)
+            
+            if outputs.get("reasoning") is not None:
+                self._record_reasoning(result, outputs["reasoning"])
+            
+            result["status"] = "completed"
+            
+        except Exception as e:
+            self._record_error(result, e)
+        
+        self._log_evaluation(result)
+        return result
+    
+    def _build_step_graph(
+        self,
+        contract: Dict,
+        agents: Dict[str, Any],
+        on_reasoning_step: Optional[Callable[[int, str], None]] = None,
+        bundle: Optional[ContractBundle] = None
+    ) -> Dict[str, Tuple[List[str], Callable[[Dict], Awaitable[Any]]]]:
+        """
+        Build the evaluation step graph for the available agents
+        
+        Returns:
+            Mapping of step name -> (dependency names, async step function).
+            Each step function receives the outputs of its dependencies.
+        """
+        steps = {}
+        performance_agent = agents.get("performance")
+        risk_agent = agents.get("risk")
+        reasoning_agent = agents.get("reasoning")
+        
+        if performance_agent:
+            async def performance_score(deps):
+                return performance_agent.score(contract)
+            
+            async def performance_justification(deps):
+                return await performance_agent.ajustify(
+                    contract,
+                    deps["performance_score"],
+                    timeout=self._step_timeout("performance_justification")
+                )
+            
+            steps["performance_score"] = ([], performance_score)
+            steps["performance_justification"] = (["performance_score"], performance_justification)
         
-        # Log final result
+        if risk_agent:
+            risk_deps = ["performance_score"] if performance_agent else []
+            
+            async def risk_classification(deps):
+                score = deps["performance_score"]["overall_score"] if performance_agent else 0
+                return risk_agent.classify({"contract": contract, "performance_score": score})
+            
+            async def risk_reason(deps):
+                return await risk_agent.aexplain(
+                    contract,
+                    deps["risk_classification"],
+                    timeout=self._step_timeout("risk_reason")
+                )
+            
+            steps["risk_classification"] = (risk_deps, risk_classification)
+            steps["risk_reason"] = (["risk_classification"], risk_reason)
+        
+        if reasoning_agent:
+            async def reasoning(deps):
+                try:
+                    return await reasoning_agent.aevaluate(
+                        contract.get("contract_id", "unknown"),
+                        timeout=self._step_timeout("reasoning"),
+                        on_step=on_reasoning_step,
+                        bundle=bundle
+                    )
+                except Exception as reasoning_err:
+                    print(f"Reasoning evaluation failed (non-critical): {reasoning_err}")
+                    return None
+            
+            steps["reasoning"] = ([], reasoning)
+        
+        return steps
+    
+    async def _run_step_graph(
+        self,
+        steps: Dict[str, Tuple[List[str], Callable[[Dict], Awaitable[Any]]]]
+    ) -> Dict[str, Any]:
+        """
+        Run a step graph, starting each step as soon as its dependencies finish
+        
+        Args:
+            steps: Mapping of step name -> (dependency names, async step function)
+            
+        Returns:
+            Mapping of step name -> step output
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        async def run_step(name: str) -> Any:
+            dependencies, step_fn = steps[name]
+            deps = {dep: await tasks[dep] for dep in dependencies}
+            return await step_fn(deps)
+        
+        # All tasks exist before any of them starts running, so every
+        # dependency lookup in run_step() succeeds
+        for name in steps:
+            tasks[name] = asyncio.ensure_future(run_step(name))
+        
+        try:
+            await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        
+        return {name: task.result() for name, task in tasks.items()}
+    
+    def _step_timeout(self, step_name: str) -> Optional[float]:
+        """Get the configured timeout for an LLM step"""
+        return self.step_timeouts.get(step_name, self.default_step_timeout)
+    
+    def _start_evaluation(self, contract: Dict) -> Dict:
+        """Create the initial evaluation result record"""
+        return {
+            "contract_id": contract.get("contract_id", "unknown"),
+            "vendor_name": contract.get("vendor_name", "unknown"),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "status": "in_progress",
+            "steps": []
+        }
+    
+    def _run_data_intake(self, contract: Dict, agents: Dict[str, Any], result: Dict) -> bool:
+        """
+        Run data intake validation
+        
+        Returns:
+            False if validation failed and the workflow must stop
+        """
+        data_intake_agent = agents.get("data_intake")
+        if data_intake_agent:
+            intake_result = data_intake_agent.process(contract)
+            result["steps"].append({
+                "agent": "data_intake",
+                "status": "completed",
+                "output": intake_result
+            })
+            
+            # Check if validation failed
+            if not intake_result.get("valid", True):
+                result["status"] = "failed"
+                result["error"] = "Data validation failed"
+                return False
+        return True
+    
+    def _record_performance(self, result: Dict, performance_result: Dict) -> None:
+        """Attach performance analysis output to the result"""
+        result["steps"].append({
+            "agent": "performance_analysis",
+            "status": "completed",
+            "output": performance_result
+        })
+        result["performance_score"] = performance_result.get("overall_score", 0)
+    
+    def _risk_input(self, contract: Dict, result: Dict) -> Dict:
+        """Build risk agent input from the contract and performance score"""
+        return {
+            "contract": contract,
+            "performance_score": result.get("performance_score", 0)
+        }
+    
+    def _record_risk(self, result: Dict, risk_result: Dict) -> None:
+        """Attach risk assessment output to the result"""
+        result["steps"].append({
+            "agent": "risk_assessment",
+            "status": "completed",
+            "output": risk_result
+        })
+        result["risk_level"] = risk_result.get("risk_level", "UNKNOWN")
+        result["recommendation"] = risk_result.get("recommendation", "REVIEW")
+    
+    def _record_reasoning(self, result: Dict, reasoning_result: Dict) -> None:
+        """Merge deep reasoning output into the result"""
+        result["steps"].append({
+            "agent": "reasoning",
+            "status": "completed",
+            "output": {
+                key: value for key, value in reasoning_result.items()
+                if key != "raw_llm_response"
+            }
+        })
+        result["reasoning_chain"] = reasoning_result.get("reasoning_chain", [])
+        result["justification"] = reasoning_result.get("justification", "")
+        result["confidence_level"] = reasoning_result.get("confidence_level", "LOW")
+        
+        # Prefer the reasoning recommendation as it's more "agentic"
+        if reasoning_result.get("recommendation"):
+            result["recommendation"] = reasoning_result["recommendation"]
+    
+    def _record_error(self, result: Dict, error: Exception) -> None:
+        """Mark the evaluation as errored and log it"""
+        result["status"] = "error"
+        result["error"] = str(error)
+        
+        # Log error
+        self.log_action(
+            agent_name="orchestrator",
+            action="evaluate_contract_error",
+            input_data={"contract_id": result["contract_id"]},
+            output_data={"error": str(error)},
+            confidence=0.0,
+            contract_id=result["contract_id"]
+        )
+    
+    def _log_evaluation(self, result: Dict) -> None:
+        """Log final evaluation result"""
         self.log_action(
             agent_name="orchestrator",
             action="evaluate_contract",
-            input_data={"contract_id": contract_id, "vendor_name": vendor_name},
+            input_data={"contract_id": result["contract_id"], "vendor_name": result["vendor_name"]},
             output_data=result,
-            confidence=1.0 if result["status"] == "completed" else 0.5
+            confidence=1.0 if result["status"] == "completed" else 0.5,
+            contract_id=result["contract_id"]
         )
-        
-        return result
@@ -2,17 +2,31 @@
 Performance Analysis Agent
 Calculates KPI scores and generates justifications using LLM
 """
+import asyncio
 import json
-from typing import Dict, List
-from src.llm import get_llm_provider, get_llm_config
+from typing import Dict, List, Optional, Tuple
 
+import pandas as pd
 
-class PerformanceAnalysisAgent:
+from src.agents.llm_agent import LLMAgentMixin
+from src.agents.kpi_scoring import KPIScoringEngine, is_higher_better, kpi_reason
+from src.agents.narrative import describe_performance, is_near
+
+
+class PerformanceAnalysisAgent(LLMAgentMixin):
     """
     Analyzes contract KPIs and calculates objective performance scores
     Uses LLM for generating human-readable justifications
     """
     
+    LLM_TASK = "performance_justification"
+    
+    # Minimum score for each letter grade, highest first
+    GRADE_THRESHOLDS = ((90, "A"), (80, "B"), (70, "C"), (60, "D"))
+    
+    # Minimum KPI score for PASS compliance
+    PASS_SCORE = 80
+    
     def __init__(self, config_path: str = "config.yaml"):
         """
         Initialize performance analysis agent
@@ -20,8 +34,7 @@ class PerformanceAnalysisAgent:
         Args:
             config_path: Path to configuration file
         """
-        self.llm_provider = get_llm_provider(config_path)
-        self.llm_config = get_llm_config(config_path)
+        self._init_llm(config_path)
     
     def evaluate(self, contract: Dict) -> Dict:
         """
@@ -33,6 +46,135 @@ class PerformanceAnalysisAgent:
         Returns:
             Performance evaluation result
         """
+        result = self.score(contract)
+        if not result["kpi_scores"]:
+            return result
+        
+        vendor_name = contract.get("vendor_name", "Unknown")
+        if self._wants_llm_narrative(lambda margin: self.is_borderline(result, margin)):
+            # Generate LLM justification
+            result["justification"] = self._generate_justification(
+                vendor_name,
+                result["kpi_scores"],
+                result["overall_score"]
+            )
+        else:
+            result["justification"] = self.narrate(vendor_name, result)
+        return result
+    
+    async def aevaluate(self, contract: Dict) -> Dict:
+        """
+        Evaluate contract performance without blocking the event loop
+        
+        Args:
+            contract: Contract dictionary
+            
+        Returns:
+            Performance evaluation result
+        """
+        result = self.score(contract)
+        if not result["kpi_scores"]:
+            return result
+        
+        result["justification"] = await self.ajustify(contract, result)
+        return result
+    
+    async def ajustify(
+        self,
+        contract: Dict,
+        performance_result: Dict,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Generate the justification for an already-scored contract
+        
+        Uses the LLM or the deterministic template, per the narrative mode.
+        
+        Args:
+            contract: Contract dictionary
+            performance_result: Output of score()
+            timeout: Seconds to wait for the LLM before using the fallback text
+            
+        Returns:
+            Justification text
+        """
+        if not performance_result["kpi_scores"]:
+            return performance_result.get("justification", "No KPIs available for evaluation")
+        
+        vendor_name = contract.get("vendor_name", "Unknown")
+        if not self._wants_llm_narrative(lambda margin: self.is_borderline(performance_result, margin)):
+            return self.narrate(vendor_name, performance_result)
+        
+        return await self._agenerate_justification(
+            vendor_name,
+            performance_result["kpi_scores"],
+            performance_result["overall_score"],
+            timeout=timeout
+        )
+    
+    def narrate(self, vendor_name: str, performance_result: Dict) -> str:
+        """
+        Write the justification from the computed scores (no LLM call)
+        
+        Args:
+            vendor_name: Vendor name
+            performance_result: Output of score()
+            
+        Returns:
+            Justification text
+        """
+        return describe_performance(
+            vendor_name,
+            performance_result["overall_score"],
+            performance_result["grade"],
+            performance_result["kpi_scores"]
+        )
+    
+    def is_borderline(self, performance_result: Dict, margin: float) -> bool:
+        """
+        Check whether a scored contract sits near a decision boundary
+        
+        Args:
+            performance_result: Output of score()
+            margin: Score points from a threshold that count as near
+            
+        Returns:
+            True if the overall score is near a grade threshold or any KPI
+            is near the PASS/FAIL threshold
+        """
+        grade_thresholds = [threshold for threshold, _ in self.GRADE_THRESHOLDS]
+        if is_near(performance_result["overall_score"], grade_thresholds, margin):
+            return True
+        return any(is_near(kpi["score"], [self.PASS_SCORE], margin) for kpi in performance_result["kpi_scores"])
+    
+    def score_portfolio(self, contracts: List[Dict]) -> Tuple[List[Dict], pd.DataFrame]:
+        """
+        Score many contracts at once with array operations (no LLM call)
+        
+        Args:
+            contracts: Contract dictionaries
+            
+        Returns:
+            Tuple of (score() result for each contract, portfolio DataFrame
+            with one row per contract)
+        """
+        return self.scoring_engine.score(contracts)
+    
+    @property
+    def scoring_engine(self) -> KPIScoringEngine:
+        """Vectorized engine applying this agent's grade and PASS thresholds"""
+        return KPIScoringEngine(self.GRADE_THRESHOLDS, self.PASS_SCORE)
+    
+    def score(self, contract: Dict) -> Dict:
+        """
+        Calculate rule-based KPI scores and grade (no LLM call)
+        
+        Args:
+            contract: Contract dictionary
+            
+        Returns:
+            Performance result without the LLM justification
+        """
         kpis = contract.get("kpis", [])
         
         if not kpis:
@@ -53,18 +195,10 @@ class PerformanceAnalysisAgent:
         overall_score = sum(s["score"] for s in kpi_scores) / len(kpi_scores)
         grade = self._calculate_grade(overall_score)
         
-        # Generate LLM justification
-        justification = self._generate_justification(
-            contract.get("vendor_name", "Unknown"),
-            kpi_scores,
-            overall_score
-        )
-        
         return {
             "overall_score": round(overall_score, 1),
             "grade": grade,
-            "kpi_scores": kpi_scores,
-            "justification": justification
+            "kpi_scores": kpi_scores
         }
     
     def _score_kpi(self, kpi: Dict) -> Dict:
@@ -84,34 +218,24 @@ class PerformanceAnalysisAgent:
         
         # Determine if higher is better (default: yes)
         # Exception: response time (hours) - lower is better
-        higher_is_better = "time" not in name.lower() or "satisfaction" in name.lower()
+        higher_is_better = is_higher_better(name)
         
         # Calculate score (0-100)
         if target == 0:
             score = 0
         elif higher_is_better:
             score = min(100, (actual / target) * 100)
+        elif actual == 0:
+            score = 100  # Nothing to improve on (e.g., zero response time)
         else:
             # For metrics where lower is better (e.g., response time)
             score = max(0, min(100, (target / actual) * 100))
         
         # Determine compliance
-        compliance = "PASS" if score >= 80 else "FAIL"
+        compliance = "PASS" if score >= self.PASS_SCORE else "FAIL"
         
         # Generate simple justification
-        if higher_is_better:
-            diff = actual - target
-            diff_pct = (diff / target) * 100 if target > 0 else 0
-            if diff >= 0:
-                reason = f"Exceeded target by {abs(diff_pct):.1f}% ({actual}{unit} vs {target}{unit})"
-            else:
-                reason = f"Below target by {abs(diff_pct):.1f}% ({actual}{unit} vs {target}{unit})"
-        else:
-            diff = target - actual
-            if diff >= 0:
-                reason = f"Better than target by {abs(diff):.1f}{unit} ({actual}{unit} vs {target}{unit})"
-            else:
-                reason = f"Worse than target by {abs(diff):.1f}{unit} ({actual}{unit} vs {target}{unit})"
+        reason = kpi_reason(target, actual, unit, higher_is_better)
         
         return {
             "kpi_name": name,
@@ -125,34 +249,18 @@ class PerformanceAnalysisAgent:
     
     def _calculate_grade(self, score: float) -> str:
         """Calculate letter grade from score"""
-        if score >= 90:
-            return "A"
-        elif score >= 80:
-            return "B"
-        elif score >= 70:
-            return "C"
-        elif score >= 60:
-            return "D"
-        else:
-            return "F"
+        for threshold, grade in self.GRADE_THRESHOLDS:
+            if score >= threshold:
+                return grade
+        return "F"
     
-    def _generate_justification(
+    def _build_justification_prompt(
         self,
         vendor_name: str,
         kpi_scores: List[Dict],
         overall_score: float
     ) -> str:
-        """
-        Generate human-readable justification using LLM
-        
-        Args:
-            vendor_name: Vendor name
-            kpi_scores: List of KPI scores
-            overall_score: Overall performance score
-            
-        Returns:
-            Justification text
-        """
+        """Build the justification prompt from KPI scores"""
         # Build KPI summary for prompt
         kpi_summary = []
         for kpi in kpi_scores:
@@ -162,7 +270,7 @@ class PerformanceAnalysisAgent:
         kpi_text = "\n".join(kpi_summary)
         
         # Prompt for LLM (structured, concise, no hallucination risk)
-        prompt = f"""Task: Generate a 1-2 sentence performance summary.
+        return f"""Task: Generate a 1-2 sentence performance summary.
 
 Vendor: {vendor_name}
 Overall Score: {overall_score:.0f}/100
@@ -173,6 +281,25 @@ KPI Results:
 Output Format: Write a brief summary explaining the overall performance in 1-2 sentences. Focus on the most important KPIs and whether the vendor met expectations.
 
 Output:"""
+    
+    def _generate_justification(
+        self,
+        vendor_name: str,
+        kpi_scores: List[Dict],
+        overall_score: float
+    ) -> str:
+        """
+        Generate human-readable justification using LLM
+        
+        Args:
+            vendor_name: Vendor name
+            kpi_scores: List of KPI scores
+            overall_score: Overall performance score
+            
+        Returns:
+            Justification text
+        """
+        prompt = self._build_justification_prompt(vendor_name, kpi_scores, overall_score)
         
         try:
             # Generate justification
@@ -192,6 +319,34 @@ Output:"""
             # Fallback on LLM error
             return self._fallback_justification(vendor_name, overall_score, kpi_scores)
     
+    async def _agenerate_justification(
+        self,
+        vendor_name: str,
+        kpi_scores: List[Dict],
+        overall_score: float,
+        timeout: Optional[float] = None
+    ) -> str:
+        """Async variant of _generate_justification with an optional timeout"""
+        prompt = self._build_justification_prompt(vendor_name, kpi_scores, overall_score)
+        
+        try:
+            justification = await asyncio.wait_for(
+                self.llm_provider.agenerate(
+                    prompt=prompt,
+                    max_tokens=self.llm_config.get("max_tokens", 150),
+                    temperature=self.llm_config.get("temperature", 0.0)
+                ),
+                timeout=timeout
+            )
+            
+            if not justification or len(justification.strip()) < 10:
+                return self._fallback_justification(vendor_name, overall_score, kpi_scores)
+            
+            return justification.strip()
+            
+        except Exception:
+            return self._fallback_justification(vendor_name, overall_score, kpi_scores)
+    
     def _fallback_justification(
         self,
         vendor_name: str,
@@ -199,11 +354,4 @@ Output:"""
         kpi_scores: List[Dict]
     ) -> str:
         """Generate fallback justification without LLM"""
-        failed_kpis = [k for k in kpi_scores if k["compliance"] == "FAIL"]
-        
-        if overall_score >= 90:
-            return f"{vendor_name} demonstrated excellent performance with an overall score of {overall_score:.0f}/100, meeting or exceeding all major KPIs."
-        elif overall_score >= 70:
-            return f"{vendor_name} showed satisfactory performance with an overall score of {overall_score:.0f}/100, though {len(failed_kpis)} KPI(s) fell below target."
-        else:
-            return f"{vendor_name} underperformed with an overall score of {overall_score:.0f}/100, failing to meet {len(failed_kpis)} out of {len(kpi_scores)} KPIs."
+        return describe_performance(vendor_name, overall_score, self._calculate_grade(overall_score), kpi_scores)
@@ -2,14 +2,41 @@
 Reasoning Agent - True LLM-Driven Decision Making
 NO formulas, NO hardcoded rules - pure reasoning over multiple data sources
 """
+import asyncio
 import json
-from typing import Dict, Optional
-from src.ingestion.document_loader import DocumentLoader
-from src.llm import get_llm_provider, get_llm_config
+from contextlib import aclosing, closing
+from functools import partial
+from typing import Callable, Dict, Optional, Set, Tuple
+from src.ingestion.document_loader import SUMMARY_LEVELS, ContractBundle, DocumentLoader
+from src.agents.llm_agent import LLMAgentMixin
+from src.llm import LLMProvider, load_config, stream_completion
+from src.prompts.packer import DEFAULT_SECTIONS, DEFAULT_TOKEN_BUDGET, PromptPacker
 from src.prompts.reasoning_prompts import REASONING_PROMPT_TEMPLATE
+from src.utils.json_stream import IncrementalJSONParser
 
 
-class ReasoningAgent:
+# Keys the reasoning prompt asks for; generation is cut off once all have arrived
+REQUIRED_FIELDS = frozenset({
+    "reasoning_chain",
+    "performance_assessment",
+    "risk_factors",
+    "strengths",
+    "recommendation",
+    "confidence_level",
+    "justification",
+    "alternative_consideration"
+})
+
+# Reasoning prompt placeholder -> data source summarized into it
+PROMPT_SOURCES = {
+    "performance_summary": "performance_history",
+    "incidents_summary": "incidents",
+    "market_context": "market_context",
+    "past_reviews": "past_reviews"
+}
+
+
+class ReasoningAgent(LLMAgentMixin):
     """
     Analyzes contracts using LLM reasoning over multiple disparate data sources
     
@@ -20,6 +47,8 @@ class ReasoningAgent:
     4. Returns the LLM's decision with reasoning chain
     """
     
+    LLM_TASK = "reasoning"
+    
     def __init__(self, config_path: str = "config.yaml"):
         """
         Initialize reasoning agent
@@ -27,16 +56,30 @@ class ReasoningAgent:
         Args:
             config_path: Path to configuration file
         """
-        self.loader = DocumentLoader()
-        self.llm = get_llm_provider(config_path)
-        self.llm_config = get_llm_config(config_path)
+        data_config = load_config(config_path).get("data", {})
+        self.loader = DocumentLoader(
+            cache_max_bytes=int(data_config.get("source_cache_mb", 64) * 1024 * 1024),
+            performance_store=data_config.get("performance_store")
+        )
+        self._init_llm(config_path)
+    
+    @property
+    def llm(self) -> LLMProvider:
+        """Alias of llm_provider"""
+        return self.llm_provider
     
-    def evaluate(self, contract_id: str) -> Dict:
+    @llm.setter
+    def llm(self, provider: Optional[LLMProvider]) -> None:
+        self.llm_provider = provider
+    
+    def evaluate(self, contract_id: str, bundle: Optional[ContractBundle] = None) -> Dict:
         """
         Evaluate contract using pure LLM reasoning over multiple sources
         
         Args:
             contract_id: Contract ID to evaluate
+            bundle: Data already loaded for the contract (e.g. from
+                DocumentLoader.load_bundles()); loaded here if omitted
             
         Returns:
             {
@@ -50,183 +93,253 @@ class ReasoningAgent:
                 "justification": str,
                 "alternative_consideration": str,
                 "data_completeness": float,
+                "prompt_tokens": int,  # Estimated size of the packed prompt
                 "raw_llm_response": str
             }
         """
-        # 1. Load ALL data sources
-        print(f"[ReasoningAgent] Loading data for {contract_id}...")
-        bundle = self.loader.load_contract_bundle(contract_id)
-        
-        # 2. Convert data to text summaries for LLM
-        performance_summary = self.loader.summarize_performance(
-            bundle.get("performance_history")
-        )
-        
-        incidents_summary = self.loader.summarize_incidents(
-            bundle.get("incidents", [])
-        )
+        bundle, prompt, prompt_tokens = self._prepare_prompt(contract_id, bundle)
         
-        market_context = bundle.get("market_context", "No market data available")[:2000]  # Limit length
-        
-        past_reviews = self.loader.extract_review_summary(
-            bundle.get("past_reviews")
-        )
-        
-        # 3. Build comprehensive reasoning prompt
-        prompt = REASONING_PROMPT_TEMPLATE.format(
-            performance_summary=performance_summary,
-            incidents_summary=incidents_summary,
-            market_context=market_context,
-            past_reviews=past_reviews
-        )
-        
-        print(f"[ReasoningAgent] Sending to LLM for reasoning (prompt length: {len(prompt)} chars)...")
-        
-        # 4. LLM reasoning (slightly higher temperature for nuanced reasoning)
+        # 4. LLM reasoning (streamed so generation stops once the JSON is complete)
         try:
-            llm_response = self.llm.generate(
-                prompt=prompt,
-                max_tokens=self.llm_config.get("max_tokens", 2048),
-                temperature=0.3  # Slight creativity for reasoning
-            )
-            
-            print(f"[ReasoningAgent] Received LLM response (length: {len(llm_response)} chars)")
-            
-            # 5. Parse structured JSON response
-            result = self._parse_llm_response(llm_response)
+            parser = IncrementalJSONParser()
+            llm_response = self._stream_reasoning(prompt, parser)
             
-            # 6. Add metadata
-            result["contract_id"] = contract_id
-            result["data_completeness"] = bundle.get("data_completeness", 0.0)
-            result["raw_llm_response"] = llm_response
-            
-            return result
+            return self._build_result(contract_id, bundle, llm_response, parser, prompt_tokens)
             
         except Exception as e:
             print(f"[ReasoningAgent] Error during LLM reasoning: {str(e)}")
             return self._fallback_response(contract_id, str(e))
     
-    def _parse_llm_response(self, response: str) -> Dict:
-        """
-        Parse LLM's JSON response with robust extraction and repair
+    async def aevaluate(
+        self,
+        contract_id: str,
+        timeout: Optional[float] = None,
+        on_step: Optional[Callable[[int, str], None]] = None,
+        bundle: Optional[ContractBundle] = None
+    ) -> Dict:
         """
-        import re
-        
-        # 1. Clean response (remove markdown and find JSON block)
-        # Find the FIRST '{' and the LAST '}' to extract the core JSON object
-        first_brace = response.find('{')
-        last_brace = response.rfind('}')
+        Evaluate contract without blocking the event loop
         
-        if first_brace != -1:
-            if last_brace != -1 and last_brace > first_brace:
-                # We have a potentially complete JSON block
-                response_clean = response[first_brace:last_brace+1].strip()
-            else:
-                # Potentially truncated JSON (missing closing brace)
-                response_clean = response[first_brace:].strip()
-        else:
-            response_clean = response.strip()
+        File loading runs in a worker thread; the LLM call uses the
+        provider's async client.
         
-        # 2. Advanced JSON repair for truncation
-        if not response_clean.endswith("}"):
-            print("[ReasoningAgent] Detected truncated JSON, performing deep repair...")
-            
-            # Remove trailing commas, colons, or incomplete keys/values
-            # e.g., '{"key": "val", ' -> '{"key": "val"'
-            response_clean = re.sub(r'[,\s:]+$', '', response_clean)
+        Args:
+            contract_id: Contract ID to evaluate
+            timeout: Seconds to wait for the LLM before returning the fallback response
+            on_step: Called with (index, step) as each reasoning step is generated
+            bundle: Data already loaded for the contract
             
-            # If we ended inside a string, close the quote
-            if response_clean.count('"') % 2 != 0:
-                response_clean += '"'
-                
-            # Balance brackets by adding missing closing ones
-            open_braces = response_clean.count('{')
-            close_braces = response_clean.count('}')
-            if open_braces > close_braces:
-                # If we are inside an array at the end, close it first
-                open_brackets = response_clean.count('[')
-                close_brackets = response_clean.count(']')
-                if open_brackets > close_brackets:
-                    response_clean += ']' * (open_brackets - close_brackets)
-                
-                # Close the main object(s)
-                response_clean += '}' * (open_braces - close_braces)
-
+        Returns:
+            Same structure as evaluate()
+        """
+        bundle, prompt, prompt_tokens = await asyncio.to_thread(self._prepare_prompt, contract_id, bundle)
+        
         try:
-            parsed = json.loads(response_clean)
-            
-            # Map LLM variations to standard keys if necessary
-            # (e.g., "reasoning" -> "reasoning_chain")
-            if "reasoning" in parsed and "reasoning_chain" not in parsed:
-                parsed["reasoning_chain"] = [parsed["reasoning"]] if isinstance(parsed["reasoning"], str) else parsed["reasoning"]
-
-            # Ensure all required fields exist with defaults
-            if "justification" not in parsed or not parsed["justification"]:
-                parsed["justification"] = "Recommendation based on synthesis of multi-source performance and risk data."
+            # Parse while streaming so steps are reported as soon as they close
+            # and generation stops once the JSON is complete
+            parser = IncrementalJSONParser()
+            llm_response = await asyncio.wait_for(
+                self._astream_reasoning(prompt, parser, on_step),
+                timeout=timeout
+            )
+            return self._build_result(contract_id, bundle, llm_response, parser, prompt_tokens)
             
-            if "strengths" not in parsed:
-                parsed["strengths"] = []
-            if "risk_factors" not in parsed:
-                parsed["risk_factors"] = []
-
-            # Normalize recommendation and confidence
-            if "recommendation" in parsed:
-                parsed["recommendation"] = parsed["recommendation"].upper()
-                if "RENEW" in parsed["recommendation"]: parsed["recommendation"] = "RENEW"
-                elif "TERMINATE" in parsed["recommendation"]: parsed["recommendation"] = "TERMINATE"
-                elif "RENEGOTIATE" in parsed["recommendation"]: parsed["recommendation"] = "RENEGOTIATE"
-                elif "MONITOR" in parsed["recommendation"]: parsed["recommendation"] = "MONITOR"
-            else:
-                parsed["recommendation"] = "MONITOR"
+        except asyncio.TimeoutError:
+            print(f"[ReasoningAgent] LLM reasoning timed out after {timeout}s")
+            return self._fallback_response(contract_id, f"LLM reasoning timed out after {timeout}s")
+        except Exception as e:
+            print(f"[ReasoningAgent] Error during LLM reasoning: {str(e)}")
+            return self._fallback_response(contract_id, str(e))
+    
+    def _stream_reasoning(self, prompt: str, parser: IncrementalJSONParser) -> str:
+        """Stream the LLM response through the parser until the JSON is complete"""
+        chunks = []
+        received = set()
+        
+        with stream_completion() as completion, closing(self.llm_provider.stream(
+            prompt=prompt,
+            max_tokens=self.llm_config.get("max_tokens", 2048),
+            temperature=self.llm_config.get("temperature", 0.3)
+        )) as stream:
+            for chunk in stream:
+                chunks.append(chunk)
+                if self._feed_chunk(parser, chunk, received):
+                    completion.done()  # Complete response: cacheable although cut off
+                    break
+        
+        return "".join(chunks)
+    
+    async def _astream_reasoning(
+        self,
+        prompt: str,
+        parser: IncrementalJSONParser,
+        on_step: Optional[Callable[[int, str], None]] = None
+    ) -> str:
+        """Async version of _stream_reasoning, reporting reasoning steps as they close"""
+        chunks = []
+        received = set()
+        
+        with stream_completion() as completion:
+            async with aclosing(self.llm_provider.astream(
+                prompt=prompt,
+                max_tokens=self.llm_config.get("max_tokens", 2048),
+                temperature=self.llm_config.get("temperature", 0.3)
+            )) as stream:
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    if self._feed_chunk(parser, chunk, received, on_step):
+                        completion.done()
+                        break
+        
+        return "".join(chunks)
+    
+    def _feed_chunk(
+        self,
+        parser: IncrementalJSONParser,
+        chunk: str,
+        received: Set[str],
+        on_step: Optional[Callable[[int, str], None]] = None
+    ) -> bool:
+        """
+        Parse one streamed chunk
+        
+        Args:
+            parser: Parser for this response
+            chunk: Next chunk of response text
+            received: Top-level keys completed so far (updated in place)
+            on_step: Called with (index, step) for each completed reasoning step
             
-            if "confidence_level" in parsed:
-                parsed["confidence_level"] = parsed["confidence_level"].upper()
-                if "HIGH" in parsed["confidence_level"]: parsed["confidence_level"] = "HIGH"
-                elif "MEDIUM" in parsed["confidence_level"]: parsed["confidence_level"] = "MEDIUM"
-                elif "LOW" in parsed["confidence_level"]: parsed["confidence_level"] = "LOW"
-            else:
-                parsed["confidence_level"] = "MEDIUM"
-
-            return parsed
+        Returns:
+            True once the object has closed or every required field has arrived;
+            anything generated after that would be discarded
+        """
+        for path, value in parser.feed(chunk):
+            if len(path) == 1:
+                received.add(path[0])
+            elif on_step is not None and len(path) == 2 and path[0] == "reasoning_chain":
+                on_step(path[1], value if isinstance(value, str) else json.dumps(value))
+        
+        return parser.complete or REQUIRED_FIELDS <= received
+    
+    def _prepare_prompt(
+        self,
+        contract_id: str,
+        bundle: Optional[ContractBundle] = None
+    ) -> Tuple[ContractBundle, str, int]:
+        """
+        Load all data sources and build the reasoning prompt within the token budget
+        
+        Args:
+            contract_id: Contract ID to evaluate
+            bundle: Data already loaded for the contract
             
-        except json.JSONDecodeError as e:
-            # 3. Handle 'Extra data' error by trimming at the exact error position
-            if "Extra data" in str(e):
-                print(f"[ReasoningAgent] Extra data detected at pos {e.pos}, trimming...")
-                try:
-                    # Attempt to parse the string up to the error position
-                    parsed = json.loads(response_clean[:e.pos].strip())
-                    # If successful, proceed with the rest of the parsing logic
-                    if "reasoning" in parsed and "reasoning_chain" not in parsed:
-                        parsed["reasoning_chain"] = [parsed["reasoning"]] if isinstance(parsed["reasoning"], str) else parsed["reasoning"]
-                    if "justification" not in parsed or not parsed["justification"]:
-                        parsed["justification"] = "Recommendation based on synthesis of multi-source performance and risk data."
-                    if "strengths" not in parsed:
-                        parsed["strengths"] = []
-                    if "risk_factors" not in parsed:
-                        parsed["risk_factors"] = []
-                    if "recommendation" in parsed:
-                        parsed["recommendation"] = parsed["recommendation"].upper()
-                        if "RENEW" in parsed["recommendation"]: parsed["recommendation"] = "RENEW"
-                        elif "TERMINATE" in parsed["recommendation"]: parsed["recommendation"] = "TERMINATE"
-                        elif "RENEGOTIATE" in parsed["recommendation"]: parsed["recommendation"] = "RENEGOTIATE"
-                        elif "MONITOR" in parsed["recommendation"]: parsed["recommendation"] = "MONITOR"
-                    else:
-                        parsed["recommendation"] = "MONITOR"
-                    if "confidence_level" in parsed:
-                        parsed["confidence_level"] = parsed["confidence_level"].upper()
-                        if "HIGH" in parsed["confidence_level"]: parsed["confidence_level"] = "HIGH"
-                        elif "MEDIUM" in parsed["confidence_level"]: parsed["confidence_level"] = "MEDIUM"
-                        elif "LOW" in parsed["confidence_level"]: parsed["confidence_level"] = "LOW"
-                    else:
-                        parsed["confidence_level"] = "MEDIUM"
-                    return parsed
-                except:
-                    # If trimming and re-parsing fails, fall through to general error handling
-                    pass
+        Returns:
+            Tuple of (data bundle, prompt text, estimated prompt tokens)
+        """
+        # 1. Load ALL data sources
+        if bundle is None:
+            print(f"[ReasoningAgent] Loading data for {contract_id}...")
+            bundle = self.loader.load_contract_bundle(contract_id)
+        
+        # 2. Convert data to text summaries for LLM (compact levels built only if needed)
+        renderings = {
+            placeholder: [partial(bundle.summary, source, level) for level in range(SUMMARY_LEVELS[source])]
+            for placeholder, source in PROMPT_SOURCES.items()
+        }
+        
+        # 3. Build comprehensive reasoning prompt within the token budget
+        prompt, report = self._prompt_packer().pack(renderings)
+        
+        print(
+            f"[ReasoningAgent] Sending to LLM for reasoning "
+            f"(prompt: ~{report['tokens']}/{report['budget']} tokens, {len(prompt)} chars)..."
+        )
+        return bundle, prompt, report["tokens"]
+    
+    def _prompt_packer(self) -> PromptPacker:
+        """Packer for the reasoning prompt using the prompt section of config.yaml"""
+        prompt_config = load_config(self.config_path).get("prompt", {})
+        configured = prompt_config.get("sections") or {}
+        sections = {name: {**DEFAULT_SECTIONS[name], **(configured.get(name) or {})} for name in PROMPT_SOURCES}
+        return PromptPacker(
+            REASONING_PROMPT_TEMPLATE,
+            prompt_config.get("token_budget", DEFAULT_TOKEN_BUDGET),
+            sections
+        )
+    
+    def _build_result(
+        self,
+        contract_id: str,
+        bundle: Dict,
+        llm_response: str,
+        parser: Optional[IncrementalJSONParser] = None,
+        prompt_tokens: Optional[int] = None
+    ) -> Dict:
+        """Parse the LLM response and attach evaluation metadata"""
+        print(f"[ReasoningAgent] Received LLM response (length: {len(llm_response)} chars)")
+        
+        # 5. Parse structured JSON response
+        result = self._parse_llm_response(llm_response, parser)
+        
+        # 6. Add metadata
+        result["contract_id"] = contract_id
+        result["data_completeness"] = bundle.get("data_completeness", 0.0)
+        result["prompt_tokens"] = prompt_tokens
+        result["raw_llm_response"] = llm_response
+        
+        return result
+    
+    def _parse_llm_response(self, response: str, parser: Optional[IncrementalJSONParser] = None) -> Dict:
+        """
+        Parse the LLM's JSON response, keeping completed fields if it was cut off
+        
+        Args:
+            response: Raw LLM response
+            parser: Parser that already consumed the response while streaming
             
-            print(f"[ReasoningAgent] JSON parsing still failed after repair: {str(e)}")
+        Returns:
+            Normalized reasoning dictionary
+        """
+        if parser is None:
+            parser = IncrementalJSONParser()
+            parser.feed(response)
+        
+        parsed = parser.result()
+        if not parsed:
+            print("[ReasoningAgent] No JSON object found in LLM response")
             return self._extract_structured_fallback(response)
+        
+        if parser.truncated:
+            print("[ReasoningAgent] Detected truncated JSON, keeping fields completed before the cut-off")
+        
+        # Map LLM variations to standard keys if necessary
+        # (e.g., "reasoning" -> "reasoning_chain")
+        if "reasoning" in parsed and "reasoning_chain" not in parsed:
+            parsed["reasoning_chain"] = [parsed["reasoning"]] if isinstance(parsed["reasoning"], str) else parsed["reasoning"]
+        
+        # Ensure all required fields exist with defaults
+        if not parsed.get("justification"):
+            parsed["justification"] = "Recommendation based on synthesis of multi-source performance and risk data."
+        parsed.setdefault("strengths", [])
+        parsed.setdefault("risk_factors", [])
+        
+        # Normalize recommendation and confidence
+        parsed["recommendation"] = self._normalize_choice(
+            parsed.get("recommendation"), ("RENEW", "TERMINATE", "RENEGOTIATE", "MONITOR"), "MONITOR"
+        )
+        parsed["confidence_level"] = self._normalize_choice(
+            parsed.get("confidence_level"), ("HIGH", "MEDIUM", "LOW"), "MEDIUM"
+        )
+        
+        return parsed
+    
+    @staticmethod
+    def _normalize_choice(value, choices: Tuple[str, ...], default: str) -> str:
+        """Map free-form model output like 'Renew (with conditions)' onto a known choice"""
+        if not isinstance(value, str) or not value.strip():
+            return default
+        value = value.upper()
+        return next((choice for choice in choices if choice in value), value)
     
     def _extract_structured_fallback(self, response: str) -> Dict:
         """
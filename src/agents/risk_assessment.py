@@ -2,16 +2,24 @@
 Risk Assessment Agent
 Classifies vendor risk and recommends contract actions
 """
-from typing import Dict
-from src.llm import get_llm_provider, get_llm_config
+import asyncio
+from typing import Dict, Optional
+from src.agents.llm_agent import LLMAgentMixin
+from src.agents.narrative import describe_risk, is_near
 
 
-class RiskAssessmentAgent:
+class RiskAssessmentAgent(LLMAgentMixin):
     """
     Assesses vendor risk based on performance, incidents, and budget
     Provides actionable recommendations
     """
     
+    LLM_TASK = "risk_reason"
+    
+    # Performance scores and budget overruns (%) where the risk level or recommendation changes
+    PERFORMANCE_THRESHOLDS = (50, 60, 70, 80)
+    BUDGET_THRESHOLDS = (5, 15)
+    
     def __init__(self, config_path: str = "config.yaml"):
         """
         Initialize risk assessment agent
@@ -19,8 +27,7 @@ class RiskAssessmentAgent:
         Args:
             config_path: Path to configuration file
         """
-        self.llm_provider = get_llm_provider(config_path)
-        self.llm_config = get_llm_config(config_path)
+        self._init_llm(config_path)
     
     def assess(self, evaluation_data: Dict) -> Dict:
         """
@@ -32,6 +39,113 @@ class RiskAssessmentAgent:
         Returns:
             Risk assessment result
         """
+        result = self.classify(evaluation_data)
+        vendor_name = evaluation_data.get("contract", {}).get("vendor_name", "Unknown")
+        
+        if self._wants_llm_narrative(lambda margin: self.is_borderline(result, margin)):
+            # Generate LLM-based justification
+            result["reason"] = self._generate_reason(
+                vendor_name=vendor_name,
+                risk_level=result["risk_level"],
+                performance_score=result["metrics"]["performance_score"],
+                risk_factors=result["risk_factors"]
+            )
+        else:
+            result["reason"] = self.narrate(vendor_name, result)
+        return result
+    
+    async def aassess(self, evaluation_data: Dict) -> Dict:
+        """
+        Assess vendor risk without blocking the event loop
+        
+        Args:
+            evaluation_data: Dictionary with contract and performance_score
+            
+        Returns:
+            Risk assessment result
+        """
+        result = self.classify(evaluation_data)
+        result["reason"] = await self.aexplain(evaluation_data.get("contract", {}), result)
+        return result
+    
+    async def aexplain(
+        self,
+        contract: Dict,
+        risk_result: Dict,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Generate the reason for an already-classified risk
+        
+        Uses the LLM or the deterministic template, per the narrative mode.
+        
+        Args:
+            contract: Contract dictionary
+            risk_result: Output of classify()
+            timeout: Seconds to wait for the LLM before using the fallback text
+            
+        Returns:
+            Reason text
+        """
+        vendor_name = contract.get("vendor_name", "Unknown")
+        if not self._wants_llm_narrative(lambda margin: self.is_borderline(risk_result, margin)):
+            return self.narrate(vendor_name, risk_result)
+        
+        return await self._agenerate_reason(
+            vendor_name=vendor_name,
+            risk_level=risk_result["risk_level"],
+            performance_score=risk_result["metrics"]["performance_score"],
+            risk_factors=risk_result["risk_factors"],
+            timeout=timeout
+        )
+    
+    def narrate(self, vendor_name: str, risk_result: Dict) -> str:
+        """
+        Write the risk reason from the classification (no LLM call)
+        
+        Args:
+            vendor_name: Vendor name
+            risk_result: Output of classify()
+            
+        Returns:
+            Reason text
+        """
+        return describe_risk(
+            vendor_name,
+            risk_result["risk_level"],
+            risk_result["risk_factors"],
+            risk_result.get("recommendation"),
+            risk_result.get("metrics")
+        )
+    
+    def is_borderline(self, risk_result: Dict, margin: float) -> bool:
+        """
+        Check whether a classification sits near a risk or recommendation boundary
+        
+        Args:
+            risk_result: Output of classify()
+            margin: Distance from a threshold that counts as near (score
+                points, or percentage points of budget overrun)
+            
+        Returns:
+            True if the performance score or budget overrun is near a threshold
+        """
+        metrics = risk_result["metrics"]
+        return (
+            is_near(metrics["performance_score"], self.PERFORMANCE_THRESHOLDS, margin) or
+            is_near(metrics["budget_overrun_pct"], self.BUDGET_THRESHOLDS, margin)
+        )
+    
+    def classify(self, evaluation_data: Dict) -> Dict:
+        """
+        Classify risk and recommend an action using rules only (no LLM call)
+        
+        Args:
+            evaluation_data: Dictionary with contract and performance_score
+            
+        Returns:
+            Risk assessment result without the LLM reason
+        """
         contract = evaluation_data.get("contract", {})
         performance_score = evaluation_data.get("performance_score", 0)
         
@@ -62,18 +176,9 @@ class RiskAssessmentAgent:
             unresolved_incidents=unresolved_incidents
         )
         
-        # Generate LLM-based justification
-        reason = self._generate_reason(
-            vendor_name=contract.get("vendor_name", "Unknown"),
-            risk_level=risk_level,
-            performance_score=performance_score,
-            risk_factors=risk_factors
-        )
-        
         return {
             "risk_level": risk_level,
             "recommendation": recommendation,
-            "reason": reason,
             "risk_factors": risk_factors,
             "metrics": {
                 "performance_score": performance_score,
@@ -174,28 +279,17 @@ class RiskAssessmentAgent:
         else:  # LOW risk
             return "RENEW"
     
-    def _generate_reason(
+    def _build_reason_prompt(
         self,
         vendor_name: str,
         risk_level: str,
         performance_score: float,
         risk_factors: list
     ) -> str:
-        """
-        Generate risk assessment reason using LLM
-        
-        Args:
-            vendor_name: Vendor name
-            risk_level: Risk level (LOW/MEDIUM/HIGH)
-            performance_score: Performance score
-            risk_factors: List of risk factors
-            
-        Returns:
-            Reason text
-        """
+        """Build the risk explanation prompt"""
         risk_text = "\n".join(f"- {factor}" for factor in risk_factors)
         
-        prompt = f"""Task: Explain why this vendor is classified as {risk_level} risk in 1 sentence.
+        return f"""Task: Explain why this vendor is classified as {risk_level} risk in 1 sentence.
 
 Vendor: {vendor_name}
 Risk Level: {risk_level}
@@ -207,6 +301,27 @@ Risk Factors:
 Output Format: Write a single sentence explaining the risk classification.
 
 Output:"""
+    
+    def _generate_reason(
+        self,
+        vendor_name: str,
+        risk_level: str,
+        performance_score: float,
+        risk_factors: list
+    ) -> str:
+        """
+        Generate risk assessment reason using LLM
+        
+        Args:
+            vendor_name: Vendor name
+            risk_level: Risk level (LOW/MEDIUM/HIGH)
+            performance_score: Performance score
+            risk_factors: List of risk factors
+            
+        Returns:
+            Reason text
+        """
+        prompt = self._build_reason_prompt(vendor_name, risk_level, performance_score, risk_factors)
         
         try:
             reason = self.llm_provider.generate(
@@ -223,11 +338,35 @@ Output:"""
         except Exception:
             return self._fallback_reason(vendor_name, risk_level, risk_factors)
     
+    async def _agenerate_reason(
+        self,
+        vendor_name: str,
+        risk_level: str,
+        performance_score: float,
+        risk_factors: list,
+        timeout: Optional[float] = None
+    ) -> str:
+        """Async variant of _generate_reason with an optional timeout"""
+        prompt = self._build_reason_prompt(vendor_name, risk_level, performance_score, risk_factors)
+        
+        try:
+            reason = await asyncio.wait_for(
+                self.llm_provider.agenerate(
+                    prompt=prompt,
+                    max_tokens=self.llm_config.get("max_tokens", 100),
+                    temperature=self.llm_config.get("temperature", 0.0)
+                ),
+                timeout=timeout
+            )
+            
+            if not reason or len(reason.strip()) < 10:
+                return self._fallback_reason(vendor_name, risk_level, risk_factors)
+            
+            return reason.strip()
+            
+        except Exception:
+            return self._fallback_reason(vendor_name, risk_level, risk_factors)
+    
     def _fallback_reason(self, vendor_name: str, risk_level: str, risk_factors: list) -> str:
         """Generate fallback reason without LLM"""
-        if risk_level == "HIGH":
-            return f"{vendor_name} is classified as HIGH risk due to: {'; '.join(risk_factors[:2])}."
-        elif risk_level == "MEDIUM":
-            return f"{vendor_name} presents MEDIUM risk with {len(risk_factors)} concern(s) requiring monitoring."
-        else:
-            return f"{vendor_name} is LOW risk with strong performance and no significant issues."
+        return describe_risk(vendor_name, risk_level, risk_factors)
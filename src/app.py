@@ -2,10 +2,14 @@
 FastAPI Application
 REST API for contract evaluation system
 """
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Dict, List, Optional
+import asyncio
+import hashlib
 import json
 import sys
 from pathlib import Path
@@ -13,14 +17,9 @@ from pathlib import Path
 # Add project root to path to resolve 'src' imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.agents import (
-    OrchestratorAgent,
-    DataIntakeAgent,
-    PerformanceAnalysisAgent,
-    RiskAssessmentAgent,
-    ReasoningAgent
-)
-from src.utils import CSVOutputHandler
+from src.agents import NARRATIVE_MODES
+from src.llm import CachedLLMProvider, RoutingLLMProvider, load_config, rate_limiter_stats
+from src.pipeline import EvaluationPipeline, BatchEvaluator
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -39,18 +38,26 @@ app.add_middleware(
 )
 
 # Initialize agents (singleton pattern)
-orchestrator = OrchestratorAgent()
-data_intake = DataIntakeAgent()
-performance = PerformanceAnalysisAgent()
-risk = RiskAssessmentAgent()
-reasoning_agent = ReasoningAgent()
-csv_handler = CSVOutputHandler()
+pipeline = EvaluationPipeline.from_config()
+orchestrator = pipeline.orchestrator
+agents = pipeline.agents
+data_intake = agents["data_intake"]
+performance = agents["performance"]
+risk = agents["risk"]
+reasoning_agent = agents["reasoning"]
+result_store = pipeline.result_store
+
+# Streamed evaluations keep running if their client disconnects
+_background_evaluations = set()
+
+# Accepted values of the per-request narrative mode override
+NARRATIVE_PATTERN = f"^({'|'.join(NARRATIVE_MODES)})$"
+
 
-agents = {
-    "data_intake": data_intake,
-    "performance": performance,
-    "risk": risk
-}
+@app.on_event("shutdown")
+def close_audit_log():
+    """Write out queued audit entries before the process exits"""
+    orchestrator.audit_writer.close()
 
 
 # Request/Response models
@@ -59,6 +66,15 @@ class EvaluationRequest(BaseModel):
     contract_id: str
     contract_file: Optional[str] = None  # Path to contract JSON
     contract_data: Optional[Dict] = None  # Or direct contract data
+    narrative: Optional[str] = Field(default=None, pattern=NARRATIVE_PATTERN)  # Overrides narrative.mode
+
+
+class BatchEvaluationRequest(BaseModel):
+    """Portfolio evaluation request (contract IDs, a folder, or both)"""
+    contract_ids: Optional[List[str]] = None  # Default: every contract in the folder
+    directory: Optional[str] = None  # Folder with contract JSON files (default: data/samples)
+    concurrency: Optional[int] = Field(default=None, ge=1, le=64)
+    force: bool = False  # Re-evaluate contracts whose inputs have not changed
 
 
 class EvaluationResponse(BaseModel):
@@ -99,8 +115,35 @@ def health_check():
     }
 
 
+@app.get("/metrics")
+def get_metrics():
+    """
+    Runtime metrics
+    
+    Returns:
+        LLM response cache hit/miss counters and tier sizes (None when disabled),
+        queue depth / admission metrics for each LLM rate limiter, per-provider
+        latency and circuit state when routing is enabled, how many
+        evaluations were coalesced into an identical in-flight run, and
+        source file cache counters
+    """
+    provider = performance.llm_provider
+    llm_cache = provider.cache.stats() if isinstance(provider, CachedLLMProvider) else None
+    
+    router = provider.provider if isinstance(provider, CachedLLMProvider) else provider
+    llm_routing = router.stats() if isinstance(router, RoutingLLMProvider) else None
+    
+    return {
+        "llm_cache": llm_cache,
+        "llm_rate_limit": rate_limiter_stats(),
+        "llm_routing": llm_routing,
+        "evaluations": pipeline.flights.stats(),
+        "source_cache": reasoning_agent.loader.cache.stats()
+    }
+
+
 @app.post("/evaluate", response_model=EvaluationResponse, status_code=status.HTTP_200_OK)
-def evaluate_contract(request: EvaluationRequest):
+async def evaluate_contract(request: EvaluationRequest):
     """
     Evaluate a contract
     
@@ -137,28 +180,9 @@ def evaluate_contract(request: EvaluationRequest):
     
     # Run evaluation
     try:
-        # Standard analytical evaluation
-        result = orchestrator.evaluate_contract(contract, agents)
-        
-        # Deep reasoning evaluation (LLM synthesis across all sources)
-        try:
-            # Note: This will load additional files (CSV, JSON, TXT, MD) if they exist
-            reasoning_result = reasoning_agent.evaluate(request.contract_id)
-            
-            # Merge reasoning into result
-            result["reasoning_chain"] = reasoning_result.get("reasoning_chain", [])
-            result["justification"] = reasoning_result.get("justification", "")
-            result["confidence_level"] = reasoning_result.get("confidence_level", "LOW")
-            
-            # Optionally override recommendation and risk if reasoning is high confidence
-            # For now, we prefer the reasoning recommendation as it's more "agentic"
-            if reasoning_result.get("recommendation"):
-                result["recommendation"] = reasoning_result["recommendation"]
-        except Exception as reasoning_err:
-            print(f"Reasoning evaluation failed (non-critical): {reasoning_err}")
-
-        # Save to CSV
-        csv_handler.save_result(result)
+        # Rule-based scoring, then the performance, risk and deep reasoning
+        # LLM calls concurrently (reasoning loads CSV, JSON, TXT, MD sources)
+        result = await pipeline.aevaluate(contract, narrative=request.narrative)
         
         # Return response
         return EvaluationResponse(
@@ -181,6 +205,80 @@ def evaluate_contract(request: EvaluationRequest):
         )
 
 
+@app.post("/evaluate/batch")
+async def evaluate_batch(request: BatchEvaluationRequest):
+    """
+    Evaluate a portfolio of contracts
+    
+    Contracts run through a bounded worker pool and are streamed back as
+    NDJSON, one line per contract in completion order, followed by a
+    summary line. Results are saved in one bulk write at the end.
+    Contracts whose input fingerprint matches their last completed
+    evaluation are reported as "unchanged" unless force is set.
+    
+    Args:
+        request: Contract IDs and/or folder, optional concurrency limit, force flag
+        
+    Returns:
+        NDJSON stream of evaluation results
+    """
+    try:
+        contracts, missing = pipeline.load_contracts(request.contract_ids, request.directory)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    
+    if not contracts:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No contracts found for batch evaluation"
+        )
+    
+    total = len(contracts) + len(missing)
+    contracts, unchanged = await run_in_threadpool(pipeline.select_changed, contracts, request.force)
+    
+    batch_config = load_config().get("batch", {})
+    evaluator = BatchEvaluator(
+        pipeline,
+        concurrency=request.concurrency or batch_config.get("concurrency", 4),
+        loader_threads=batch_config.get("loader_threads", 8),
+        loader_processes=batch_config.get("loader_processes")
+    )
+    
+    async def stream_results():
+        for contract_id in missing:
+            yield json.dumps({"contract_id": contract_id, "status": "not_found"}) + "\n"
+        for contract_id in unchanged:
+            yield json.dumps({"contract_id": contract_id, "status": "unchanged"}) + "\n"
+        
+        counts = {}
+        async for result in evaluator.run(contracts, refresh=request.force):
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+            yield json.dumps(pipeline.summarize(result)) + "\n"
+        
+        yield json.dumps({
+            "summary": {
+                "total": total,
+                "not_found": len(missing),
+                "unchanged": len(unchanged),
+                **counts
+            }
+        }) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.get("/results/export")
+async def export_results():
+    """
+    Export all evaluation results in the evaluations CSV format
+    
+    Returns:
+        CSV file download
+    """
+    csv_path = await run_in_threadpool(result_store.export_csv)
+    return FileResponse(csv_path, media_type="text/csv", filename="evaluations.csv")
+
+
 @app.get("/results/{contract_id}")
 def get_result(contract_id: str):
     """
@@ -190,9 +288,9 @@ def get_result(contract_id: str):
         contract_id: Contract ID
         
     Returns:
-        Evaluation result from CSV
+        Evaluation result from the result store
     """
-    result = csv_handler.get_by_contract_id(contract_id)
+    result = result_store.get_by_contract_id(contract_id)
     
     if not result:
         raise HTTPException(
@@ -203,55 +301,149 @@ def get_result(contract_id: str):
     return result
 
 
+def _split_param(value: Optional[str], upper: bool = False) -> Optional[List[str]]:
+    """Split a comma-separated query parameter"""
+    if not value:
+        return None
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    return [item.upper() for item in items] if upper else items
+
+
 @app.get("/results")
-def list_results():
+def list_results(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    risk_level: Optional[str] = None,
+    recommendation: Optional[str] = None,
+    vendor: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    sort: str = "contract_id",
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    fields: Optional[str] = None
+):
     """
-    List all evaluation results
+    List evaluation results, one page at a time
     
+    Args:
+        limit: Page size
+        cursor: next_cursor from the previous page
+        risk_level: Comma-separated risk levels (e.g. HIGH,MEDIUM)
+        recommendation: Comma-separated recommendations
+        vendor: Case-insensitive vendor name substring
+        date_from: Earliest evaluation date (ISO, inclusive)
+        date_to: Latest evaluation date (ISO, inclusive)
+        sort: Sort column (contract_id, timestamp, performance_score, ...)
+        order: asc or desc
+        fields: Comma-separated columns to return (default: all)
+        
     Returns:
-        List of all evaluations
+        Page of evaluations with total count and next_cursor.
+        Responses carry an ETag; If-None-Match with an unchanged page
+        returns 304 without querying the results.
     """
-    results = csv_handler.read_results()
+    # ETag = store revision + normalized query, so it changes with any write
+    query_key = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.items()))
+    etag = '"' + hashlib.sha256(
+        f"{result_store.revision()}?{query_key}".encode()
+    ).hexdigest()[:32] + '"'
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    filters = {
+        "risk_level": _split_param(risk_level, upper=True),
+        "recommendation": _split_param(recommendation, upper=True),
+        "vendor": vendor,
+        "date_from": date_from,
+        "date_to": date_to
+    }
+    
+    try:
+        page = result_store.query_results(
+            filters=filters,
+            sort=sort,
+            descending=order == "desc",
+            cursor=cursor,
+            limit=limit,
+            fields=_split_param(fields)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"  # Always revalidate, never serve stale
+    
     return {
-        "count": len(results),
-        "results": results
+        "count": len(page["results"]),
+        "total": page["total"],
+        "next_cursor": page["next_cursor"],
+        "results": page["results"]
     }
 
 
 @app.get("/audit-log")
-def get_audit_log(limit: int = 50):
+def get_audit_log(
+    limit: int = Query(50, ge=1, le=1000),
+    agent: Optional[str] = None,
+    action: Optional[str] = None,
+    contract_id: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+):
     """
     Get audit log entries
     
+    Unfiltered requests read backwards from the end of the log; filtered
+    requests go through the audit log's sidecar offset index. The total
+    for an unfiltered request comes from the per-segment entry counts in
+    the segment headers, so the first dashboard load never scans the
+    whole log.
+    
     Args:
         limit: Maximum number of entries to return
+        agent: Optional agent name filter
+        action: Optional action filter
+        contract_id: Optional contract ID filter
+        date_from: Optional earliest date (YYYY-MM-DD, inclusive)
+        date_to: Optional latest date (YYYY-MM-DD, inclusive)
         
     Returns:
-        Audit log entries
+        Audit log entries, most recent first, and the total number of
+        matching entries
     """
-    audit_trail = orchestrator.get_audit_trail()
+    filters = {
+        "agent": agent,
+        "action": action,
+        "contract_id": contract_id,
+        "date_from": date_from,
+        "date_to": date_to
+    }
     
-    # Return most recent entries
-    recent = audit_trail[-limit:] if len(audit_trail) > limit else audit_trail
-    recent.reverse()  # Most recent first
+    orchestrator.audit_writer.flush()
+    recent = orchestrator.audit_reader.tail(limit, filters)
+    filtered = any(value for value in filters.values())
+    total = orchestrator.audit_reader.count(filters) if filtered else orchestrator.audit_reader.total()
     
     return {
         "count": len(recent),
-        "total": len(audit_trail),
+        "total": total,
         "entries": recent
     }
 
 
-@app.post("/evaluate-sample/{sample_name}")
-def evaluate_sample(sample_name: str):
+def _load_sample(sample_name: str) -> Dict:
     """
-    Evaluate a sample contract by name
+    Load a sample contract by name
     
     Args:
         sample_name: Sample name (vendor_abc_it_solutions, vendor_xyz_tech, vendor_problematic_corp)
         
     Returns:
-        Evaluation result
+        Contract data dictionary
     """
     # Map sample names to files
     sample_files = {
@@ -270,7 +462,7 @@ def evaluate_sample(sample_name: str):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Unknown sample: {sample_name}. Available: {', '.join(sample_files.keys())}"
         )
-
+    
     contract_file_path = Path(contract_file)
     
     # Resolve path relative to project root if not found in current directory
@@ -284,16 +476,83 @@ def evaluate_sample(sample_name: str):
             detail=f"Contract file not found: {contract_file_path}"
         )
     
-    # Load and evaluate
     with open(contract_file_path, 'r', encoding='utf-8') as f:
-        contract = json.load(f)
+        return json.load(f)
+
+
+def _sse_event(event: str, data: Dict) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/evaluate-sample/{sample_name}")
+async def evaluate_sample(sample_name: str, narrative: Optional[str] = Query(None, pattern=NARRATIVE_PATTERN)):
+    """
+    Evaluate a sample contract by name
+    
+    Args:
+        sample_name: Sample name (vendor_abc_it_solutions, vendor_xyz_tech, vendor_problematic_corp)
+        narrative: Narrative mode override (deterministic, llm or auto)
+        
+    Returns:
+        Evaluation result
+    """
+    contract = _load_sample(sample_name)
     
     request = EvaluationRequest(
         contract_id=contract["contract_id"],
-        contract_data=contract
+        contract_data=contract,
+        narrative=narrative
     )
     
-    return evaluate_contract(request)
+    return await evaluate_contract(request)
+
+
+@app.get("/evaluate-sample/{sample_name}/stream")
+async def stream_sample_evaluation(sample_name: str, narrative: Optional[str] = Query(None, pattern=NARRATIVE_PATTERN)):
+    """
+    Evaluate a sample contract, streaming reasoning steps as Server-Sent Events
+    
+    Emits a "step" event ({index, step}) as each deep reasoning step is
+    generated, then one "result" event with the evaluation summary, or an
+    "error" event if the evaluation fails. If the client disconnects the
+    evaluation still completes and is saved.
+    
+    Args:
+        sample_name: Sample name (vendor_abc_it_solutions, vendor_xyz_tech, vendor_problematic_corp)
+        narrative: Narrative mode override (deterministic, llm or auto)
+        
+    Returns:
+        text/event-stream response
+    """
+    contract = _load_sample(sample_name)
+    
+    async def stream_events():
+        events: asyncio.Queue = asyncio.Queue()
+        
+        def on_step(index: int, step: str):
+            events.put_nowait(("step", {"index": index, "step": step}))
+        
+        evaluation = asyncio.create_task(pipeline.aevaluate(contract, on_reasoning_step=on_step, narrative=narrative))
+        _background_evaluations.add(evaluation)
+        evaluation.add_done_callback(_background_evaluations.discard)
+        evaluation.add_done_callback(lambda _: events.put_nowait(None))
+        
+        yield _sse_event("start", {"contract_id": contract["contract_id"]})
+        
+        while (event := await events.get()) is not None:
+            yield _sse_event(*event)
+        
+        try:
+            yield _sse_event("result", pipeline.summarize(evaluation.result()))
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Evaluation failed: {str(e)}"})
+    
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+"""Audit module"""
+from .reader import AuditLogReader
+from .writer import AuditLogWriter, get_audit_writer
+from .segments import verify_chain
+
+__all__ = ["AuditLogReader", "AuditLogWriter", "get_audit_writer", "verify_chain"]
@@ -0,0 +1,404 @@
+"""
+Audit Log Reader
+Tail-seeking reads and indexed filtering over the append-only audit log
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .segments import ACTIVE_SEQUENCE, list_segments, open_segment, read_header
+
+
+# Entry fields that can be filtered on through the sidecar index
+INDEXED_FIELDS = ["agent", "action", "contract_id"]
+
+
+class AuditLogReader:
+    """
+    Reads the JSONL audit log without parsing the whole file
+    
+    - Unfiltered "most recent N" reads seek backwards from the end of the
+      active segment (then older segments), so cost is proportional to N
+      rather than to the log size.
+    - Filtered reads use a sidecar SQLite index of (segment, byte offset)
+      by agent, action, date and contract_id. The active segment is indexed
+      incrementally from the last indexed byte; rotated segments are
+      immutable and indexed once.
+    """
+    
+    BLOCK_SIZE = 64 * 1024
+    
+    def __init__(self, log_path: str = "data/audit_logs.jsonl", index_path: Optional[str] = None):
+        """
+        Initialize audit log reader
+        
+        Args:
+            log_path: Path to audit log file
+            index_path: Path to the sidecar index (default: <log_path>.idx)
+        """
+        self.log_path = Path(log_path)
+        self.index_path = Path(index_path) if index_path else self.log_path.with_name(self.log_path.name + ".idx")
+        self._local = threading.local()
+        self._refresh_lock = threading.Lock()
+        self._active_count = None  # (identity, counted bytes, lines) of the active segment
+        self._rotated_counts = {}
+    
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    
+    def tail(self, limit: int = 50, filters: Optional[Dict[str, str]] = None) -> List[Dict]:
+        """
+        Get the most recent entries, newest first
+        
+        Args:
+            limit: Maximum number of entries
+            filters: Optional agent / action / contract_id / date_from / date_to
+            
+        Returns:
+            List of audit log entries, most recent first
+        """
+        if limit <= 0 or not self.log_path.exists():
+            return []
+        
+        if not self._active_filters(filters):
+            entries = []
+            for _, path in reversed(list_segments(self.log_path)):
+                for entry in self._iter_reverse_entries(path):
+                    entries.append(entry)
+                    if len(entries) >= limit:
+                        return entries
+            return entries
+        
+        self.refresh_index()
+        where, params = self._build_filters(filters)
+        rows = self._connect().execute(
+            f"SELECT segment, offset, length FROM entries {where} "
+            "ORDER BY segment DESC, offset DESC LIMIT ?",
+            params + [limit]
+        ).fetchall()
+        return self._read_at(rows)
+    
+    def read_all(self, filters: Optional[Dict[str, str]] = None) -> List[Dict]:
+        """
+        Get all matching entries in chronological order
+        
+        Args:
+            filters: Optional agent / action / contract_id / date_from / date_to
+            
+        Returns:
+            List of audit log entries, oldest first
+        """
+        if not self.log_path.exists():
+            return []
+        
+        if not self._active_filters(filters):
+            entries = []
+            for _, path in list_segments(self.log_path):
+                with open_segment(path) as f:
+                    entries.extend(
+                        entry for entry in map(self._parse, f)
+                        if entry is not None and "agent" in entry
+                    )
+            return entries
+        
+        self.refresh_index()
+        where, params = self._build_filters(filters)
+        rows = self._connect().execute(
+            f"SELECT segment, offset, length FROM entries {where} ORDER BY segment, offset", params
+        ).fetchall()
+        return self._read_at(rows)
+    
+    def count(self, filters: Optional[Dict[str, str]] = None) -> int:
+        """
+        Count matching entries using the index
+        
+        Args:
+            filters: Optional agent / action / contract_id / date_from / date_to
+            
+        Returns:
+            Number of matching entries
+        """
+        if not self.log_path.exists():
+            return 0
+        
+        self.refresh_index()
+        where, params = self._build_filters(filters)
+        return self._connect().execute(f"SELECT COUNT(*) FROM entries {where}", params).fetchone()[0]
+    
+    def total(self) -> int:
+        """
+        Count every entry without building the index
+        
+        A rotated segment's entry count is read from the header of the
+        segment after it; segments from before counts were recorded are
+        counted once by line. The active segment is counted incrementally
+        from the last byte seen.
+        
+        Returns:
+            Number of entries in the log
+        """
+        segments = list_segments(self.log_path)
+        total = 0
+        for index, (sequence, path) in enumerate(segments):
+            try:
+                if sequence == ACTIVE_SEQUENCE:
+                    total += self._count_active(path)
+                    continue
+                
+                header = read_header(segments[index + 1][1]) if index + 1 < len(segments) else None
+                if header and header.get("previous_segment") == path.name and "previous_entries" in header:
+                    total += header["previous_entries"]
+                else:
+                    total += self._count_rotated(path)
+            except FileNotFoundError:
+                continue  # Rotated away mid-count; picked up next time
+        return total
+    
+    def refresh_index(self) -> None:
+        """Index segments and entries added since the last refresh"""
+        with self._refresh_lock:
+            conn = self._connect()
+            segments = list_segments(self.log_path)
+            indexed = {
+                row[0]: (row[1], row[2])
+                for row in conn.execute("SELECT segment, identity, indexed_bytes FROM segments")
+            }
+            
+            # Forget segments that no longer exist
+            present = {sequence for sequence, _ in segments}
+            with conn:
+                for sequence in set(indexed) - present:
+                    self._drop_segment(conn, sequence)
+            
+            for sequence, path in segments:
+                try:
+                    self._refresh_segment(conn, sequence, path, indexed.get(sequence))
+                except FileNotFoundError:
+                    continue  # Rotated away mid-refresh; picked up next time
+    
+    def _refresh_segment(self, conn: sqlite3.Connection, sequence: int, path: Path, state: Optional[tuple]) -> None:
+        """Index the unindexed tail of one segment"""
+        identity = self._identity(path)
+        indexed_bytes = 0
+        if state is not None:
+            if state[0] == identity:
+                # Rotated segments never change once indexed
+                if sequence != ACTIVE_SEQUENCE:
+                    return
+                indexed_bytes = state[1]
+            else:
+                # Active segment was rotated or replaced: rebuild it
+                with conn:
+                    self._drop_segment(conn, sequence)
+        
+        rows = []
+        offset = indexed_bytes
+        with open_segment(path) as f:
+            f.seek(indexed_bytes)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written entry; index it next time
+                entry = self._parse(line)
+                if entry is not None and "agent" in entry:
+                    rows.append(self._index_row(entry, sequence, offset, len(line)))
+                offset += len(line)
+        
+        if offset == indexed_bytes and state is not None:
+            return
+        
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO entries (segment, offset, length, agent, action, date, contract_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute(
+                "INSERT INTO segments (segment, identity, indexed_bytes) VALUES (?, ?, ?) "
+                "ON CONFLICT(segment) DO UPDATE SET identity = excluded.identity, "
+                "indexed_bytes = excluded.indexed_bytes",
+                (sequence, identity, offset)
+            )
+    
+    # ------------------------------------------------------------------
+    # Reading helpers
+    # ------------------------------------------------------------------
+    
+    def _iter_reverse_entries(self, path: Path) -> Iterator[Dict]:
+        """Yield a segment's entries from the end backwards"""
+        if path.suffix == ".gz":
+            # Compressed segments cannot be seeked cheaply from the end
+            with open_segment(path) as f:
+                lines = f.read().split(b"\n")
+            for line in reversed(lines):
+                entry = self._parse(line)
+                if entry is not None and "agent" in entry:
+                    yield entry
+            return
+        
+        with open(path, "rb") as f:
+            f.seek(0, 2)
+            position = f.tell()
+            remainder = b""
+            
+            while position > 0:
+                read_size = min(self.BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                lines = (f.read(read_size) + remainder).split(b"\n")
+                
+                # The first piece may continue in the previous block
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    entry = self._parse(line)
+                    if entry is not None and "agent" in entry:
+                        yield entry
+            
+            entry = self._parse(remainder)
+            if entry is not None and "agent" in entry:
+                yield entry
+    
+    def _read_at(self, rows: List[tuple]) -> List[Dict]:
+        """Read entries at the given (segment, offset, length) positions, in the order given"""
+        paths = dict(list_segments(self.log_path))
+        positions = {}
+        for sequence, offset, length in rows:
+            positions.setdefault(sequence, []).append((offset, length))
+        
+        found = {}
+        for sequence, segment_positions in positions.items():
+            if sequence not in paths:
+                continue
+            with open_segment(paths[sequence]) as f:
+                # Gzipped segments only seek cheaply forwards (a backward seek
+                # decompresses from the start again), so read in file order
+                for offset, length in sorted(segment_positions):
+                    f.seek(offset)
+                    entry = self._parse(f.read(length))
+                    if entry is not None:
+                        found[(sequence, offset)] = entry
+        
+        return [found[(sequence, offset)] for sequence, offset, _ in rows if (sequence, offset) in found]
+    
+    def _count_active(self, path: Path) -> int:
+        """Count the active segment's entries from where the last count stopped"""
+        identity = self._identity(path)
+        state = self._active_count
+        offset, count = (state[1], state[2]) if state and state[0] == identity else (0, 0)
+        
+        with open(path, "rb") as f:
+            f.seek(offset)
+            position = offset
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                # Only complete lines count; a partial write is counted next time
+                newlines = block.count(b"\n")
+                if newlines:
+                    count += newlines
+                    offset = position + block.rfind(b"\n") + 1
+                position += len(block)
+        
+        self._active_count = (identity, offset, count)
+        return count - (1 if read_header(path) else 0)
+    
+    def _count_rotated(self, path: Path) -> int:
+        """Count a rotated segment's entries by line (once per segment)"""
+        if path not in self._rotated_counts:
+            with open_segment(path) as f:
+                count = sum(block.count(b"\n") for block in iter(lambda: f.read(1024 * 1024), b""))
+            self._rotated_counts[path] = count - (1 if read_header(path) else 0)
+        return self._rotated_counts[path]
+    
+    def _parse(self, line: bytes) -> Optional[Dict]:
+        """Parse one JSONL line, skipping blanks and partial writes"""
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            return None
+    
+    # ------------------------------------------------------------------
+    # Index helpers
+    # ------------------------------------------------------------------
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's index connection, creating the schema if needed"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.index_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS entries (
+                        segment INTEGER NOT NULL,
+                        offset INTEGER NOT NULL,
+                        length INTEGER NOT NULL,
+                        agent TEXT,
+                        action TEXT,
+                        date TEXT,
+                        contract_id TEXT,
+                        PRIMARY KEY (segment, offset)
+                    )
+                """)
+                for column in INDEXED_FIELDS + ["date"]:
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_entries_{column} ON entries ({column}, segment, offset)"
+                    )
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS segments (
+                        segment INTEGER PRIMARY KEY,
+                        identity TEXT NOT NULL,
+                        indexed_bytes INTEGER NOT NULL
+                    )
+                """)
+            self._local.conn = conn
+        return conn
+    
+    def _identity(self, path: Path) -> str:
+        """Fingerprint a segment by its first line (header or first entry)"""
+        with open_segment(path) as f:
+            first_line = f.readline(4096)
+        return hashlib.sha256(first_line).hexdigest()
+    
+    def _drop_segment(self, conn: sqlite3.Connection, sequence: int) -> None:
+        conn.execute("DELETE FROM entries WHERE segment = ?", (sequence,))
+        conn.execute("DELETE FROM segments WHERE segment = ?", (sequence,))
+    
+    def _index_row(self, entry: Dict, sequence: int, offset: int, length: int) -> tuple:
+        """Build the index row for an entry"""
+        return (
+            sequence,
+            offset,
+            length,
+            entry.get("agent"),
+            entry.get("action"),
+            str(entry.get("timestamp", ""))[:10],
+            entry.get("contract_id")
+        )
+    
+    def _active_filters(self, filters: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Drop empty filter values"""
+        return {key: value for key, value in (filters or {}).items() if value}
+    
+    def _build_filters(self, filters: Optional[Dict[str, str]]) -> tuple:
+        """Translate filters into a WHERE clause over the index"""
+        where, params = [], []
+        filters = self._active_filters(filters)
+        
+        for column in INDEXED_FIELDS:
+            if column in filters:
+                where.append(f"{column} = ?")
+                params.append(filters[column])
+        if "date_from" in filters:
+            where.append("date >= ?")
+            params.append(filters["date_from"][:10])
+        if "date_to" in filters:
+            where.append("date <= ?")
+            params.append(filters["date_to"][:10])
+        
+        return (f"WHERE {' AND '.join(where)}" if where else ""), params
@@ -0,0 +1,124 @@
+"""
+Audit Log Segments
+Naming, discovery and hash-chain verification for rotated audit log files
+"""
+import gzip
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Sequence number used for the active (still growing) segment
+ACTIVE_SEQUENCE = 2 ** 62
+
+# Record type written as the first line of every segment
+SEGMENT_HEADER = "segment_header"
+
+
+def segment_path(log_path: Path, sequence: int, compressed: bool = False) -> Path:
+    """
+    Path of a rotated segment, e.g. audit_logs.00003.jsonl(.gz)
+    
+    Args:
+        log_path: Path of the active audit log
+        sequence: Segment sequence number
+        compressed: Whether the segment is gzipped
+        
+    Returns:
+        Segment file path
+    """
+    name = f"{log_path.stem}.{sequence:05d}{log_path.suffix}"
+    return log_path.with_name(name + (".gz" if compressed else ""))
+
+
+def list_segments(log_path: Path, include_active: bool = True) -> List[Tuple[int, Path]]:
+    """
+    List audit log segments, oldest first
+    
+    Args:
+        log_path: Path of the active audit log
+        include_active: Whether to include the active segment
+        
+    Returns:
+        List of (sequence, path); the active segment uses ACTIVE_SEQUENCE
+    """
+    log_path = Path(log_path)
+    pattern = re.compile(rf"^{re.escape(log_path.stem)}\.(\d+){re.escape(log_path.suffix)}(\.gz)?$")
+    
+    segments = []
+    if log_path.parent.exists():
+        for path in log_path.parent.iterdir():
+            match = pattern.match(path.name)
+            if match:
+                segments.append((int(match.group(1)), path))
+    segments.sort()
+    
+    if include_active and log_path.exists():
+        segments.append((ACTIVE_SEQUENCE, log_path))
+    return segments
+
+
+def open_segment(path: Path):
+    """Open a segment for binary reading, decompressing if needed"""
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def hash_segment(path: Path) -> str:
+    """
+    Hash a segment's uncompressed contents
+    
+    Args:
+        path: Segment file path
+        
+    Returns:
+        Hash string ("sha256:<hex>")
+    """
+    digest = hashlib.sha256()
+    with open_segment(path) as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return "sha256:" + digest.hexdigest()
+
+
+def read_header(path: Path) -> Optional[Dict]:
+    """Read a segment's header record, if it has one"""
+    with open_segment(path) as f:
+        first_line = f.readline()
+    try:
+        record = json.loads(first_line)
+    except json.JSONDecodeError:
+        return None
+    return record if record.get("type") == SEGMENT_HEADER else None
+
+
+def verify_chain(log_path: str) -> Dict:
+    """
+    Verify that every segment's header carries the hash of the segment before it
+    
+    Args:
+        log_path: Path of the active audit log
+        
+    Returns:
+        Dictionary with valid flag, segment count and any broken links
+    """
+    segments = list_segments(Path(log_path))
+    errors = []
+    
+    previous_hash = None
+    for index, (_, path) in enumerate(segments):
+        header = read_header(path)
+        if header is None:
+            # Only the first segment may predate rotation and have no header
+            if index > 0:
+                errors.append(f"{path.name}: missing segment header")
+        elif index > 0 and header.get("previous_hash") != previous_hash:
+            errors.append(f"{path.name}: previous_hash does not match {segments[index - 1][1].name}")
+        previous_hash = hash_segment(path)
+    
+    return {
+        "valid": not errors,
+        "segments": len(segments),
+        "errors": errors
+    }
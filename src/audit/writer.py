@@ -0,0 +1,276 @@
+"""
+Audit Log Writer
+Background, group-committed appends to the audit log with segment rotation
+"""
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from .segments import SEGMENT_HEADER, list_segments, open_segment, segment_path
+
+
+_STOP = object()
+
+_writers: Dict[str, "AuditLogWriter"] = {}
+_writers_lock = threading.Lock()
+
+
+class AuditLogWriter:
+    """
+    Appends audit entries from a background thread
+    
+    Callers only enqueue entries. The writer thread drains everything that
+    has queued up while it was busy and writes it with a single write call
+    (group commit), so bursts of log_action calls cost one write and at
+    most one fsync rather than one open/append/close each.
+    
+    The active segment is rotated to audit_logs.NNNNN.jsonl (optionally
+    gzipped) when it exceeds max_bytes or the day changes. Each new segment
+    starts with a header carrying the SHA-256 of the previous segment's
+    contents, so removing or editing a rotated segment breaks the chain
+    (see verify_chain). The header also records the previous segment's
+    entry count, so totals never rescan rotated segments. Only one process
+    should write a given log.
+    """
+    
+    FSYNC_POLICIES = ("batch", "interval", "never")
+    
+    def __init__(
+        self,
+        log_path: str = "data/audit_logs.jsonl",
+        fsync: str = "batch",
+        fsync_interval: float = 1.0,
+        batch_size: int = 1000,
+        max_bytes: Optional[int] = None,
+        rotate_daily: bool = False,
+        compress: bool = False
+    ):
+        """
+        Initialize audit log writer
+        
+        Args:
+            log_path: Path of the active audit log
+            fsync: Durability policy - "batch" (fsync every write batch),
+                "interval" (at most once per fsync_interval) or "never"
+                (leave it to the OS)
+            fsync_interval: Seconds between fsyncs for the "interval" policy
+            batch_size: Maximum entries written per batch
+            max_bytes: Rotate once the active segment reaches this size
+            rotate_daily: Rotate when the UTC date changes
+            compress: Gzip rotated segments
+        """
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}. Use one of: {', '.join(self.FSYNC_POLICIES)}")
+        
+        self.log_path = Path(log_path)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        
+        self._queue = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._last_fsync = time.monotonic()
+        self._file = None  # Opened by the first write, so idle writers leave no file
+        
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def write(self, entry: Dict) -> None:
+        """
+        Queue an entry for writing
+        
+        Args:
+            entry: Audit log entry
+        """
+        if self._closed:
+            raise RuntimeError("Audit log writer is closed")
+        self._queue.put(entry)
+    
+    def flush(self) -> None:
+        """Block until every queued entry has been written"""
+        if not self._closed:
+            self._queue.join()
+    
+    def close(self) -> None:
+        """Write remaining entries, sync and stop the writer thread"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        
+        self._queue.put(_STOP)
+        self._thread.join()
+        
+        if self._file is None:
+            return
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+        self._file.close()
+    
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    
+    def _run(self) -> None:
+        """Drain the queue in batches until stopped"""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            entries = [item for item in batch if item is not _STOP]
+            try:
+                if entries:
+                    self._write_batch(entries)
+            except Exception as e:
+                print(f"⚠️ Audit log write failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            
+            if len(entries) < len(batch):
+                return
+    
+    def _write_batch(self, entries: list) -> None:
+        """Write one batch to the active segment"""
+        if self._file is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._open_segment()
+        if self._should_rotate():
+            self._rotate()
+        
+        data = "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+        self._append(data)
+        self._entries += len(entries)
+        
+        if self.fsync == "batch" or (
+            self.fsync == "interval" and time.monotonic() - self._last_fsync >= self.fsync_interval
+        ):
+            os.fsync(self._file.fileno())
+            self._last_fsync = time.monotonic()
+    
+    def _append(self, data: bytes) -> None:
+        self._file.write(data)
+        self._file.flush()
+        self._hash.update(data)
+        self._size += len(data)
+    
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+    
+    def _open_segment(
+        self,
+        previous_hash: Optional[str] = None,
+        previous_segment: Optional[str] = None,
+        previous_entries: Optional[int] = None
+    ) -> None:
+        """Open the active segment, writing a header if it is new"""
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._entries = 0
+        self._segment_date = None
+        
+        if self.log_path.exists() and self.log_path.stat().st_size > 0:
+            # Resume an existing segment: rebuild its running hash
+            with open_segment(self.log_path) as f:
+                first_line = f.readline()
+                f.seek(0)
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    self._hash.update(block)
+                    self._size += len(block)
+                    self._entries += block.count(b"\n")
+            try:
+                first_record = json.loads(first_line)
+                self._segment_date = str(first_record.get("timestamp", ""))[:10] or None
+                if first_record.get("type") == SEGMENT_HEADER:
+                    self._entries -= 1
+            except json.JSONDecodeError:
+                pass
+            self._file = open(self.log_path, "ab")
+            return
+        
+        timestamp = datetime.utcnow().isoformat() + "Z"
+        header = {
+            "type": SEGMENT_HEADER,
+            "timestamp": timestamp,
+            "previous_segment": previous_segment,
+            "previous_hash": previous_hash,
+            "previous_entries": previous_entries
+        }
+        self._file = open(self.log_path, "ab")
+        self._segment_date = timestamp[:10]
+        self._append((json.dumps(header) + "\n").encode("utf-8"))
+    
+    def _should_rotate(self) -> bool:
+        if self.max_bytes and self._size >= self.max_bytes:
+            return True
+        if self.rotate_daily and self._segment_date:
+            return datetime.utcnow().strftime("%Y-%m-%d") != self._segment_date
+        return False
+    
+    def _rotate(self) -> None:
+        """Close the active segment, archive it and start a chained one"""
+        if self.fsync != "never":
+            os.fsync(self._file.fileno())
+        self._file.close()
+        previous_hash = "sha256:" + self._hash.hexdigest()
+        previous_entries = self._entries
+        
+        rotated = list_segments(self.log_path, include_active=False)
+        sequence = rotated[-1][0] + 1 if rotated else 1
+        target = segment_path(self.log_path, sequence)
+        os.replace(self.log_path, target)
+        
+        if self.compress:
+            compressed = segment_path(self.log_path, sequence, compressed=True)
+            with open(target, "rb") as src, gzip.open(compressed, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            target.unlink()
+            target = compressed
+        
+        self._open_segment(
+            previous_hash=previous_hash,
+            previous_segment=target.name,
+            previous_entries=previous_entries
+        )
+
+
+def get_audit_writer(log_path: str = "data/audit_logs.jsonl", **options) -> AuditLogWriter:
+    """
+    Get the shared writer for an audit log, creating it on first use
+    
+    Every writer for a path rotates and chains the same files, so there is
+    one per path per process. Options only apply when the writer is created.
+    
+    Args:
+        log_path: Path of the active audit log
+        **options: AuditLogWriter options (fsync, max_bytes, ...)
+        
+    Returns:
+        AuditLogWriter instance
+    """
+    key = str(Path(log_path).resolve())
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = AuditLogWriter(log_path, **options)
+            _writers[key] = writer
+        return writer
@@ -1,4 +1,14 @@
 """Ingestion module"""
-from .document_loader import DocumentLoader
+from .document_loader import ContractBundle, DocumentLoader
+from .performance_store import PerformanceStore, compact_performance
+from .performance_summary import PerformanceSummarizer
+from .source_cache import SourceCache
 
-__all__ = ["DocumentLoader"]
+__all__ = [
+    "ContractBundle",
+    "DocumentLoader",
+    "PerformanceStore",
+    "PerformanceSummarizer",
+    "SourceCache",
+    "compact_performance"
+]
@@ -2,38 +2,114 @@
 Multi-Source Document Loader
 Loads contracts, performance data, incidents, market context, and reviews
 """
+import itertools
 import json
+import multiprocessing
+import os
 import pandas as pd
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .performance_store import PerformanceStore
+from .performance_summary import SUMMARY_LEVELS as PERFORMANCE_SUMMARY_LEVELS, PerformanceSummarizer
+from .source_cache import SourceCache
+
+
+def _read_json(path: Path) -> Any:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _read_text(path: Path) -> str:
+    return path.read_text(encoding='utf-8')
+
+
+# Source name -> (description for warnings, parser)
+SOURCE_READERS = {
+    "performance_history": ("performance data", pd.read_csv),
+    "incidents": ("incident data", _read_json),
+    "market_context": ("market context", _read_text),  # Shared across all contracts
+    "past_reviews": ("past reviews", _read_text)
+}
+
+# Source name -> number of summary detail levels (see summarize_source)
+SUMMARY_LEVELS = {
+    "performance_history": PERFORMANCE_SUMMARY_LEVELS,
+    "incidents": 3,
+    "market_context": 1,
+    "past_reviews": 1
+}
 
 
 class DocumentLoader:
     """Loads all data sources for contract reasoning analysis"""
     
-    def __init__(self, data_base_path: str = "data"):
+    def __init__(
+        self,
+        data_base_path: str = "data",
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        summarizer: Optional[PerformanceSummarizer] = None,
+        performance_store: Optional[str] = None
+    ):
         """
         Initialize document loader
         
         Args:
             data_base_path: Base path to data directory
+            cache_max_bytes: Memory cap for parsed source files (0 disables the cache)
+            summarizer: Performance history summarizer (default settings if omitted)
+            performance_store: Columnar store directory read before the
+                performance CSVs (see scripts/compact_performance.py)
         """
         self.base_path = Path(data_base_path)
+        self.cache = SourceCache(cache_max_bytes)
+        self.summarizer = summarizer or PerformanceSummarizer()
         
         # If the data path isn't found in current directory, try project root
         if not self.base_path.exists():
             root_path = Path(__file__).parent.parent.parent
             self.base_path = root_path / data_base_path
+        
+        self.performance_store = None
+        if performance_store:
+            store_path = Path(performance_store)
+            if not store_path.is_absolute() and not store_path.exists():
+                store_path = Path(__file__).parent.parent.parent / performance_store
+            self.performance_store = PerformanceStore(str(store_path))
     
-    def load_contract_bundle(self, contract_id: str) -> Dict:
+    def source_paths(self, contract_id: str) -> Dict[str, Path]:
+        """
+        Paths of the data sources for a contract (files may not exist)
+        
+        Args:
+            contract_id: Contract ID (e.g., "CNT-2024-001")
+            
+        Returns:
+            Dictionary of source name to file path
+        """
+        return {
+            "performance_history": self.base_path / "performance" / f"{contract_id}_history.csv",
+            "incidents": self.base_path / "incidents" / f"{contract_id}_incidents.json",
+            "market_context": self.base_path / "market" / "industry_benchmarks.txt",
+            "past_reviews": self.base_path / "reviews" / f"{contract_id}_reviews.md"
+        }
+    
+    def load_contract_bundle(self, contract_id: str) -> "ContractBundle":
         """
         Load ALL data sources for a contract
         
+        Sources are read lazily: each file is loaded (through the cache) the
+        first time its key is accessed, so callers only pay for the sources
+        they use.
+        
         Args:
             contract_id: Contract ID (e.g., "CNT-2024-001")
             
         Returns:
-            Dictionary with all available data sources:
+            Read-only mapping with all available data sources:
             {
                 "contract_id": str,
                 "performance_history": DataFrame or None,
@@ -43,113 +119,165 @@ class DocumentLoader:
                 "data_completeness": float  # 0.0-1.0
             }
         """
-        bundle = {
-            "contract_id": contract_id,
-            "performance_history": None,
-            "incidents": None,
-            "market_context": None,
-            "past_reviews": None
-        }
+        return ContractBundle(self, contract_id)
+    
+    def load_bundles(
+        self,
+        contract_ids: Iterable[str],
+        max_workers: int = 8,
+        processes: Optional[int] = None,
+        prefetch: Optional[int] = None
+    ) -> Iterator["ContractBundle"]:
+        """
+        Load many contracts' data sources in parallel
         
-        sources_found = 0
-        total_sources = 4  # performance, incidents, market, reviews
+        File reads run on a thread pool; performance CSVs are parsed and
+        summarized on a process pool. Each bundle is yielded fully loaded
+        (sources and prompt summaries) as soon as it is ready, so callers
+        can start on the first contracts while the rest load. Stopping
+        iteration early cancels the loads not yet started.
         
-        # 1. Load performance CSV
-        try:
-            csv_path = self.base_path / "performance" / f"{contract_id}_history.csv"
-            if csv_path.exists():
-                bundle["performance_history"] = pd.read_csv(csv_path)
-                sources_found += 1
-        except Exception as e:
-            print(f"Warning: Could not load performance data: {e}")
+        Args:
+            contract_ids: Contract IDs to load
+            max_workers: Threads reading files
+            processes: Processes parsing CSVs (None: one per CPU; 0: parse on the threads)
+            prefetch: Bundles loaded ahead of the consumer (default: 4 per thread)
+            
+        Yields:
+            ContractBundle objects in completion order (use bundle.contract_id)
+        """
+        contract_ids = iter(contract_ids)
+        prefetch = max(prefetch or max_workers * 4, 1)
+        if processes is None:
+            processes = os.cpu_count() or 1
         
-        # 2. Load incidents JSON
-        try:
-            json_path = self.base_path / "incidents" / f"{contract_id}_incidents.json"
-            if json_path.exists():
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    bundle["incidents"] = json.load(f)
-                sources_found += 1
-        except Exception as e:
-            print(f"Warning: Could not load incident data: {e}")
+        # Spawned workers: forking while the loader threads run is unsafe
+        parser_pool = ProcessPoolExecutor(
+            processes, mp_context=multiprocessing.get_context("spawn")
+        ) if processes > 0 else nullcontext()
         
-        # 3. Load market context (shared across all contracts)
-        try:
-            market_path = self.base_path / "market" / "industry_benchmarks.txt"
-            if market_path.exists():
-                bundle["market_context"] = market_path.read_text(encoding='utf-8')
-                sources_found += 1
-        except Exception as e:
-            print(f"Warning: Could not load market context: {e}")
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="bundle-loader") as threads, parser_pool as parsers:
+            pending = {
+                threads.submit(self._load_full_bundle, contract_id, parsers)
+                for contract_id in itertools.islice(contract_ids, prefetch)
+            }
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for contract_id in itertools.islice(contract_ids, 1):
+                            pending.add(threads.submit(self._load_full_bundle, contract_id, parsers))
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+    
+    def _load_full_bundle(self, contract_id: str, parsers: Optional[Executor]) -> "ContractBundle":
+        """Read every source of a contract (runs on a loader thread)"""
+        bundle = self.load_contract_bundle(contract_id)
+        bundle.load_all(parsers)
+        return bundle
+    
+    def load_history(
+        self,
+        contract_id: str,
+        path: Path,
+        reader: Optional[Callable[[Path], Any]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load a performance history, from the columnar store when possible
         
-        # 4. Load past reviews
+        Args:
+            contract_id: Contract ID
+            path: Performance CSV (parsed if the store lacks the contract or
+                the CSV changed since compaction)
+            reader: Parser to use for the CSV
+            
+        Returns:
+            Performance DataFrame (read-only), or None if unavailable
+        """
+        if self.performance_store is not None:
+            history = self.performance_store.load(contract_id, path)
+            if history is not None:
+                return history
+        return self.load_source("performance_history", path, reader)
+    
+    def has_source(self, contract_id: str, name: str, path: Path) -> bool:
+        """Whether a source is available without loading it"""
+        if name == "performance_history" and self.performance_store is not None:
+            if self.performance_store.has(contract_id, path):
+                return True
+        return path.exists()
+    
+    def load_source(
+        self,
+        name: str,
+        path: Path,
+        reader: Optional[Callable[[Path], Any]] = None
+    ) -> Optional[Any]:
+        """
+        Load one data source through the cache
+        
+        Args:
+            name: Source name (key of SOURCE_READERS)
+            path: File path
+            reader: Parser to use instead of the default for this source
+            
+        Returns:
+            Parsed source (shared, treat as read-only), or None if the file
+            is missing or cannot be parsed
+        """
+        description, default_reader = SOURCE_READERS[name]
         try:
-            review_path = self.base_path / "reviews" / f"{contract_id}_reviews.md"
-            if review_path.exists():
-                bundle["past_reviews"] = review_path.read_text(encoding='utf-8')
-                sources_found += 1
+            return self.cache.get(path, reader or default_reader)
         except Exception as e:
-            print(f"Warning: Could not load past reviews: {e}")
-        
-        # Calculate data completeness
-        bundle["data_completeness"] = sources_found / total_sources
+            print(f"Warning: Could not load {description}: {e}")
+            return None
+    
+    def summarize_source(self, name: str, value: Any, level: int = 0) -> str:
+        """
+        Convert a loaded source to the text used in the reasoning prompt
         
-        return bundle
+        Args:
+            name: Source name (key of SOURCE_READERS)
+            value: Loaded source, or None if unavailable
+            level: Detail level, 0 (full) to SUMMARY_LEVELS[name] - 1 (most compact)
+            
+        Returns:
+            Prompt text for the source
+        """
+        if name == "performance_history":
+            return self.summarize_performance(value, level)
+        if name == "incidents":
+            return self.summarize_incidents(value, level)
+        if name == "market_context":
+            return value or "No market data available"
+        if name == "past_reviews":
+            return self.extract_review_summary(value)
+        raise KeyError(name)
     
-    def summarize_performance(self, df: Optional[pd.DataFrame]) -> str:
+    def summarize_performance(self, df: Optional[pd.DataFrame], level: int = 0) -> str:
         """
         Convert performance DataFrame to text summary for LLM
         
         Args:
             df: Performance history DataFrame
+            level: Detail level (higher levels list fewer periods)
             
         Returns:
-            Text summary of performance trends
-        """
-        if df is None or df.empty:
-            return "No performance data available."
-        
-        summary = "PERFORMANCE HISTORY (Monthly Data):\n\n"
-        
-        # Overall statistics
-        avg_uptime = df['uptime_pct'].mean()
-        avg_response = df['avg_response_hours'].mean()
-        total_incidents = df['incidents_count'].sum()
-        total_critical = df['critical_incidents'].sum()
-        avg_satisfaction = df['user_satisfaction'].mean()
-        
-        summary += f"Summary Statistics:\n"
-        summary += f"- Average Uptime: {avg_uptime:.1f}%\n"
-        summary += f"- Average Response Time: {avg_response:.1f} hours\n"
-        summary += f"- Total Incidents: {total_incidents}\n"
-        summary += f"- Critical Incidents: {total_critical}\n"
-        summary += f"- Average User Satisfaction: {avg_satisfaction:.1f}/5.0\n\n"
-        
-        # Trend analysis
-        if len(df) >= 2:
-            first_uptime = df.iloc[0]['uptime_pct']
-            last_uptime = df.iloc[-1]['uptime_pct']
-            trend = "IMPROVING" if last_uptime > first_uptime else "DECLINING" if last_uptime < first_uptime else "STABLE"
-            summary += f"Trend: {trend} (from {first_uptime:.1f}% to {last_uptime:.1f}%)\n\n"
-        
-        # Monthly breakdown
-        summary += "Monthly Breakdown:\n"
-        for _, row in df.iterrows():
-            summary += f"  {row['month']}: "
-            summary += f"Uptime {row['uptime_pct']:.1f}%, "
-            summary += f"Response {row['avg_response_hours']:.1f}h, "
-            summary += f"{row['incidents_count']} incidents "
-            summary += f"({row['critical_incidents']} critical), "
-            summary += f"Satisfaction {row['user_satisfaction']:.1f}/5.0\n"
-        
-        return summary
+            Text summary: statistics, per-metric trends and change points, and
+            monthly/quarterly/yearly breakdowns (see PerformanceSummarizer)
+        """
+        return self.summarizer.summarize(df, level)
     
-    def summarize_incidents(self, incidents: Optional[List[Dict]]) -> str:
+    def summarize_incidents(self, incidents: Optional[List[Dict]], level: int = 0) -> str:
         """
         Convert incident list to text summary for LLM
         
         Args:
             incidents: List of incident dictionaries
+            level: Detail level: 0 lists every incident in full, 1 one line
+                per incident, 2 only the breakdown and analysis
             
         Returns:
             Text summary of incidents with context
@@ -178,6 +306,19 @@ class DocumentLoader:
         summary += f"- Preventable Incidents: {preventable}/{len(incidents)}\n"
         summary += f"- Unresolved Incidents: {unresolved}\n\n"
         
+        if level >= 2:
+            return summary.rstrip("\n") + "\n"
+        
+        if level == 1:
+            summary += "Incident History:\n"
+            for inc in incidents:
+                summary += (
+                    f"[{inc['date']}] {inc['severity'].upper()}: {inc['title']} "
+                    f"(preventable: {inc.get('preventable', 'Unknown')}, "
+                    f"resolved in {inc.get('resolution_hours', 'N/A')}h)\n"
+                )
+            return summary
+        
         # Detailed breakdown
         summary += "Detailed Incident History:\n"
         for inc in incidents:
@@ -193,19 +334,111 @@ class DocumentLoader:
     
     def extract_review_summary(self, review_text: Optional[str]) -> str:
         """
-        Extract key points from past human review
+        Prepare past human review text for the prompt
         
         Args:
             review_text: Full review markdown text
             
         Returns:
-            Condensed summary of key points
+            Review text (the prompt packer fits it to the reviews budget)
         """
         if not review_text:
             return "No past human reviews available."
-        
-        # For now, return first 3000 characters (enough for LLM context)
-        # Could implement smarter extraction later
-        if len(review_text) > 3000:
-            return review_text[:3000] + "\n\n[Review truncated for length...]"
         return review_text
+
+
+class ContractBundle(Mapping):
+    """
+    A contract's data sources, each loaded on first access
+    
+    Behaves like the dictionary load_contract_bundle() used to return.
+    data_completeness counts sources that loaded successfully, or whose
+    file exists for sources not accessed yet.
+    """
+    
+    def __init__(self, loader: DocumentLoader, contract_id: str):
+        """
+        Initialize bundle
+        
+        Args:
+            loader: Loader that reads the sources
+            contract_id: Contract ID
+        """
+        self.contract_id = contract_id
+        self._loader = loader
+        self._paths = loader.source_paths(contract_id)
+        self._values: Dict[str, Any] = {}
+        self._summaries: Dict[Tuple[str, int], str] = {}
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == "contract_id":
+            return self.contract_id
+        if key == "data_completeness":
+            return self._completeness()
+        if key not in SOURCE_READERS:
+            raise KeyError(key)
+        if key not in self._values:
+            self._values[key] = self._load(key)
+        return self._values[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(["contract_id", *SOURCE_READERS, "data_completeness"])
+    
+    def __len__(self) -> int:
+        return len(SOURCE_READERS) + 2
+    
+    def loaded_sources(self) -> List[str]:
+        """Names of the sources read so far"""
+        return list(self._values)
+    
+    def summary(self, name: str, level: int = 0) -> str:
+        """
+        Prompt text for a source (loads the source if needed)
+        
+        Args:
+            name: Source name (key of SOURCE_READERS)
+            level: Detail level (see DocumentLoader.summarize_source)
+            
+        Returns:
+            Summary from DocumentLoader.summarize_source()
+        """
+        if (name, level) not in self._summaries:
+            self._summaries[(name, level)] = self._loader.summarize_source(name, self[name], level)
+        return self._summaries[(name, level)]
+    
+    def load_all(self, parsers: Optional[Executor] = None) -> None:
+        """
+        Read every source and build every summary now
+        
+        Args:
+            parsers: Process pool that parses and summarizes the performance
+                CSV on a cache miss (None: parse in the calling thread)
+        """
+        def parse_history(path: Path) -> pd.DataFrame:
+            frame, self._summaries[("performance_history", 0)] = parsers.submit(_parse_history, str(path), self._loader.summarizer).result()
+            return frame
+        
+        for name in SOURCE_READERS:
+            if name not in self._values:
+                reader = parse_history if parsers and name == "performance_history" else None
+                self._values[name] = self._load(name, reader)
+            self.summary(name)
+    
+    def _load(self, name: str, reader: Optional[Callable[[Path], Any]] = None) -> Any:
+        if name == "performance_history":
+            return self._loader.load_history(self.contract_id, self._paths[name], reader)
+        return self._loader.load_source(name, self._paths[name], reader)
+    
+    def _completeness(self) -> float:
+        available = sum(
+            self._values[name] is not None if name in self._values
+            else self._loader.has_source(self.contract_id, name, self._paths[name])
+            for name in SOURCE_READERS
+        )
+        return available / len(SOURCE_READERS)
+
+
+def _parse_history(path: str, summarizer: PerformanceSummarizer) -> Tuple[pd.DataFrame, str]:
+    """Parse and summarize a performance CSV (runs in a worker process)"""
+    frame = pd.read_csv(path)
+    return frame, summarizer.summarize(frame)
@@ -0,0 +1,247 @@
+"""
+Columnar Performance Store
+Memory-mapped NumPy copy of every contract's performance history, built by
+scripts/compact_performance.py
+"""
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = "manifest.json"
+STORE_VERSION = 1
+HISTORY_SUFFIX = "_history.csv"
+
+# Integral columns within this range are stored as int16, other numeric columns as float32
+INT16_RANGE = (np.iinfo(np.int16).min, np.iinfo(np.int16).max)
+
+
+class PerformanceStore:
+    """
+    Read side of the columnar performance store
+    
+    Layout: one .npy file per column holding the rows of all contracts
+    (grouped by contract, sorted by contract_id) and a manifest mapping
+    each contract to its row range and the size/mtime of the CSV it was
+    built from. Columns are memory-mapped, so a contract's history is a
+    set of zero-copy slices and nothing is parsed at read time. Months
+    are stored as period ordinals and returned as a period[M] column.
+    
+    A rebuilt store is picked up on the next read. Histories whose CSV
+    changed after compaction are reported as missing so callers fall
+    back to the CSV.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize store reader
+        
+        Args:
+            path: Store directory (may not exist yet)
+        """
+        self.path = Path(path)
+        self._signature: Optional[Tuple[int, int]] = None
+        self._manifest: Dict = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+    
+    def contract_ids(self) -> List[str]:
+        """Contracts in the store"""
+        return list(self._current()[0].get("contracts", {}))
+    
+    def columns(self, contract_id: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Raw column slices for one contract
+        
+        Args:
+            contract_id: Contract ID
+        
+        Returns:
+            Read-only memory-mapped arrays by column name ("month" holds
+            period ordinals), or None if the contract is not stored
+        """
+        manifest, columns = self._current()
+        entry = manifest.get("contracts", {}).get(contract_id)
+        if entry is None:
+            return None
+        start, stop = entry[0], entry[1]
+        return {name: array[start:stop] for name, array in columns.items()}
+    
+    def load(self, contract_id: str, source: Optional[Path] = None) -> Optional[pd.DataFrame]:
+        """
+        Load one contract's history without parsing
+        
+        Args:
+            contract_id: Contract ID
+            source: CSV the history was compacted from; if it exists and
+                has changed since, the stored copy is treated as stale
+        
+        Returns:
+            Read-only DataFrame backed by the memory-mapped columns, or
+            None if the contract is not stored or its copy is stale
+        """
+        manifest, columns = self._current()
+        entry = manifest.get("contracts", {}).get(contract_id)
+        if entry is None or (source is not None and _is_stale(entry, source)):
+            return None
+        return _frame(columns, entry[0], entry[1])
+    
+    def has(self, contract_id: str, source: Optional[Path] = None) -> bool:
+        """Whether load() would return a history for the contract"""
+        entry = self._current()[0].get("contracts", {}).get(contract_id)
+        return entry is not None and not (source is not None and _is_stale(entry, source))
+    
+    def portfolio_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Every stored history as one table, for portfolio-wide analytics
+        
+        Args:
+            columns: Columns to include (default: all)
+        
+        Returns:
+            DataFrame with a categorical contract_id column followed by the
+            requested columns (zero-copy views of the store)
+        """
+        manifest, arrays = self._current()
+        contracts = manifest.get("contracts", {})
+        counts = [stop - start for start, stop, *_ in contracts.values()]
+        codes = np.repeat(np.arange(len(contracts), dtype=np.int32), counts)
+        
+        frame = _frame(arrays, 0, len(codes), columns)
+        frame.insert(0, "contract_id", pd.Categorical.from_codes(codes, categories=list(contracts)))
+        return frame
+    
+    def _current(self) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """Manifest and mapped columns, reopened when the store was rebuilt"""
+        try:
+            stat = (self.path / MANIFEST).stat()
+        except FileNotFoundError:
+            return {}, {}
+        
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if signature != self._signature:
+                manifest = json.loads((self.path / MANIFEST).read_text(encoding="utf-8"))
+                if manifest.get("version") != STORE_VERSION:
+                    print(f"Warning: Ignoring performance store with version {manifest.get('version')}")
+                    manifest = {}
+                self._columns = {
+                    name: np.load(self.path / _column_file(name, manifest["generation"]), mmap_mode="r")
+                    for name in manifest.get("columns", {})
+                } if manifest.get("rows") else {}
+                self._manifest = manifest
+                self._signature = signature
+            return self._manifest, self._columns
+
+
+def compact_performance(source_dir: str, store_dir: str) -> Dict:
+    """
+    Build the columnar store from every {contract_id}_history.csv
+    
+    Numeric columns are downcast (int16 for integral columns within
+    range, float32 otherwise) and months are stored as period ordinals.
+    Files that cannot be parsed, and non-numeric columns, are skipped.
+    The new store replaces the old one atomically; open readers keep
+    their mapping until they next read.
+    
+    Args:
+        source_dir: Folder with the performance CSVs
+        store_dir: Store directory (created if needed)
+    
+    Returns:
+        Dictionary with contracts, rows, csv_bytes and store_bytes
+    """
+    frames, contracts, csv_bytes = [], {}, 0
+    row = 0
+    for path in sorted(Path(source_dir).glob(f"*{HISTORY_SUFFIX}")):
+        contract_id = path.name[:-len(HISTORY_SUFFIX)]
+        stat = path.stat()
+        try:
+            df = pd.read_csv(path)
+            df["month"] = pd.to_datetime(df["month"].astype(str), format="%Y-%m").dt.to_period("M")
+        except Exception as e:
+            print(f"Warning: Skipping {path.name}: {e}")
+            continue
+        
+        frames.append(df)
+        contracts[contract_id] = [row, row + len(df), stat.st_mtime_ns, stat.st_size]
+        row += len(df)
+        csv_bytes += stat.st_size
+    
+    combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    arrays = {}
+    for name in combined.columns:
+        if name == "month":
+            arrays[name] = combined[name].array.asi8
+        elif pd.api.types.is_numeric_dtype(combined[name]):
+            arrays[name] = _downcast(combined[name].to_numpy(dtype=np.float64))
+        else:
+            print(f"Warning: Not storing non-numeric column {name}")
+    
+    store = Path(store_dir)
+    store.mkdir(parents=True, exist_ok=True)
+    generation = uuid.uuid4().hex[:12]
+    for name, values in arrays.items():
+        np.save(store / _column_file(name, generation), values)
+    
+    manifest = {
+        "version": STORE_VERSION,
+        "generation": generation,
+        "rows": row,
+        "columns": {name: str(values.dtype) for name, values in arrays.items()},
+        "contracts": contracts
+    }
+    temporary = store / f"{MANIFEST}.{generation}"
+    temporary.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(temporary, store / MANIFEST)
+    
+    # Old generations: mapped files stay readable after unlinking on POSIX
+    for path in store.glob("*.npy"):
+        if not path.name.endswith(f".{generation}.npy"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    
+    return {
+        "contracts": len(contracts),
+        "rows": row,
+        "csv_bytes": csv_bytes,
+        "store_bytes": sum(values.nbytes for values in arrays.values())
+    }
+
+
+def _downcast(values: np.ndarray) -> np.ndarray:
+    integral = (
+        len(values) > 0
+        and not np.isnan(values).any()
+        and np.array_equal(values, np.round(values))
+        and INT16_RANGE[0] <= values.min() and values.max() <= INT16_RANGE[1]
+    )
+    return values.astype(np.int16 if integral else np.float32)
+
+
+def _frame(arrays: Dict[str, np.ndarray], start: int, stop: int, names: Optional[List[str]] = None) -> pd.DataFrame:
+    """DataFrame over row slices of the mapped columns (no copies)"""
+    data = {}
+    for name in names or list(arrays):
+        values = arrays[name][start:stop]
+        data[name] = pd.arrays.PeriodArray(values, dtype=pd.PeriodDtype("M")) if name == "month" else values
+    return pd.DataFrame(data, copy=False)
+
+
+def _is_stale(entry: List[int], source: Path) -> bool:
+    try:
+        stat = source.stat()
+    except FileNotFoundError:
+        return False  # CSV removed after compaction: the stored copy is all there is
+    return (stat.st_mtime_ns, stat.st_size) != (entry[2], entry[3])
+
+
+def _column_file(name: str, generation: str) -> str:
+    return f"{name}.{generation}.npy"
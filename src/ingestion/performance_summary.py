@@ -0,0 +1,257 @@
+"""
+Performance History Summarizer
+Multi-resolution text summary of monthly performance data for the reasoning prompt
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Detail levels accepted by PerformanceSummarizer.summarize()
+SUMMARY_LEVELS = 4
+
+# (column, label, unit, how months roll up into a period, higher is better)
+METRICS = (
+    ("uptime_pct", "Uptime", "%", "mean", True),
+    ("avg_response_hours", "Response Time", "h", "mean", False),
+    ("incidents_count", "Incidents", "", "sum", False),
+    ("critical_incidents", "Critical Incidents", "", "sum", False),
+    ("user_satisfaction", "User Satisfaction", "", "mean", True)
+)
+
+
+class PerformanceSummarizer:
+    """
+    Summarizes a monthly performance history at decreasing resolution
+    
+    The most recent months are listed one per line, the period before
+    that is rolled up by quarter and anything older by year, so prompt
+    length grows slowly with history length. Every metric also gets a
+    least-squares slope, its volatility and the month where its mean
+    shifted most (a single change point). Statistics are computed on the
+    whole (months x metrics) matrix at once.
+    """
+    
+    def __init__(
+        self,
+        recent_months: int = 12,
+        quarterly_months: int = 24,
+        min_segment: int = 3,
+        shift_threshold: float = 2.0
+    ):
+        """
+        Initialize summarizer
+        
+        Args:
+            recent_months: Latest months listed individually
+            quarterly_months: Months before those rolled up by quarter (older ones by year)
+            min_segment: Fewest months on either side of a change point
+            shift_threshold: Mean shift, in pooled standard deviations, reported as a change point
+        """
+        self.recent_months = recent_months
+        self.quarterly_months = quarterly_months
+        self.min_segment = min_segment
+        self.shift_threshold = shift_threshold
+    
+    def summarize(self, df: Optional[pd.DataFrame], level: int = 0) -> str:
+        """
+        Convert performance DataFrame to text summary for LLM
+        
+        Args:
+            df: Monthly performance data in chronological order
+            level: Detail level, 0 (configured resolution) to SUMMARY_LEVELS - 1
+                (statistics and trends only); each level is shorter
+        
+        Returns:
+            Text summary with statistics, trends and the period breakdowns
+        """
+        if df is None or df.empty:
+            return "No performance data available."
+        
+        resolution = self._resolution(level)
+        
+        months = df["month"].astype(str).to_numpy()
+        values = df[[column for column, *_ in METRICS]].to_numpy(dtype=np.float64)
+        
+        summary = f"PERFORMANCE HISTORY ({len(df)} months, {months[0]} to {months[-1]}):\n\n"
+        summary += self._statistics(values)
+        summary += self._trends(months, values)
+        
+        if resolution is None:
+            return summary.rstrip("\n") + "\n"
+        
+        # Oldest first: yearly, then quarterly, then monthly
+        recent_months, quarterly_months = resolution
+        recent_start = max(len(df) - recent_months, 0)
+        quarterly_start = max(recent_start - quarterly_months, 0)
+        for title, key, (start, end) in (
+            ("Yearly", _year_keys, (0, quarterly_start)),
+            ("Quarterly", _quarter_keys, (quarterly_start, recent_start))
+        ):
+            if end > start:
+                labels, rolled = _roll_up(months[start:end], values[start:end], key)
+                summary += f"{title} Breakdown:\n" + _breakdown(labels, rolled)
+        
+        summary += "Monthly Breakdown:\n" + _breakdown(months[recent_start:], values[recent_start:])
+        return summary.rstrip("\n") + "\n"
+    
+    def _resolution(self, level: int) -> Optional[Tuple[int, int]]:
+        """(monthly, quarterly) months listed at a detail level; None for no breakdown"""
+        if level <= 0:
+            return self.recent_months, self.quarterly_months
+        if level == 1:
+            return max(self.recent_months // 2, 1), self.quarterly_months // 2
+        if level == 2:
+            return min(self.recent_months, 3), 0
+        return None
+    
+    def _statistics(self, values: np.ndarray) -> str:
+        means = np.nanmean(values, axis=0)
+        totals = np.nansum(values, axis=0)
+        return (
+            "Summary Statistics:\n"
+            f"- Average Uptime: {means[0]:.1f}%\n"
+            f"- Average Response Time: {means[1]:.1f} hours\n"
+            f"- Total Incidents: {totals[2]:.0f}\n"
+            f"- Critical Incidents: {totals[3]:.0f}\n"
+            f"- Average User Satisfaction: {means[4]:.1f}/5.0\n\n"
+        )
+    
+    def _trends(self, months: np.ndarray, values: np.ndarray) -> str:
+        if len(values) < 2:
+            return ""
+        
+        slopes = least_squares_slopes(values)
+        volatility = values.std(axis=0, ddof=1)
+        split, before, after = self.change_points(values)
+        
+        # Stable when the fitted change over the whole history is small next to the noise
+        stable = np.abs(slopes) * (len(values) - 1) <= 0.5 * volatility
+        improving = (slopes > 0) == np.array([higher for *_, higher in METRICS])
+        directions = np.where(stable, "STABLE", np.where(improving, "IMPROVING", "DECLINING"))
+        
+        text = "Trends (least-squares slope per month; volatility = standard deviation):\n"
+        for i, (_, label, unit, _, _) in enumerate(METRICS):
+            text += f"- {label}: {directions[i]} ({slopes[i]:+.2f}{unit}/month, volatility {volatility[i]:.2f}{unit})"
+            if split[i] >= 0:
+                text += f"; shifted at {months[split[i]]} from {before[i]:.1f}{unit} to {after[i]:.1f}{unit} average"
+            text += "\n"
+        return text + "\n"
+    
+    def change_points(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the strongest mean shift in every column
+        
+        Each split leaving at least min_segment rows per side is scored by
+        the variance it explains (between-segment sum of squares), using
+        cumulative sums so all splits and columns are evaluated together.
+        Gradual trends are not reported as shifts.
+        
+        Args:
+            values: (months x metrics) matrix
+        
+        Returns:
+            Tuple of (row index where the new level starts, or -1 when no
+            shift reaches shift_threshold pooled standard deviations;
+            mean before; mean after)
+        """
+        count, width = values.shape
+        none = np.full(width, -1), np.full(width, np.nan), np.full(width, np.nan)
+        if count < 2 * self.min_segment:
+            return none
+        
+        sizes = np.arange(self.min_segment, count - self.min_segment + 1)[:, None]
+        sums = np.cumsum(values, axis=0)
+        squares = np.cumsum(values ** 2, axis=0)
+        left_sum, left_squares = sums[sizes[:, 0] - 1], squares[sizes[:, 0] - 1]
+        right_sum, right_squares = sums[-1] - left_sum, squares[-1] - left_squares
+        
+        left_mean = left_sum / sizes
+        right_mean = right_sum / (count - sizes)
+        between = sizes * (count - sizes) / count * (right_mean - left_mean) ** 2
+        within = (left_squares - left_sum * left_mean) + (right_squares - right_sum * right_mean)
+        
+        best = np.argmax(between, axis=0)
+        columns = np.arange(width)
+        shift = np.abs(right_mean[best, columns] - left_mean[best, columns])
+        residual = np.maximum(within[best, columns], 0)
+        pooled_std = np.sqrt(residual / (count - 2))
+        
+        # A steady trend also splits into two different means; only report a
+        # step that fits better than the least-squares line does
+        offsets = np.arange(count) - (count - 1) / 2
+        total = squares[-1] - sums[-1] ** 2 / count
+        linear_residual = total - least_squares_slopes(values) ** 2 * (offsets @ offsets)
+        significant = (
+            (shift > 1e-9)
+            & (shift >= self.shift_threshold * pooled_std)
+            & (residual < linear_residual - 1e-9)
+        )
+        
+        split = np.where(significant, sizes[best, 0], -1)
+        return split, left_mean[best, columns], right_mean[best, columns]
+
+
+def least_squares_slopes(values: np.ndarray) -> np.ndarray:
+    """
+    Slope of the least-squares line through each column
+    
+    Args:
+        values: (rows x columns) matrix, rows evenly spaced
+    
+    Returns:
+        Change per row for every column
+    """
+    offsets = np.arange(len(values)) - (len(values) - 1) / 2
+    return offsets @ (values - values.mean(axis=0)) / (offsets @ offsets)
+
+
+def _roll_up(months: np.ndarray, values: np.ndarray, key) -> Tuple[List[str], np.ndarray]:
+    """Aggregate consecutive months that share a period key (sum or mean per metric)"""
+    keys, labels = key(months)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.diff(np.r_[starts, len(keys)])[:, None]
+    
+    totals = np.add.reduceat(values, starts, axis=0)
+    averaged = np.array([how == "mean" for _, _, _, how, _ in METRICS])
+    return [labels[i] for i in starts], np.where(averaged, totals / counts, totals)
+
+
+def _year_keys(months: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    periods = _periods(months)
+    if periods is None:
+        return _chunk_keys(months, 12)
+    return periods.year.to_numpy(), [str(year) for year in periods.year]
+
+
+def _quarter_keys(months: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    periods = _periods(months)
+    if periods is None:
+        return _chunk_keys(months, 3)
+    keys = periods.year.to_numpy() * 4 + periods.quarter.to_numpy()
+    return keys, [f"{year}-Q{quarter}" for year, quarter in zip(periods.year, periods.quarter)]
+
+
+def _chunk_keys(months: np.ndarray, size: int) -> Tuple[np.ndarray, List[str]]:
+    """Fixed-size groups for month labels that are not YYYY-MM"""
+    keys = np.arange(len(months)) // size
+    last = np.minimum((keys + 1) * size, len(months)) - 1
+    return keys, [f"{months[i]} to {months[j]}" for i, j in zip(keys * size, last)]
+
+
+def _periods(months: np.ndarray) -> Optional[pd.PeriodIndex]:
+    """Parse YYYY-MM labels (None if any label has another format)"""
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(months, format="%Y-%m")).to_period("M")
+    except (ValueError, TypeError):
+        return None
+
+
+def _breakdown(labels, values: np.ndarray) -> str:
+    lines = [
+        f"  {label}: Uptime {uptime:.1f}%, Response {response:.1f}h, "
+        f"{incidents:.0f} incidents ({critical:.0f} critical), Satisfaction {satisfaction:.1f}/5.0\n"
+        for label, (uptime, response, incidents, critical, satisfaction) in zip(labels, values.tolist())
+    ]
+    return "".join(lines) + "\n"
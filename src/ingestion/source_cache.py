@@ -0,0 +1,126 @@
+"""
+Source File Cache
+Bounded read-through cache of parsed data files, invalidated by mtime and size
+"""
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+
+class SourceCache:
+    """
+    LRU cache of parsed files keyed by path
+    
+    Each lookup stats the file; the cached value is reused only while the
+    file's modification time and size are unchanged, so edits are picked
+    up on the next read. Entries are evicted least recently used first
+    once their estimated in-memory size exceeds max_bytes.
+    
+    Cached values are shared between callers and must be treated as
+    read-only.
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize cache
+        
+        Args:
+            max_bytes: Memory cap for cached values (estimated); 0 disables caching
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+    
+    def get(self, path: Path, reader: Callable[[Path], Any]) -> Optional[Any]:
+        """
+        Read a file through the cache
+        
+        Args:
+            path: File path
+            reader: Parses the file (called on a miss or after the file changed)
+        
+        Returns:
+            Parsed value, or None if the file does not exist
+        """
+        key = str(path)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._discard(key)
+            return None
+        
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+        
+        value = reader(path)
+        self._store(key, signature, value)
+        return value
+    
+    def clear(self) -> None:
+        """Drop every cached value"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict:
+        """
+        Get cache counters
+        
+        Returns:
+            Dictionary with hits, misses, evictions, entries and bytes
+        """
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "bytes": self._bytes}
+    
+    def _store(self, key: str, signature: Tuple[int, int], value: Any) -> None:
+        size = estimate_bytes(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self._bytes -= previous[2]
+            if size > self.max_bytes:
+                return  # Larger than the whole cache: serve it uncached
+            
+            self._entries[key] = (signature, value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+    
+    def _discard(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry:
+                self._bytes -= entry[2]
+
+
+def estimate_bytes(value: Any) -> int:
+    """
+    Estimate the memory held by a parsed value
+    
+    Args:
+        value: DataFrame, string, or JSON-like structure
+    
+    Returns:
+        Approximate size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(item) for item in value)
+    return sys.getsizeof(value)
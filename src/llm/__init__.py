@@ -5,14 +5,50 @@ from .provider import LLMProvider
 from .ollama_provider import OllamaProvider
 from .azure_provider import AzureOpenAIProvider
 from .gemini_provider import GeminiProvider
-from .config import get_llm_provider, get_llm_config, load_config
+from .cache import (
+    CachedLLMProvider,
+    LLMResponseCache,
+    StreamCompletion,
+    cache_bypass,
+    get_response_cache,
+    stream_completion
+)
+from .rate_limit import (
+    BATCH,
+    INTERACTIVE,
+    RateLimitedLLMProvider,
+    RateLimiter,
+    RateLimitError,
+    get_rate_limiter,
+    rate_limiter_stats,
+    request_priority
+)
+from .routing import RoutingLLMProvider
+from .config import get_llm_provider, get_llm_config, get_task_timeouts, load_config, clear_provider_registry
 
 __all__ = [
     "LLMProvider",
     "OllamaProvider",
     "AzureOpenAIProvider",
     "GeminiProvider",
+    "CachedLLMProvider",
+    "LLMResponseCache",
+    "StreamCompletion",
+    "cache_bypass",
+    "get_response_cache",
+    "stream_completion",
+    "RateLimitedLLMProvider",
+    "RateLimiter",
+    "RateLimitError",
+    "get_rate_limiter",
+    "rate_limiter_stats",
+    "request_priority",
+    "INTERACTIVE",
+    "BATCH",
+    "RoutingLLMProvider",
     "get_llm_provider",
     "get_llm_config",
-    "load_config"
+    "get_task_timeouts",
+    "load_config",
+    "clear_provider_registry"
 ]
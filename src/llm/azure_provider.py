@@ -61,3 +61,7 @@ class AzureOpenAIProvider(LLMProvider):
             "deployment": self.deployment,
             "status": "not_implemented"
         }
+    
+    def model_id(self) -> str:
+        """Identify the provider and model"""
+        return f"azure:{self.deployment}"
@@ -0,0 +1,429 @@
+"""
+LLM Response Cache
+Content-addressed caching of LLM responses in memory and on disk
+"""
+import asyncio
+import contextvars
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import aclosing, closing, contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from .provider import LLMProvider
+
+
+# Set inside cache_bypass(): read through to the provider, then refresh the cache
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+_caches: Dict[str, "LLMResponseCache"] = {}
+_caches_lock = threading.Lock()
+
+
+class StreamCompletion:
+    """A consumer's signal that the stream it stopped reading holds a complete response"""
+    
+    def __init__(self):
+        self.complete = False
+    
+    def done(self) -> None:
+        """Mark the response as complete before closing the stream early"""
+        self.complete = True
+
+
+# Set inside stream_completion(): streams opened in the block report to it
+_completion: contextvars.ContextVar[Optional[StreamCompletion]] = contextvars.ContextVar(
+    "llm_stream_completion", default=None
+)
+
+
+@contextmanager
+def cache_bypass() -> Iterator[None]:
+    """
+    Skip cache lookups for LLM calls made inside this block
+    
+    Fresh responses are still written back, so the cache is refreshed.
+    Applies to the current thread/task and anything it starts.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+@contextmanager
+def stream_completion() -> Iterator[StreamCompletion]:
+    """
+    Let the consumer of streams opened in this block mark them complete
+    
+    A cached stream closed before its end is only stored if done() was
+    called first. Closes caused by a consumer error or by garbage
+    collection drop the partial response.
+    """
+    completion = StreamCompletion()
+    token = _completion.set(completion)
+    try:
+        yield completion
+    finally:
+        _completion.reset(token)
+
+
+class LLMResponseCache:
+    """
+    Two-tier response cache keyed by a hash of model, prompt and sampling settings
+    
+    - Memory tier: LRU of the most recent responses
+    - Disk tier: SQLite table shared across processes and restarts
+    
+    Entries older than ttl_seconds are treated as misses. The disk tier is
+    trimmed to max_disk_entries by least recent access.
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "data/llm_cache.db",
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        max_memory_entries: int = 256,
+        max_disk_entries: int = 10000
+    ):
+        """
+        Initialize response cache
+        
+        Args:
+            db_path: SQLite database for the disk tier
+            ttl_seconds: Entry lifetime (None = never expire)
+            max_memory_entries: Size of the in-memory LRU
+            max_disk_entries: Maximum rows kept on disk
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes_since_trim = 0
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "evictions": 0
+        }
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connect()
+    
+    @staticmethod
+    def make_key(model_id: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        """
+        Build the content address for a request
+        
+        Args:
+            model_id: Provider/model identifier
+            prompt: Prompt text
+            max_tokens: Maximum tokens requested
+            temperature: Sampling temperature
+        
+        Returns:
+            SHA-256 hex digest
+        """
+        payload = json.dumps([model_id, prompt, max_tokens, float(temperature)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response, promoting disk hits into memory
+        
+        Args:
+            key: Cache key from make_key
+        
+        Returns:
+            Cached response or None
+        """
+        now = time.time()
+        
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and not self._expired(cached[1], now):
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return cached[0]
+            if cached is not None:
+                del self._memory[key]
+        
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        
+        if row is None or self._expired(row[1], now):
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        
+        with conn:
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            self._remember(key, row[0], row[1])
+        return row[0]
+    
+    def put(self, key: str, model_id: str, response: str) -> None:
+        """
+        Store a response in both tiers
+        
+        Args:
+            key: Cache key from make_key
+            model_id: Provider/model identifier (kept for inspection)
+            response: Response text
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            self._writes_since_trim += 1
+            trim = self._writes_since_trim >= 100
+            if trim:
+                self._writes_since_trim = 0
+        
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO responses (key, model_id, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET response = excluded.response, "
+                "created_at = excluded.created_at, accessed_at = excluded.accessed_at",
+                (key, model_id, response, now, now)
+            )
+        
+        if trim:
+            self.trim()
+    
+    def trim(self) -> int:
+        """
+        Remove expired rows and trim the disk tier to max_disk_entries
+        
+        Returns:
+            Number of rows removed
+        """
+        conn = self._connect()
+        removed = 0
+        with conn:
+            if self.ttl_seconds is not None:
+                removed += conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+                ).rowcount
+            removed += conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            ).rowcount
+        
+        with self._lock:
+            self._stats["evictions"] += removed
+        return removed
+    
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            self._memory.clear()
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM responses")
+    
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._stats["bypassed"] += 1
+    
+    def stats(self) -> Dict:
+        """
+        Get hit/miss counters and tier sizes
+        
+        Returns:
+            Dictionary of cache metrics
+        """
+        disk_entries = self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["disk_entries"] = disk_entries
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+    
+    def _remember(self, key: str, response: str, created_at: float) -> None:
+        """Add to the memory LRU (caller holds the lock)"""
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+    
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the schema if needed"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        model_id TEXT NOT NULL,
+                        response TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                """)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)"
+                )
+            self._local.conn = conn
+        return conn
+
+
+class CachedLLMProvider(LLMProvider):
+    """Wraps any provider and serves repeated identical requests from a cache"""
+    
+    def __init__(self, provider: LLMProvider, cache: LLMResponseCache):
+        """
+        Initialize cached provider
+        
+        Args:
+            provider: Provider that performs real generations
+            cache: Response cache (may be shared between providers)
+        """
+        self.provider = provider
+        self.cache = cache
+    
+    def generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        """Generate text, returning a cached response when available"""
+        key = self.cache.make_key(self.model_id(), prompt, max_tokens, temperature)
+        
+        if _bypass.get():
+            self.cache.record_bypass()
+        else:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        response = self.provider.generate(prompt, max_tokens, temperature)
+        if response:
+            self.cache.put(key, self.model_id(), response)
+        return response
+    
+    async def agenerate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        """Generate text asynchronously, returning a cached response when available"""
+        key = self.cache.make_key(self.model_id(), prompt, max_tokens, temperature)
+        
+        if _bypass.get():
+            self.cache.record_bypass()
+        else:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                return cached
+        
+        response = await self.provider.agenerate(prompt, max_tokens, temperature)
+        if response:
+            await asyncio.to_thread(self.cache.put, key, self.model_id(), response)
+        return response
+    
+    def stream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> Iterator[str]:
+        """Stream text; a cached response is yielded as one chunk"""
+        key = self.cache.make_key(self.model_id(), prompt, max_tokens, temperature)
+        
+        if _bypass.get():
+            self.cache.record_bypass()
+        else:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        # Streams that fail are not cached. A stream closed early (GeneratorExit)
+        # is only cached when the consumer marked it complete (stream_completion).
+        completion = _completion.get()
+        chunks = []
+        try:
+            with closing(self.provider.stream(prompt, max_tokens, temperature)) as stream:
+                for chunk in stream:
+                    chunks.append(chunk)
+                    yield chunk
+        except GeneratorExit:
+            if completion is not None and completion.complete:
+                self._store_stream(key, chunks)
+            raise
+        self._store_stream(key, chunks)
+    
+    async def astream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> AsyncIterator[str]:
+        """Stream text asynchronously; a cached response is yielded as one chunk"""
+        key = self.cache.make_key(self.model_id(), prompt, max_tokens, temperature)
+        
+        if _bypass.get():
+            self.cache.record_bypass()
+        else:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                yield cached
+                return
+        
+        completion = _completion.get()
+        chunks = []
+        try:
+            async with aclosing(self.provider.astream(prompt, max_tokens, temperature)) as stream:
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    yield chunk
+        except GeneratorExit:
+            if completion is not None and completion.complete:
+                await asyncio.to_thread(self._store_stream, key, chunks)
+            raise
+        await asyncio.to_thread(self._store_stream, key, chunks)
+    
+    def _store_stream(self, key: str, chunks: List[str]) -> None:
+        response = "".join(chunks)
+        if response:
+            self.cache.put(key, self.model_id(), response)
+    
+    def validate_health(self) -> bool:
+        return self.provider.validate_health()
+    
+    def get_model_info(self) -> dict:
+        return self.provider.get_model_info()
+    
+    def model_id(self) -> str:
+        return self.provider.model_id()
+
+
+def get_response_cache(db_path: str = "data/llm_cache.db", **options) -> LLMResponseCache:
+    """
+    Get the shared cache for a database, creating it on first use
+    
+    Providers built separately for each agent share one memory tier and
+    one set of metrics. Options only apply when the cache is created.
+    
+    Args:
+        db_path: SQLite database for the disk tier
+        **options: LLMResponseCache options (ttl_seconds, ...)
+    
+    Returns:
+        LLMResponseCache instance
+    """
+    key = str(Path(db_path).resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = LLMResponseCache(db_path, **options)
+            _caches[key] = cache
+        return cache
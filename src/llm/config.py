@@ -2,14 +2,21 @@
 LLM Configuration and Provider Factory
 Handles provider selection based on configuration
 """
+import copy
+import hashlib
+import json
 import os
+import threading
 import yaml
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from dotenv import load_dotenv
 from .provider import LLMProvider
 from .ollama_provider import OllamaProvider
 from .azure_provider import AzureOpenAIProvider
 from .gemini_provider import GeminiProvider
+from .cache import CachedLLMProvider, get_response_cache
+from .rate_limit import RateLimitedLLMProvider, get_rate_limiter
+from .routing import RoutingLLMProvider
 
 
 from pathlib import Path
@@ -17,9 +24,37 @@ from pathlib import Path
 # Load environment variables
 load_dotenv()
 
+# Environment variables that override config.yaml provider settings:
+# name -> (provider section, setting). Task profiles are applied on top.
+PROVIDER_ENV_VARS = {
+    "OLLAMA_MODEL": ("ollama", "model"),
+    "OLLAMA_BASE_URL": ("ollama", "base_url"),
+    "AZURE_OPENAI_ENDPOINT": ("azure", "endpoint"),
+    "AZURE_OPENAI_API_KEY": ("azure", "api_key"),
+    "AZURE_OPENAI_DEPLOYMENT": ("azure", "deployment"),
+    "GEMINI_API_KEY": ("gemini", "api_key")
+}
 
-def load_config(config_path: str = "config.yaml") -> dict:
-    """Load configuration from YAML file"""
+# Per-task generation settings used when no llm.profiles entry sets them
+# (reasoning has always sampled slightly warmer than the provider default)
+TASK_DEFAULTS = {
+    "reasoning": {"temperature": 0.3}
+}
+
+# Parsed config files keyed by path, with the (mtime, size) they were parsed at
+_configs: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+# Provider instances keyed by a hash of the settings that built them
+_providers: Dict[str, LLMProvider] = {}
+
+# Provider key currently in use by each (config file, task)
+_provider_keys: Dict[Tuple[str, Optional[str]], str] = {}
+
+_registry_lock = threading.Lock()
+
+
+def _resolve_config_path(config_path: str) -> Path:
+    """Find the config file in the current directory or the project root"""
     target_path = Path(config_path)
     
     # If the file isn't found in current directory, try project root
@@ -27,42 +62,237 @@ def load_config(config_path: str = "config.yaml") -> dict:
         # This assumes src/llm/config.py is 2 levels deep from root
         root_path = Path(__file__).parent.parent.parent
         target_path = root_path / config_path
-        
+    
+    return target_path
+
+
+def load_config(config_path: str = "config.yaml") -> dict:
+    """
+    Load configuration from YAML file
+    
+    The parsed file is cached and only re-read when its modification
+    time or size changes, so edits are picked up without a restart.
+    """
+    target_path = _resolve_config_path(config_path)
+    
+    try:
+        stat = target_path.stat()
+    except FileNotFoundError:
+        raise RuntimeError(f"Configuration file not found: {target_path} (CWD: {os.getcwd()})")
+    
+    key = str(target_path.resolve())
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _registry_lock:
+        cached = _configs.get(key)
+    if cached and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+    
     try:
         with open(target_path, 'r') as f:
-            return yaml.safe_load(f)
+            config = yaml.safe_load(f) or {}
     except FileNotFoundError:
         raise RuntimeError(f"Configuration file not found: {target_path} (CWD: {os.getcwd()})")
     except yaml.YAMLError as e:
         raise RuntimeError(f"Invalid YAML configuration: {str(e)}")
+    
+    with _registry_lock:
+        _configs[key] = (signature, config)
+    return copy.deepcopy(config)
 
 
-def get_llm_provider(config_path: str = "config.yaml") -> LLMProvider:
+def get_llm_provider(config_path: str = "config.yaml", task: Optional[str] = None) -> LLMProvider:
     """
     Factory function to get LLM provider based on configuration
     
+    Providers are memoized by the settings that build them, so every agent
+    shares one instance (and one API client) per configuration. After
+    config.yaml changes, the next call returns a provider for the new
+    settings and the registry drops the one it replaces.
+    
     Args:
         config_path: Path to configuration file
+        task: LLM task name; its llm.profiles entry overrides the provider/model
         
     Returns:
         Configured LLM provider instance
     """
     config = load_config(config_path)
-    llm_config = config.get("llm", {})
+    llm_config = _task_config(_env_config(config.get("llm", {})), task)
+    key = _provider_key(llm_config)
+    usage = (str(_resolve_config_path(config_path).resolve()), task)
+    
+    with _registry_lock:
+        provider = _providers.get(key)
+        if provider is not None:
+            _use_provider_key(usage, key)
+            return provider
+    
+    routing_config = llm_config.get("routing", {})
+    if routing_config.get("enabled", False):
+        provider = _build_router(llm_config, routing_config)
+    else:
+        provider = _with_rate_limit(_build_provider(llm_config), llm_config)
+    
+    cache_config = llm_config.get("cache", {})
+    if cache_config.get("enabled", False):
+        ttl_hours = cache_config.get("ttl_hours")
+        cache = get_response_cache(
+            cache_config.get("db_path", "data/llm_cache.db"),
+            ttl_seconds=ttl_hours * 3600 if ttl_hours else None,
+            max_memory_entries=cache_config.get("memory_entries", 256),
+            max_disk_entries=cache_config.get("max_disk_entries", 10000)
+        )
+        provider = CachedLLMProvider(provider, cache)
+    
+    with _registry_lock:
+        # Another thread may have built the same provider meanwhile
+        provider = _providers.setdefault(key, provider)
+        _use_provider_key(usage, key)
+        return provider
+
+
+def _use_provider_key(usage: Tuple[str, Optional[str]], key: str) -> None:
+    """
+    Record the provider a (config file, task) now uses (caller holds the lock)
+    
+    The provider it used before is evicted once no other config file or
+    task still uses it, so reloads do not accumulate provider stacks.
+    """
+    previous = _provider_keys.get(usage)
+    _provider_keys[usage] = key
+    if previous is not None and previous != key and previous not in _provider_keys.values():
+        _providers.pop(previous, None)
+
+
+def _env_config(llm_config: dict) -> dict:
+    """Overlay PROVIDER_ENV_VARS onto the base provider sections (before task profiles)"""
+    for name, (section, setting) in PROVIDER_ENV_VARS.items():
+        value = os.getenv(name)
+        if value:
+            llm_config[section] = {**(llm_config.get(section) or {}), setting: value}
+    return llm_config
+
+
+def _task_config(llm_config: dict, task: Optional[str]) -> dict:
+    """
+    Overlay a task's model profile onto the LLM settings
+    
+    A profile's model / max_tokens / temperature replace those of its
+    provider's section. Naming a provider in the profile selects that
+    provider alone, bypassing routing.
+    """
+    profile = (llm_config.get("profiles") or {}).get(task) if task else None
+    if not profile:
+        return llm_config
+    
+    llm_config = copy.deepcopy(llm_config)
+    if "provider" in profile:
+        llm_config["provider"] = profile["provider"].lower()
+        llm_config["routing"] = {**llm_config.get("routing", {}), "enabled": False}
+    provider_name = llm_config.get("provider", "ollama").lower()
+    
+    overrides = {key: profile[key] for key in ("model", "max_tokens", "temperature") if key in profile}
+    if provider_name == "azure" and "model" in overrides:
+        overrides["deployment"] = overrides.pop("model")
+    llm_config[provider_name] = {**llm_config.get(provider_name, {}), **overrides}
+    return llm_config
+
+
+def _with_rate_limit(provider: LLMProvider, llm_config: dict) -> LLMProvider:
+    """
+    Wrap a provider with its shared rate limiter
+    
+    With rate_limit disabled the limiter has no budgets, but 429s are
+    still waited out (Retry-After or default_backoff) and retried.
+    """
+    # Rate limiting sits inside the cache so cache hits spend no quota
+    rate_config = llm_config.get("rate_limit", {})
+    enabled = rate_config.get("enabled", False)
+    limiter = get_rate_limiter(
+        provider.model_id(),
+        requests_per_minute=rate_config.get("requests_per_minute") if enabled else None,
+        tokens_per_minute=rate_config.get("tokens_per_minute") if enabled else None,
+        burst=rate_config.get("burst", 0.1),
+        default_backoff=rate_config.get("default_backoff", 10.0)
+    )
+    return RateLimitedLLMProvider(provider, limiter, max_retries=rate_config.get("max_retries", 3))
+
+
+def _build_router(llm_config: dict, routing_config: dict) -> LLMProvider:
+    """Build every routed provider (each with its own rate limiter) behind a router"""
+    backends = []
+    for name in _routing_providers(llm_config):
+        try:
+            backend = _build_provider({**llm_config, "provider": name})
+        except ValueError as e:
+            print(f"⚠️  [Router] Skipping {name}: {e}")
+            continue
+        backends.append(_with_rate_limit(backend, llm_config))
+    
+    if not backends:
+        raise ValueError("LLM routing is enabled but none of its providers could be configured")
+    
+    return RoutingLLMProvider(
+        backends,
+        hedge_quantile=routing_config.get("hedge_quantile", 0.95),
+        min_samples=routing_config.get("min_samples", 20),
+        default_hedge_delay=routing_config.get("default_hedge_delay", 10.0),
+        failure_threshold=routing_config.get("failure_threshold", 5),
+        recovery_seconds=routing_config.get("recovery_seconds", 30.0)
+    )
+
+
+def _routing_providers(llm_config: dict) -> list:
+    """Provider names in routing order (the active provider first by default)"""
+    primary = llm_config.get("provider", "ollama").lower()
+    names = [name.lower() for name in llm_config.get("routing", {}).get("providers") or [primary]]
+    return list(dict.fromkeys(names))
+
+
+def _provider_key(llm_config: dict) -> str:
+    """Hash the settings (env overrides already applied) that determine a provider"""
+    provider_name = llm_config.get("provider", "ollama").lower()
+    routing_config = llm_config.get("routing", {})
+    names = _routing_providers(llm_config) if routing_config.get("enabled", False) else [provider_name]
+    settings = {
+        "provider": provider_name,
+        "settings": {name: llm_config.get(name, {}) for name in names},
+        "routing": routing_config,
+        "cache": llm_config.get("cache", {}),
+        "rate_limit": llm_config.get("rate_limit", {})
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def clear_provider_registry() -> None:
+    """Forget cached configs and providers (the next call rebuilds them)"""
+    with _registry_lock:
+        _configs.clear()
+        _providers.clear()
+        _provider_keys.clear()
+
+
+def _build_provider(llm_config: dict) -> LLMProvider:
+    """Build the configured provider without caching"""
     provider_name = llm_config.get("provider", "ollama").lower()
     
     if provider_name == "ollama":
         ollama_config = llm_config.get("ollama", {})
         return OllamaProvider(
-            model=os.getenv("OLLAMA_MODEL", ollama_config.get("model", "llama3.2:1b")),
-            base_url=os.getenv("OLLAMA_BASE_URL", ollama_config.get("base_url", "http://localhost:11434"))
+            model=ollama_config.get("model", "llama3.2:1b"),
+            base_url=ollama_config.get("base_url", "http://localhost:11434"),
+            pool_size=ollama_config.get("pool_size", 10),
+            connect_timeout=ollama_config.get("connect_timeout", 5.0),
+            read_timeout=ollama_config.get("read_timeout", 60.0),
+            max_retries=ollama_config.get("max_retries", 2),
+            retry_backoff=ollama_config.get("retry_backoff", 0.5)
         )
     
     elif provider_name == "azure":
         azure_config = llm_config.get("azure", {})
-        endpoint = os.getenv("AZURE_OPENAI_ENDPOINT", azure_config.get("endpoint", ""))
-        api_key = os.getenv("AZURE_OPENAI_API_KEY", "")
-        deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT", azure_config.get("deployment", ""))
+        endpoint = azure_config.get("endpoint", "")
+        api_key = azure_config.get("api_key", "")
+        deployment = azure_config.get("deployment", "")
         
         if not all([endpoint, api_key, deployment]):
             raise ValueError(
@@ -78,7 +308,7 @@ def get_llm_provider(config_path: str = "config.yaml") -> LLMProvider:
     
     elif provider_name == "gemini":
         gemini_config = llm_config.get("gemini", {})
-        api_key = os.getenv("GEMINI_API_KEY", gemini_config.get("api_key", ""))
+        api_key = gemini_config.get("api_key", "")
         
         if not api_key:
             raise ValueError(
@@ -95,15 +325,43 @@ def get_llm_provider(config_path: str = "config.yaml") -> LLMProvider:
         raise ValueError(f"Unknown LLM provider: {provider_name}. Use 'ollama', 'azure', or 'gemini'.")
 
 
-def get_llm_config(config_path: str = "config.yaml") -> dict:
-    """Get LLM-specific configuration settings"""
+def get_llm_config(config_path: str = "config.yaml", task: Optional[str] = None) -> dict:
+    """
+    Get LLM-specific configuration settings
+    
+    Args:
+        config_path: Path to configuration file
+        task: LLM task name whose llm.profiles entry applies
+        
+    Returns:
+        Dictionary with provider, temperature, max_tokens and timeout
+        (seconds, None when the task has no profile timeout). The task's
+        TASK_DEFAULTS apply where its profile does not set a value.
+    """
     config = load_config(config_path)
-    llm_config = config.get("llm", {})
+    llm_config = _task_config(config.get("llm", {}), task)
     provider_name = llm_config.get("provider", "ollama")
-    provider_config = llm_config.get(provider_name, {})
+    profile = (llm_config.get("profiles") or {}).get(task) or {}
+    task_defaults = {key: value for key, value in TASK_DEFAULTS.get(task, {}).items() if key not in profile}
+    settings = {**llm_config.get(provider_name, {}), **task_defaults}
     
     return {
         "provider": provider_name,
-        "temperature": provider_config.get("temperature", 0.0),
-        "max_tokens": provider_config.get("max_tokens", 4096)
+        "temperature": settings.get("temperature", 0.0),
+        "max_tokens": settings.get("max_tokens", 4096),
+        "timeout": profile.get("timeout")
     }
+
+
+def get_task_timeouts(config_path: str = "config.yaml") -> Dict[str, float]:
+    """
+    Get the timeouts set in llm.profiles
+    
+    Args:
+        config_path: Path to configuration file
+        
+    Returns:
+        Dictionary of task name to timeout in seconds
+    """
+    profiles = load_config(config_path).get("llm", {}).get("profiles") or {}
+    return {task: profile["timeout"] for task, profile in profiles.items() if profile and profile.get("timeout") is not None}
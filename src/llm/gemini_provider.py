@@ -1,9 +1,11 @@
 """
 Google Gemini API Provider Implementation (using latest google-genai SDK)
 """
+from typing import AsyncIterator, Iterator
 from google import genai
 from google.genai import types
 from .provider import LLMProvider
+from .rate_limit import RateLimitError, parse_retry_after
 
 
 class GeminiProvider(LLMProvider):
@@ -23,38 +25,88 @@ class GeminiProvider(LLMProvider):
         # Initialize the new Google GenAI Client
         self.client = genai.Client(api_key=api_key)
     
-    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 0.0) -> str:
-        """Generate text using Gemini with 429 retry logic"""
-        import time
-        max_retries = 3
-        retry_delay = 20  # Seconds
+    def _is_rate_limited(self, error_str: str) -> bool:
+        """Check whether an API error is a 429 / quota exhaustion"""
+        return "429" in error_str or "RESOURCE_EXHAUSTED" in error_str
+    
+    def _request_failed(self, error: Exception) -> RuntimeError:
+        """
+        Map an SDK error to the exception raised to callers
         
-        for attempt in range(max_retries):
-            try:
-                # Use a dictionary for config to avoid SDK version discrepancies
-                config = {
-                    "max_output_tokens": max_tokens,
-                    "temperature": temperature
-                }
-                
-                # Generate response
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=prompt,
-                    config=config
-                )
-                
-                return response.text
-                
-            except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                    if attempt < max_retries - 1:
-                        print(f"[Gemini] Rate limit hit (429). Retrying in {retry_delay}s (Attempt {attempt + 1}/{max_retries})...")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2  # Exponential backoff
-                        continue
-                raise RuntimeError(f"Gemini API (google-genai) request failed: {error_str}")
+        Quota errors become RateLimitError carrying the server's retry delay,
+        so the shared rate limiter can pause every caller instead of each
+        request sleeping and retrying on its own.
+        """
+        error_str = str(error)
+        if self._is_rate_limited(error_str):
+            return RateLimitError(f"Gemini API rate limit exceeded: {error_str}", parse_retry_after(error_str))
+        return RuntimeError(f"Gemini API (google-genai) request failed: {error_str}")
+    
+    def generate(self, prompt: str, max_tokens: int = 4096, temperature: float = 0.0) -> str:
+        """Generate text using Gemini"""
+        try:
+            # Use a dictionary for config to avoid SDK version discrepancies
+            config = {
+                "max_output_tokens": max_tokens,
+                "temperature": temperature
+            }
+            
+            # Generate response
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=prompt,
+                config=config
+            )
+            
+            return response.text
+            
+        except Exception as e:
+            raise self._request_failed(e)
+    
+    async def agenerate(self, prompt: str, max_tokens: int = 4096, temperature: float = 0.0) -> str:
+        """Generate text using Gemini's native async client"""
+        try:
+            config = {
+                "max_output_tokens": max_tokens,
+                "temperature": temperature
+            }
+            
+            response = await self.client.aio.models.generate_content(
+                model=self.model_name,
+                contents=prompt,
+                config=config
+            )
+            
+            return response.text
+            
+        except Exception as e:
+            raise self._request_failed(e)
+    
+    def stream(self, prompt: str, max_tokens: int = 4096, temperature: float = 0.0) -> Iterator[str]:
+        """Stream text from Gemini as chunks are generated"""
+        try:
+            for chunk in self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=prompt,
+                config={"max_output_tokens": max_tokens, "temperature": temperature}
+            ):
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise self._request_failed(e)
+    
+    async def astream(self, prompt: str, max_tokens: int = 4096, temperature: float = 0.0) -> AsyncIterator[str]:
+        """Stream text from Gemini's native async client"""
+        try:
+            async for chunk in await self.client.aio.models.generate_content_stream(
+                model=self.model_name,
+                contents=prompt,
+                config={"max_output_tokens": max_tokens, "temperature": temperature}
+            ):
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise self._request_failed(e)
     
     def validate_health(self) -> bool:
         """Check if Gemini API is accessible"""
@@ -75,3 +127,7 @@ class GeminiProvider(LLMProvider):
             "model": self.model_name,
             "status": "operational"
         }
+    
+    def model_id(self) -> str:
+        """Identify the provider and model"""
+        return f"gemini:{self.model_name}"
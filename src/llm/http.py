@@ -0,0 +1,80 @@
+"""
+Shared HTTP Clients
+Pooled keep-alive connections shared by every HTTP-based provider
+"""
+import asyncio
+import random
+import threading
+import weakref
+from typing import Dict
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+
+_sessions: Dict[int, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+# httpx async clients are bound to the event loop that created them
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+
+
+def get_http_session(pool_size: int = 10) -> requests.Session:
+    """
+    Get the process-wide requests session for a pool size
+    
+    Args:
+        pool_size: Keep-alive connections kept per host
+        
+    Returns:
+        Shared requests.Session
+    """
+    session = _sessions.get(pool_size)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(pool_size)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sessions[pool_size] = session
+    return session
+
+
+def get_async_http_client(pool_size: int = 10) -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client for the running event loop
+    
+    Timeouts are passed per request, so one client serves every provider.
+    
+    Args:
+        pool_size: Maximum (and keep-alive) connections
+        
+    Returns:
+        httpx.AsyncClient reused on this loop
+    """
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(pool_size)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+        clients[pool_size] = client
+    return client
+
+
+def backoff_delay(attempt: int, base: float) -> float:
+    """
+    Full-jitter exponential backoff
+    
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay scale in seconds
+        
+    Returns:
+        Random delay between 0 and base * 2^attempt
+    """
+    return random.uniform(0, base * (2 ** attempt))
@@ -2,52 +2,173 @@
 Ollama LLM Provider Implementation
 Local LLM provider for on-premises deployment
 """
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Iterator
+import httpx
 import requests
-from typing import Optional
 from .provider import LLMProvider
+from .http import get_http_session, get_async_http_client, backoff_delay
 
 
 class OllamaProvider(LLMProvider):
     """Ollama local LLM provider"""
     
-    def __init__(self, model: str = "llama3.2:1b", base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        model: str = "llama3.2:1b",
+        base_url: str = "http://localhost:11434",
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5
+    ):
         """
         Initialize Ollama provider
         
         Args:
             model: Model name (e.g., llama3.2:1b)
             base_url: Ollama server URL
+            pool_size: Keep-alive connections to the server
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for the generation response
+            max_retries: Retries on connection errors and 5xx responses
+            retry_backoff: Backoff scale in seconds (full jitter, doubling per attempt)
         """
         self.model = model
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+    
+    def _build_payload(self, prompt: str, max_tokens: int, temperature: float, stream: bool = False) -> dict:
+        """Build the /api/generate request body"""
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature,
+            }
+        }
+    
+    def _retry_delay(self, attempt: int, reason: str) -> float:
+        """Backoff before the next attempt (logged like the Gemini retries)"""
+        delay = backoff_delay(attempt, self.retry_backoff)
+        print(f"[Ollama] {reason}. Retrying in {delay:.2f}s (Attempt {attempt + 1}/{self.max_retries + 1})...")
+        return delay
         
     def generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
-        """Generate text using Ollama"""
+        """Generate text using Ollama (pooled connection, retries transient failures)"""
+        payload = self._build_payload(prompt, max_tokens, temperature)
+        session = get_http_session(self.pool_size)
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = session.post(
+                    self.api_url,
+                    json=payload,
+                    timeout=(self.connect_timeout, self.read_timeout)
+                )
+                if response.status_code >= 500 and attempt < self.max_retries:
+                    time.sleep(self._retry_delay(attempt, f"Server error {response.status_code}"))
+                    continue
+                response.raise_for_status()
+                
+                result = response.json()
+                return result.get("response", "").strip()
+                
+            except requests.exceptions.ConnectionError as e:
+                # Includes connect timeouts and stale keep-alive connections
+                if attempt < self.max_retries:
+                    time.sleep(self._retry_delay(attempt, "Connection failed"))
+                    continue
+                raise RuntimeError(f"Ollama API request failed: {str(e)}")
+            except requests.exceptions.RequestException as e:
+                raise RuntimeError(f"Ollama API request failed: {str(e)}")
+    
+    async def agenerate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        """Generate text using Ollama without blocking the event loop"""
+        payload = self._build_payload(prompt, max_tokens, temperature)
+        client = get_async_http_client(self.pool_size)
+        timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.post(self.api_url, json=payload, timeout=timeout)
+                if response.status_code >= 500 and attempt < self.max_retries:
+                    await asyncio.sleep(self._retry_delay(attempt, f"Server error {response.status_code}"))
+                    continue
+                response.raise_for_status()
+                
+                result = response.json()
+                return result.get("response", "").strip()
+                
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError) as e:
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self._retry_delay(attempt, "Connection failed"))
+                    continue
+                raise RuntimeError(f"Ollama API request failed: {str(e)}")
+            except httpx.HTTPError as e:
+                raise RuntimeError(f"Ollama API request failed: {str(e)}")
+    
+    def stream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> Iterator[str]:
+        """Stream text from Ollama (one NDJSON chunk per token batch)"""
+        payload = self._build_payload(prompt, max_tokens, temperature, stream=True)
+        
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature,
-                }
-            }
-            
-            response = requests.post(self.api_url, json=payload, timeout=60)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result.get("response", "").strip()
-            
+            with get_http_session(self.pool_size).post(
+                self.api_url,
+                json=payload,
+                timeout=(self.connect_timeout, self.read_timeout),
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    chunk = self._parse_stream_line(line)
+                    if chunk:
+                        yield chunk
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"Ollama API request failed: {str(e)}")
     
+    async def astream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> AsyncIterator[str]:
+        """Stream text from Ollama without blocking the event loop"""
+        payload = self._build_payload(prompt, max_tokens, temperature, stream=True)
+        timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+        
+        try:
+            async with get_async_http_client(self.pool_size).stream(
+                "POST", self.api_url, json=payload, timeout=timeout
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    chunk = self._parse_stream_line(line)
+                    if chunk:
+                        yield chunk
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Ollama API request failed: {str(e)}")
+    
+    def _parse_stream_line(self, line) -> str:
+        """Extract the text from one streamed NDJSON line"""
+        if not line:
+            return ""
+        data = json.loads(line)
+        if data.get("error"):
+            raise RuntimeError(f"Ollama API request failed: {data['error']}")
+        return data.get("response", "")
+    
     def validate_health(self) -> bool:
         """Check if Ollama server is responsive"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = get_http_session(self.pool_size).get(
+                f"{self.base_url}/api/tags", timeout=(self.connect_timeout, 5)
+            )
             return response.status_code == 200
         except requests.exceptions.RequestException:
             return False
@@ -55,7 +176,9 @@ class OllamaProvider(LLMProvider):
     def get_model_info(self) -> dict:
         """Get Ollama model information"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = get_http_session(self.pool_size).get(
+                f"{self.base_url}/api/tags", timeout=(self.connect_timeout, 5)
+            )
             response.raise_for_status()
             
             models = response.json().get("models", [])
@@ -81,3 +204,7 @@ class OllamaProvider(LLMProvider):
                 "model": self.model,
                 "error": str(e)
             }
+    
+    def model_id(self) -> str:
+        """Identify the provider and model"""
+        return f"ollama:{self.model}"
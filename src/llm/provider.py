@@ -2,8 +2,9 @@
 LLM Provider Abstraction Layer
 Allows switching between Ollama and Azure OpenAI with minimal code changes
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 
 
 class LLMProvider(ABC):
@@ -24,6 +25,54 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def agenerate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        """
+        Generate text from prompt without blocking the event loop
+        
+        Providers with a native async client override this. The default
+        runs the blocking generate() in a worker thread.
+        
+        Args:
+            prompt: Input prompt text
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0 = deterministic)
+            
+        Returns:
+            Generated text
+        """
+        return await asyncio.to_thread(self.generate, prompt, max_tokens, temperature)
+    
+    def stream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> Iterator[str]:
+        """
+        Generate text from prompt, yielding chunks as they are produced
+        
+        Providers with a streaming API override this. The default yields
+        the complete generate() output as a single chunk.
+        
+        Args:
+            prompt: Input prompt text
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0 = deterministic)
+            
+        Yields:
+            Text chunks; joined they equal the full response
+        """
+        yield self.generate(prompt, max_tokens, temperature)
+    
+    async def astream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> AsyncIterator[str]:
+        """
+        Async version of stream()
+        
+        Args:
+            prompt: Input prompt text
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0 = deterministic)
+            
+        Yields:
+            Text chunks; joined they equal the full response
+        """
+        yield await self.agenerate(prompt, max_tokens, temperature)
+    
     @abstractmethod
     def validate_health(self) -> bool:
         """
@@ -43,3 +92,12 @@ class LLMProvider(ABC):
             Dictionary with model metadata
         """
         pass
+    
+    def model_id(self) -> str:
+        """
+        Identify the provider and model (used in cache keys)
+        
+        Returns:
+            String such as "ollama:llama3.2:1b"
+        """
+        return type(self).__name__
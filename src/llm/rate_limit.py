@@ -0,0 +1,511 @@
+"""
+LLM Rate Limiting
+Process-wide scheduler that keeps provider calls under per-minute quotas
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import re
+import threading
+import time
+from contextlib import aclosing, closing, contextmanager
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from .provider import LLMProvider
+
+
+# Request priorities: lower values are scheduled first
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("llm_request_priority", default=INTERACTIVE)
+
+_limiters: Dict[str, "RateLimiter"] = {}
+_limiters_lock = threading.Lock()
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """
+    Schedule LLM calls made inside this block at the given priority
+    
+    Applies to the current thread/task and anything it starts.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RateLimitError(RuntimeError):
+    """Provider rejected a request for exceeding its quota (HTTP 429)"""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(error_text: str) -> Optional[float]:
+    """
+    Find the server's requested delay in an error message
+    
+    Understands Google's RetryInfo ("retryDelay": "20s") and
+    "Retry-After: 20" headers echoed into the message.
+    
+    Returns:
+        Delay in seconds, or None if the error does not say
+    """
+    match = re.search(r"retry[_-]?delay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s", error_text, re.IGNORECASE)
+    if not match:
+        match = re.search(r"retry-after['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)", error_text, re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+class _TokenBucket:
+    """
+    Token bucket sized so no 60-second window admits more than the budget
+    
+    Holds up to `burst` of the per-minute budget and refills with the rest
+    over the minute, so burst + one minute of refill equals the budget.
+    """
+    
+    def __init__(self, per_minute: float, burst: float):
+        self.configure(per_minute, burst)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+    
+    def configure(self, per_minute: float, burst: float) -> None:
+        self.per_minute = per_minute
+        self.capacity = max(1.0, per_minute * burst)
+        self.rate = max(per_minute - self.capacity, 1.0) / 60.0
+    
+    def refill(self, now: float) -> None:
+        if now <= self.updated:
+            return  # Drained until a pause ends
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def drain(self, until: float) -> None:
+        """Empty the bucket and stop refilling until the given time"""
+        self.level = 0.0
+        self.updated = max(self.updated, until)
+    
+    def clamp(self, amount: float) -> float:
+        """Largest amount this bucket can ever grant at once"""
+        return min(amount, self.capacity)
+    
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (call refill first)"""
+        return max(0.0, (self.clamp(amount) - self.level) / self.rate)
+
+
+class _Waiter:
+    """A queued request; woken through a threading.Event or an asyncio future"""
+    
+    __slots__ = ("priority", "tokens", "enqueued", "event", "future", "loop", "granted", "cancelled")
+    
+    def __init__(self, priority: int, tokens: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+        self.granted = False
+        self.cancelled = False
+
+
+class RateLimiter:
+    """
+    Shared scheduler for one provider's request and token quotas
+    
+    Callers reserve one request plus an estimated token count. Requests
+    that cannot be admitted immediately queue by priority (interactive
+    ahead of batch, FIFO within a priority) and a dispatcher thread admits
+    them as the buckets refill. A 429 pauses all admissions for the
+    server's Retry-After and empties the buckets, so queued callers resume
+    at the steady rate instead of all retrying at once.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        burst: float = 0.1,
+        default_backoff: float = 10.0
+    ):
+        """
+        Initialize rate limiter
+        
+        Args:
+            requests_per_minute: Request budget (None = unlimited)
+            tokens_per_minute: Prompt + output token budget (None = unlimited)
+            burst: Fraction of each budget that may be used at once
+            default_backoff: Pause after a 429 that gives no Retry-After (seconds)
+        """
+        self._cond = threading.Condition()
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._paused_until = 0.0
+        self._requests: Optional[_TokenBucket] = None
+        self._tokens: Optional[_TokenBucket] = None
+        self._stats = {
+            "granted": 0,
+            "queued_total": 0,
+            "rate_limited": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0
+        }
+        self.configure(requests_per_minute, tokens_per_minute, burst, default_backoff)
+    
+    def configure(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        burst: float = 0.1,
+        default_backoff: float = 10.0
+    ) -> None:
+        """Apply new budgets (current bucket levels are kept)"""
+        with self._cond:
+            self._requests = self._update_bucket(self._requests, requests_per_minute, burst)
+            self._tokens = self._update_bucket(self._tokens, tokens_per_minute, burst)
+            self.default_backoff = default_backoff
+            self._cond.notify_all()
+    
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Block until a request of this size may be sent
+        
+        Args:
+            tokens: Estimated prompt + output tokens
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waiter = self._admit_or_enqueue(tokens, None)
+        if waiter is None:
+            return 0.0
+        waiter.event.wait()
+        return time.monotonic() - waiter.enqueued
+    
+    async def aacquire(self, tokens: int = 1) -> float:
+        """
+        Async version of acquire(); waiting does not block the event loop
+        
+        Args:
+            tokens: Estimated prompt + output tokens
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waiter = self._admit_or_enqueue(tokens, asyncio.get_running_loop())
+        if waiter is None:
+            return 0.0
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._cond:
+                waiter.cancelled = True
+                if waiter.granted:
+                    self._refund(1, waiter.tokens)
+                self._cond.notify_all()
+            raise
+        return time.monotonic() - waiter.enqueued
+    
+    def settle(self, reserved: int, used: int, refund_request: bool = False) -> None:
+        """
+        Return the unused part of a reservation
+        
+        Args:
+            reserved: Tokens passed to acquire()
+            used: Tokens actually consumed
+            refund_request: Also return the request slot (the call failed
+                without using the provider's quota)
+        """
+        if used < reserved or refund_request:
+            with self._cond:
+                self._refund(1 if refund_request else 0, max(0, reserved - used))
+                self._cond.notify_all()
+    
+    def backoff(self, retry_after: Optional[float] = None) -> None:
+        """
+        Record a 429: pause admissions and empty the buckets
+        
+        Args:
+            retry_after: Server-requested delay in seconds (default_backoff if None)
+        """
+        delay = retry_after if retry_after is not None else self.default_backoff
+        with self._cond:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + delay)
+            for bucket in (self._requests, self._tokens):
+                if bucket is not None:
+                    bucket.drain(self._paused_until)
+            self._stats["rate_limited"] += 1
+            self._cond.notify_all()
+        print(f"[RateLimiter] Quota exceeded, pausing requests for {delay:.1f}s")
+    
+    def stats(self) -> Dict:
+        """
+        Get queue depth and admission metrics
+        
+        Returns:
+            Dictionary of scheduler metrics
+        """
+        with self._cond:
+            now = time.monotonic()
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for _, _, waiter in self._queue:
+                if not waiter.cancelled:
+                    name = PRIORITY_NAMES.get(waiter.priority, str(waiter.priority))
+                    queued[name] = queued.get(name, 0) + 1
+            
+            stats = dict(self._stats)
+            stats["queued"] = queued
+            stats["paused_seconds"] = round(max(0.0, self._paused_until - now), 3)
+            for name, bucket in (("requests", self._requests), ("tokens", self._tokens)):
+                if bucket is not None:
+                    bucket.refill(now)
+                    stats[f"{name}_per_minute"] = bucket.per_minute
+                    stats[f"{name}_available"] = int(bucket.level)
+        
+        waits = stats["granted"]
+        stats["wait_seconds_mean"] = round(stats.pop("wait_seconds_total") / waits, 3) if waits else 0.0
+        stats["wait_seconds_max"] = round(stats["wait_seconds_max"], 3)
+        return stats
+    
+    def _admit_or_enqueue(self, tokens: int, loop: Optional[asyncio.AbstractEventLoop]) -> Optional[_Waiter]:
+        """Admit immediately if nothing is queued and there is capacity, else queue"""
+        waiter = _Waiter(_priority.get(), tokens, loop)
+        with self._cond:
+            if not self._queue and self._ready(waiter, time.monotonic()) == 0.0:
+                self._take(waiter)
+                return None
+            
+            heapq.heappush(self._queue, (waiter.priority, next(self._sequence), waiter))
+            self._stats["queued_total"] += 1
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name="llm-rate-limiter", daemon=True)
+                self._dispatcher.start()
+            self._cond.notify_all()
+        return waiter
+    
+    def _dispatch(self) -> None:
+        """Admit queued requests in priority order as capacity frees up"""
+        with self._cond:
+            while True:
+                while self._queue and self._queue[0][2].cancelled:
+                    heapq.heappop(self._queue)
+                if not self._queue:
+                    self._cond.wait()
+                    continue
+                
+                waiter = self._queue[0][2]
+                delay = self._ready(waiter, time.monotonic())
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                
+                heapq.heappop(self._queue)
+                self._take(waiter)
+                waiter.granted = True
+                if waiter.event is not None:
+                    waiter.event.set()
+                else:
+                    try:
+                        waiter.loop.call_soon_threadsafe(self._wake, waiter.future)
+                    except RuntimeError:
+                        self._refund(1, waiter.tokens)  # Event loop already closed
+    
+    @staticmethod
+    def _wake(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+    
+    def _ready(self, waiter: _Waiter, now: float) -> float:
+        """Seconds until this waiter can be admitted (caller holds the lock)"""
+        delay = self._paused_until - now
+        if self._requests is not None:
+            self._requests.refill(now)
+            delay = max(delay, self._requests.wait_time(1))
+        if self._tokens is not None:
+            self._tokens.refill(now)
+            delay = max(delay, self._tokens.wait_time(waiter.tokens))
+        return max(0.0, delay)
+    
+    def _take(self, waiter: _Waiter) -> None:
+        """Consume capacity for an admitted waiter (caller holds the lock)"""
+        if self._requests is not None:
+            self._requests.level -= 1
+        if self._tokens is not None:
+            self._tokens.level -= self._tokens.clamp(waiter.tokens)
+        
+        waited = time.monotonic() - waiter.enqueued
+        self._stats["granted"] += 1
+        self._stats["wait_seconds_total"] += waited
+        self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+    
+    def _refund(self, requests: int, tokens: int) -> None:
+        """Give back unused capacity (caller holds the lock)"""
+        if self._requests is not None and requests:
+            self._requests.level = min(self._requests.capacity, self._requests.level + requests)
+        if self._tokens is not None and tokens:
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + tokens)
+    
+    @staticmethod
+    def _update_bucket(bucket: Optional[_TokenBucket], per_minute: Optional[float], burst: float) -> Optional[_TokenBucket]:
+        if not per_minute:
+            return None
+        if bucket is None:
+            return _TokenBucket(per_minute, burst)
+        bucket.configure(per_minute, burst)
+        bucket.level = min(bucket.level, bucket.capacity)
+        return bucket
+
+
+class RateLimitedLLMProvider(LLMProvider):
+    """Wraps a provider so every call is admitted by a shared RateLimiter"""
+    
+    def __init__(self, provider: LLMProvider, limiter: RateLimiter, max_retries: int = 3):
+        """
+        Initialize rate-limited provider
+        
+        Args:
+            provider: Provider that performs real generations
+            limiter: Scheduler shared by every caller of this quota
+            max_retries: Times a request rejected with 429 is re-queued
+        """
+        self.provider = provider
+        self.limiter = limiter
+        self.max_retries = max_retries
+    
+    def generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        """Generate text once the limiter admits the request"""
+        reserved = estimate_tokens(prompt) + max_tokens
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(reserved)
+            try:
+                response = self.provider.generate(prompt, max_tokens, temperature)
+            except RateLimitError as e:
+                self.limiter.settle(reserved, 0)
+                self._rejected(e, attempt)
+                continue
+            except BaseException:
+                # Errors, timeouts and cancellations give back the whole reservation
+                self.limiter.settle(reserved, 0, refund_request=True)
+                raise
+            self.limiter.settle(reserved, estimate_tokens(prompt) + estimate_tokens(response))
+            return response
+    
+    async def agenerate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        """Generate text asynchronously once the limiter admits the request"""
+        reserved = estimate_tokens(prompt) + max_tokens
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.aacquire(reserved)
+            try:
+                response = await self.provider.agenerate(prompt, max_tokens, temperature)
+            except RateLimitError as e:
+                self.limiter.settle(reserved, 0)
+                self._rejected(e, attempt)
+                continue
+            except BaseException:
+                # Errors, timeouts and cancellations give back the whole reservation
+                self.limiter.settle(reserved, 0, refund_request=True)
+                raise
+            self.limiter.settle(reserved, estimate_tokens(prompt) + estimate_tokens(response))
+            return response
+    
+    def stream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> Iterator[str]:
+        """Stream text once admitted; a 429 is only retried before any output"""
+        reserved = estimate_tokens(prompt) + max_tokens
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(reserved)
+            chunks = []
+            try:
+                with closing(self.provider.stream(prompt, max_tokens, temperature)) as stream:
+                    for chunk in stream:
+                        chunks.append(chunk)
+                        yield chunk
+                return
+            except RateLimitError as e:
+                self._rejected(e, attempt if not chunks else self.max_retries)
+            finally:
+                self.limiter.settle(reserved, estimate_tokens(prompt) + estimate_tokens("".join(chunks)))
+    
+    async def astream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> AsyncIterator[str]:
+        """Async version of stream()"""
+        reserved = estimate_tokens(prompt) + max_tokens
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.aacquire(reserved)
+            chunks = []
+            try:
+                async with aclosing(self.provider.astream(prompt, max_tokens, temperature)) as stream:
+                    async for chunk in stream:
+                        chunks.append(chunk)
+                        yield chunk
+                return
+            except RateLimitError as e:
+                self._rejected(e, attempt if not chunks else self.max_retries)
+            finally:
+                self.limiter.settle(reserved, estimate_tokens(prompt) + estimate_tokens("".join(chunks)))
+    
+    def _rejected(self, error: RateLimitError, attempt: int) -> None:
+        """Pause the shared limiter, then re-raise once retries are used up"""
+        self.limiter.backoff(error.retry_after)
+        if attempt >= self.max_retries:
+            raise error
+    
+    def validate_health(self) -> bool:
+        return self.provider.validate_health()
+    
+    def get_model_info(self) -> dict:
+        return self.provider.get_model_info()
+    
+    def model_id(self) -> str:
+        return self.provider.model_id()
+
+
+def get_rate_limiter(name: str, **options) -> RateLimiter:
+    """
+    Get the shared limiter for a quota, creating it on first use
+    
+    Every provider instance for the same model shares one limiter, so the
+    budget holds across agents. Changed options are applied to the
+    existing limiter, so config.yaml edits take effect on reload.
+    
+    Args:
+        name: Quota identifier (the provider's model_id)
+        **options: RateLimiter options (requests_per_minute, ...)
+    
+    Returns:
+        RateLimiter instance
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(**options)
+            _limiters[name] = limiter
+        else:
+            limiter.configure(**options)
+        return limiter
+
+
+def rate_limiter_stats() -> Dict[str, Dict]:
+    """
+    Get metrics for every shared limiter
+    
+    Returns:
+        Dictionary of quota name -> limiter metrics
+    """
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.stats() for name, limiter in limiters.items()}
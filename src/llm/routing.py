@@ -0,0 +1,473 @@
+"""
+LLM Provider Routing
+Hedged requests, failover and circuit breaking across several providers
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from .provider import LLMProvider
+
+
+class _Backend:
+    """One routed provider with its latency history and circuit breaker"""
+    
+    def __init__(self, provider: LLMProvider, failure_threshold: int, recovery_seconds: float):
+        self.provider = provider
+        self.name = provider.model_id()
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        
+        self.latencies: deque = deque(maxlen=200)  # Full generations
+        self.first_chunk_latencies: deque = deque(maxlen=200)  # Streams
+        self.lock = threading.Lock()
+        self.consecutive_failures = 0
+        self.open_until: Optional[float] = None
+        self.probing = False
+        self.counts = {"requests": 0, "successes": 0, "failures": 0, "hedges_won": 0}
+    
+    def available(self) -> bool:
+        """
+        Check the circuit breaker without reserving anything
+        
+        Closed: always available. Open: unavailable until recovery_seconds
+        pass, then available for one probe request (half-open).
+        """
+        with self.lock:
+            return self._allows_request()
+    
+    def claim(self) -> bool:
+        """
+        Reserve a request slot just before the provider is called
+        
+        Takes the single half-open probe slot when the circuit is open,
+        so only backends that are actually tried ever hold it.
+        
+        Returns:
+            True if the request may be sent
+        """
+        with self.lock:
+            if not self._allows_request():
+                return False
+            if self.open_until is not None:
+                self.probing = True
+            return True
+    
+    def _allows_request(self) -> bool:
+        if self.open_until is None:
+            return True
+        return time.monotonic() >= self.open_until and not self.probing
+    
+    def record_success(self, latency: float, first_chunk: bool = False) -> None:
+        with self.lock:
+            (self.first_chunk_latencies if first_chunk else self.latencies).append(latency)
+            self.counts["successes"] += 1
+            self.consecutive_failures = 0
+            self.open_until = None
+            self.probing = False
+    
+    def record_failure(self, error: Exception) -> None:
+        with self.lock:
+            self.counts["failures"] += 1
+            self.consecutive_failures += 1
+            if self.probing or self.consecutive_failures >= self.failure_threshold:
+                if self.open_until is None or not self.probing:
+                    print(f"⚠️  [Router] {self.name} circuit open for {self.recovery_seconds}s: {error}")
+                self.open_until = time.monotonic() + self.recovery_seconds
+            self.probing = False
+    
+    def record_cancelled(self) -> None:
+        """A request lost a hedge race; a half-open probe may be retried"""
+        with self.lock:
+            self.probing = False
+    
+    def percentile(self, quantile: float, min_samples: int, first_chunk: bool = False) -> Optional[float]:
+        """Latency at the given quantile, or None without enough history"""
+        with self.lock:
+            samples = sorted(self.first_chunk_latencies if first_chunk else self.latencies)
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(quantile * len(samples)))]
+    
+    def stats(self, quantile: float) -> Dict:
+        with self.lock:
+            state = "closed" if self.open_until is None else ("half_open" if self.probing else "open")
+            stats = dict(self.counts)
+            stats["circuit"] = state
+            stats["consecutive_failures"] = self.consecutive_failures
+        for key, first_chunk in (("latency", False), ("first_chunk_latency", True)):
+            value = self.percentile(quantile, 1, first_chunk)
+            stats[f"{key}_p{int(quantile * 100)}"] = round(value, 3) if value is not None else None
+        return stats
+
+
+class RoutingLLMProvider(LLMProvider):
+    """
+    Routes each request across providers in preference order
+    
+    - Hedging: if the primary has not answered within its recent p95
+      latency (time to first chunk for streams), the same request is sent
+      to the next provider; the first answer wins and the other is cancelled
+    - Failover: an error moves the request straight on to the next provider
+    - Circuit breaking: a provider that fails failure_threshold times in a
+      row is skipped for recovery_seconds, then probed with one request
+    
+    Synchronous generate() hedges on a thread pool; the losing call cannot be
+    interrupted and finishes in the background. Synchronous stream() only
+    fails over.
+    """
+    
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        hedge_quantile: float = 0.95,
+        min_samples: int = 20,
+        default_hedge_delay: Optional[float] = 10.0,
+        failure_threshold: int = 5,
+        recovery_seconds: float = 30.0
+    ):
+        """
+        Initialize routing provider
+        
+        Args:
+            providers: Providers in preference order (first is the primary)
+            hedge_quantile: Latency quantile after which a hedge is sent
+            min_samples: Latencies needed before the quantile is trusted
+            default_hedge_delay: Hedge delay until then (None = no hedging yet)
+            failure_threshold: Consecutive failures that open a circuit
+            recovery_seconds: How long an open circuit skips its provider
+        """
+        if not providers:
+            raise ValueError("RoutingLLMProvider needs at least one provider")
+        
+        self.backends = [_Backend(p, failure_threshold, recovery_seconds) for p in providers]
+        for index, backend in enumerate(self.backends):
+            # Two deployments of the same model still get separate stats
+            if any(other.name == backend.name for other in self.backends[:index]):
+                backend.name = f"{backend.name}#{index}"
+        self.hedge_quantile = hedge_quantile
+        self.min_samples = min_samples
+        self.default_hedge_delay = default_hedge_delay
+        self._executor = ThreadPoolExecutor(max_workers=4 * len(providers), thread_name_prefix="llm-hedge")
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "hedged": 0, "failovers": 0, "unavailable": 0}
+    
+    def generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        """Generate text, hedging and failing over across providers"""
+        candidates = self._candidates()
+        futures = {}
+        errors = []
+        next_index = 0
+        hedged = False
+        latest = None  # (backend, launch time) of the most recent request
+    
+        def launch() -> bool:
+            nonlocal next_index, latest
+            next_index = self._claim_next(candidates, next_index)
+            if next_index >= len(candidates):
+                return False
+            backend = candidates[next_index]
+            next_index += 1
+            latest = (backend, time.monotonic())
+            futures[self._executor.submit(self._timed_call, backend, backend.provider.generate, prompt, max_tokens, temperature)] = backend
+            return True
+        
+        self._launch_first(launch)
+        while futures:
+            timeout = None if hedged or next_index >= len(candidates) else self._hedge_delay(*latest)
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                if launch():
+                    self._count("hedged")
+                continue
+            
+            for future in done:
+                backend = futures.pop(future)
+                if future.exception() is None:
+                    self._won(backend, hedged)
+                    return future.result()
+                errors.append(f"{backend.name}: {future.exception()}")
+            
+            if launch():
+                self._count("failovers")
+        
+        raise RuntimeError(f"All LLM providers failed: {'; '.join(errors)}")
+    
+    async def agenerate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        """Generate text asynchronously, hedging and failing over across providers"""
+        candidates = self._candidates()
+        tasks: Dict[asyncio.Task, _Backend] = {}
+        errors = []
+        next_index = 0
+        hedged = False
+        latest = None  # (backend, launch time) of the most recent request
+    
+        def launch() -> bool:
+            nonlocal next_index, latest
+            next_index = self._claim_next(candidates, next_index)
+            if next_index >= len(candidates):
+                return False
+            backend = candidates[next_index]
+            next_index += 1
+            latest = (backend, time.monotonic())
+            call = self._atimed_call(backend, backend.provider.agenerate(prompt, max_tokens, temperature))
+            tasks[asyncio.ensure_future(call)] = backend
+            return True
+        
+        self._launch_first(launch)
+        try:
+            while tasks:
+                timeout = None if hedged or next_index >= len(candidates) else self._hedge_delay(*latest)
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    if launch():
+                        self._count("hedged")
+                    continue
+                
+                for task in done:
+                    backend = tasks.pop(task)
+                    if task.exception() is None:
+                        self._won(backend, hedged)
+                        return task.result()
+                    errors.append(f"{backend.name}: {task.exception()}")
+                
+                if launch():
+                    self._count("failovers")
+        finally:
+            # Cancel the slower hedge (or everything, if the caller was cancelled)
+            for task, backend in tasks.items():
+                task.cancel()
+                backend.record_cancelled()
+        
+        raise RuntimeError(f"All LLM providers failed: {'; '.join(errors)}")
+    
+    def stream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> Iterator[str]:
+        """Stream from the first healthy provider, failing over before any output"""
+        errors = []
+        tried = 0
+        for backend in self._candidates():
+            if not backend.claim():
+                continue
+            if tried:
+                self._count("failovers")
+            tried += 1
+            started = time.monotonic()
+            produced = False
+            try:
+                with closing(backend.provider.stream(prompt, max_tokens, temperature)) as stream:
+                    for chunk in stream:
+                        if not produced:
+                            produced = True
+                            backend.record_success(time.monotonic() - started, first_chunk=True)
+                        yield chunk
+                if not produced:
+                    backend.record_success(time.monotonic() - started, first_chunk=True)
+                return
+            except Exception as e:
+                backend.record_failure(e)
+                if produced:
+                    raise
+                errors.append(f"{backend.name}: {e}")
+        
+        if not tried:
+            self._count("unavailable")
+            raise RuntimeError("All LLM providers are unavailable (circuit open)")
+        raise RuntimeError(f"All LLM providers failed: {'; '.join(errors)}")
+    
+    async def astream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> AsyncIterator[str]:
+        """
+        Stream text, hedging on time to first chunk
+        
+        Providers race to produce the first chunk; the rest of the response
+        comes from the winner and the other streams are closed.
+        """
+        candidates = self._candidates()
+        tasks: Dict[asyncio.Task, tuple] = {}
+        errors = []
+        next_index = 0
+        hedged = False
+        latest = None  # (backend, launch time) of the most recent request
+    
+        def launch() -> bool:
+            nonlocal next_index, latest
+            next_index = self._claim_next(candidates, next_index)
+            if next_index >= len(candidates):
+                return False
+            backend = candidates[next_index]
+            next_index += 1
+            latest = (backend, time.monotonic())
+            stream = backend.provider.astream(prompt, max_tokens, temperature)
+            tasks[asyncio.ensure_future(self._first_chunk(backend, stream))] = (backend, stream)
+            return True
+        
+        winner = None
+        self._launch_first(launch)
+        try:
+            while tasks and winner is None:
+                timeout = None if hedged or next_index >= len(candidates) else self._hedge_delay(*latest, first_chunk=True)
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    if launch():
+                        self._count("hedged")
+                    continue
+                
+                for task in done:
+                    backend, stream = tasks.pop(task)
+                    if winner is None and task.exception() is None:
+                        winner = (backend, stream, task.result())
+                    elif task.exception() is not None:
+                        errors.append(f"{backend.name}: {task.exception()}")
+                
+                if winner is None and not tasks and launch():
+                    self._count("failovers")
+        finally:
+            for task, (backend, stream) in tasks.items():
+                task.cancel()
+                backend.record_cancelled()
+                asyncio.ensure_future(self._aclose_quietly(task, stream))
+        
+        if winner is None:
+            raise RuntimeError(f"All LLM providers failed: {'; '.join(errors)}")
+        
+        backend, stream, first = winner
+        self._won(backend, hedged)
+        try:
+            if first is not None:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+        except Exception as e:
+            backend.record_failure(e)
+            raise
+        finally:
+            await stream.aclose()
+    
+    def validate_health(self) -> bool:
+        return any(backend.provider.validate_health() for backend in self.backends)
+    
+    def get_model_info(self) -> dict:
+        return {
+            "provider": "routing",
+            "backends": [backend.provider.get_model_info() for backend in self.backends]
+        }
+    
+    def model_id(self) -> str:
+        return "routing:" + "|".join(backend.name for backend in self.backends)
+    
+    def stats(self) -> Dict:
+        """
+        Get routing counters and per-provider health
+        
+        Returns:
+            Dictionary of routing metrics
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["backends"] = {backend.name: backend.stats(self.hedge_quantile) for backend in self.backends}
+        return stats
+    
+    def _candidates(self) -> List[_Backend]:
+        """Providers whose circuit may allow a request, in preference order (nothing claimed)"""
+        self._count("requests")
+        candidates = [backend for backend in self.backends if backend.available()]
+        if not candidates:
+            self._count("unavailable")
+            raise RuntimeError("All LLM providers are unavailable (circuit open)")
+        return candidates
+    
+    @staticmethod
+    def _claim_next(candidates: List[_Backend], start: int) -> int:
+        """Index of the first candidate from start that claims a request slot (len if none)"""
+        for index in range(start, len(candidates)):
+            if candidates[index].claim():
+                return index
+        return len(candidates)
+    
+    def _launch_first(self, launch: Callable[[], bool]) -> None:
+        """Send the request to the first claimable candidate"""
+        if not launch():
+            self._count("unavailable")
+            raise RuntimeError("All LLM providers are unavailable (circuit open)")
+    
+    def _hedge_delay(self, backend: _Backend, launched: float, first_chunk: bool = False) -> Optional[float]:
+        """Seconds left before hedging the request in flight on backend, or None to wait without hedging"""
+        delay = backend.percentile(self.hedge_quantile, self.min_samples, first_chunk)
+        if delay is None:
+            delay = self.default_hedge_delay
+        if delay is None:
+            return None
+        return max(0.0, launched + delay - time.monotonic())
+    
+    def _won(self, backend: _Backend, hedged: bool) -> None:
+        if hedged:
+            with backend.lock:
+                backend.counts["hedges_won"] += 1
+    
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+    
+    @staticmethod
+    def _timed_call(backend: _Backend, call: Callable[..., str], *args) -> str:
+        with backend.lock:
+            backend.counts["requests"] += 1
+        started = time.monotonic()
+        try:
+            response = call(*args)
+        except Exception as e:
+            backend.record_failure(e)
+            raise
+        backend.record_success(time.monotonic() - started)
+        return response
+    
+    @staticmethod
+    async def _atimed_call(backend: _Backend, call) -> str:
+        with backend.lock:
+            backend.counts["requests"] += 1
+        started = time.monotonic()
+        try:
+            response = await call
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            backend.record_failure(e)
+            raise
+        backend.record_success(time.monotonic() - started)
+        return response
+    
+    @staticmethod
+    async def _first_chunk(backend: _Backend, stream: AsyncIterator[str]) -> Optional[str]:
+        """Wait for a stream's first chunk (None if it ends without output)"""
+        with backend.lock:
+            backend.counts["requests"] += 1
+        started = time.monotonic()
+        try:
+            chunk = await stream.__anext__()
+        except StopAsyncIteration:
+            chunk = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            backend.record_failure(e)
+            raise
+        backend.record_success(time.monotonic() - started, first_chunk=True)
+        return chunk
+    
+    @staticmethod
+    async def _aclose_quietly(task: asyncio.Task, stream) -> None:
+        """Close a losing stream once its pending read has been cancelled"""
+        try:
+            await task
+        except BaseException:
+            pass
+        try:
+            await stream.aclose()
+        except Exception:
+            pass
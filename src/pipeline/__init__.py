@@ -0,0 +1,6 @@
+"""Pipeline module"""
+from .evaluation import EvaluationPipeline
+from .batch import BatchEvaluator
+from .singleflight import SingleFlight
+
+__all__ = ["EvaluationPipeline", "BatchEvaluator", "SingleFlight"]
@@ -0,0 +1,186 @@
+"""
+Batch Evaluator
+Evaluates whole contract portfolios through a bounded worker pool
+"""
+import asyncio
+import threading
+from contextlib import closing
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+from src.llm import BATCH, request_priority
+from .evaluation import EvaluationPipeline
+
+
+class BatchEvaluator:
+    """
+    Runs many evaluations concurrently with a fixed number of workers
+    
+    Contracts' source data is preloaded in parallel with
+    DocumentLoader.load_bundles() and each contract is queued for
+    evaluation once its bundle is ready. Results are yielded as each
+    contract finishes and written to storage in one bulk commit once the
+    batch ends.
+    """
+    
+    def __init__(
+        self,
+        pipeline: EvaluationPipeline,
+        concurrency: int = 4,
+        loader_threads: int = 8,
+        loader_processes: Optional[int] = None
+    ):
+        """
+        Initialize batch evaluator
+        
+        Args:
+            pipeline: Evaluation pipeline used for each contract
+            concurrency: Maximum number of evaluations in flight
+            loader_threads: Threads reading contracts' source files
+            loader_processes: Processes parsing performance CSVs (None: one
+                per CPU; 0: parse on the loader threads)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        
+        self.pipeline = pipeline
+        self.concurrency = concurrency
+        self.loader_threads = loader_threads
+        self.loader_processes = loader_processes
+    
+    async def run(self, contracts: List[Dict], refresh: bool = False) -> AsyncIterator[Dict]:
+        """
+        Evaluate contracts, yielding each result as soon as it completes
+        
+        Completed results are saved in bulk when the batch finishes, or
+        when the consumer stops iterating early.
+        
+        Args:
+            contracts: Contract data dictionaries
+            refresh: Skip LLM response cache lookups
+            
+        Yields:
+            Evaluation result dictionaries in completion order
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        finished: asyncio.Queue = asyncio.Queue()
+        worker_count = min(self.concurrency, len(contracts))
+        
+        # Queue at most one contract per worker ahead of the evaluations
+        slots = threading.Semaphore(worker_count)
+        stop = threading.Event()
+        preload = asyncio.create_task(asyncio.to_thread(
+            self._preload, contracts, pending, asyncio.get_running_loop(), slots, stop, worker_count
+        ))
+        workers = [
+            asyncio.create_task(self._worker(pending, finished, slots, refresh))
+            for _ in range(worker_count)
+        ]
+        
+        completed = []
+        saved = False
+        try:
+            for _ in range(len(contracts)):
+                result = await finished.get()
+                completed.append(result)
+                yield result
+            
+            if completed:
+                await asyncio.to_thread(self.pipeline.result_store.save_results, completed)
+            saved = True
+        finally:
+            stop.set()
+            slots.release()  # Wake the preloader if it is waiting for a slot
+            for worker in workers:
+                worker.cancel()
+            
+            # Consumer went away mid-batch: keep what already finished
+            # (the bulk write still runs off the event loop)
+            if not saved and completed:
+                await asyncio.to_thread(self.pipeline.result_store.save_results, completed)
+    
+    def _preload(
+        self,
+        contracts: List[Dict],
+        pending: asyncio.Queue,
+        loop: asyncio.AbstractEventLoop,
+        slots: threading.Semaphore,
+        stop: threading.Event,
+        workers: int
+    ) -> None:
+        """
+        Queue (contract, bundle) pairs as their source data finishes loading
+        
+        Runs on a worker thread. Contracts whose data could not be preloaded
+        (no reasoning agent, no contract_id or a loader error) are queued
+        without a bundle and load their data during evaluation. A None per
+        worker marks the end of the queue.
+        """
+        def enqueue(contract: Dict, bundle) -> bool:
+            slots.acquire()
+            if stop.is_set():
+                return False
+            loop.call_soon_threadsafe(pending.put_nowait, (contract, bundle))
+            return True
+        
+        waiting: Dict[Optional[str], List[Dict]] = {}
+        for contract in contracts:
+            waiting.setdefault(contract.get("contract_id"), []).append(contract)
+        
+        reasoning = self.pipeline.agents.get("reasoning")
+        if reasoning is not None:
+            try:
+                bundles = reasoning.loader.load_bundles(
+                    [contract_id for contract_id in waiting if contract_id],
+                    max_workers=self.loader_threads,
+                    processes=self.loader_processes
+                )
+                with closing(bundles):
+                    for bundle in bundles:
+                        for contract in waiting.pop(bundle.contract_id, []):
+                            if not enqueue(contract, bundle):
+                                return
+            except Exception as e:
+                print(f"⚠️ Preloading contract data failed, loading per contract instead: {e}")
+        
+        for remaining in waiting.values():
+            for contract in remaining:
+                if not enqueue(contract, None):
+                    return
+        for _ in range(workers):
+            loop.call_soon_threadsafe(pending.put_nowait, None)
+    
+    async def _worker(
+        self,
+        pending: asyncio.Queue,
+        finished: asyncio.Queue,
+        slots: threading.Semaphore,
+        refresh: bool
+    ) -> None:
+        """
+        Evaluate contracts from the pending queue until the preloader is done
+        
+        LLM calls are scheduled at batch priority, behind interactive requests.
+        """
+        while True:
+            item = await pending.get()
+            if item is None:
+                return
+            contract, bundle = item
+            slots.release()
+            
+            try:
+                with request_priority(BATCH):
+                    result = await self.pipeline.aevaluate(
+                        contract, save=False, refresh=refresh, bundle=bundle
+                    )
+            except Exception as e:
+                result = {
+                    "contract_id": contract.get("contract_id", "unknown"),
+                    "vendor_name": contract.get("vendor_name", "unknown"),
+                    "timestamp": datetime.utcnow().isoformat() + "Z",
+                    "status": "error",
+                    "error": str(e)
+                }
+            
+            await finished.put(result)
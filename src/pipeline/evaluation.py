@@ -0,0 +1,357 @@
+"""
+Evaluation Pipeline
+Wires agents, orchestrator and result storage for single-contract evaluation
+"""
+import asyncio
+import copy
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.agents import (
+    OrchestratorAgent,
+    DataIntakeAgent,
+    PerformanceAnalysisAgent,
+    RiskAssessmentAgent,
+    ReasoningAgent,
+    narrative_mode
+)
+from src.agents.narrative import current_narrative_mode
+from src.audit import get_audit_writer
+from src.ingestion.document_loader import ContractBundle, DocumentLoader
+from src.llm import cache_bypass, get_task_timeouts, load_config
+from src.storage import ResultStore, get_result_store
+from .fingerprint import InputFingerprinter
+from .singleflight import SingleFlight
+
+
+# Fields returned to API/CLI consumers for each evaluated contract
+SUMMARY_FIELDS = [
+    "contract_id",
+    "vendor_name",
+    "status",
+    "performance_score",
+    "risk_level",
+    "recommendation",
+    "timestamp",
+    "reasoning_chain",
+    "justification",
+    "confidence_level",
+    "input_fingerprint",
+    "error"
+]
+
+
+class _StepFanout:
+    """Relays streamed reasoning steps to every caller sharing one evaluation"""
+    
+    def __init__(self):
+        self.steps: List[Tuple[int, str]] = []
+        self.listeners: List[Callable[[int, str], None]] = []
+    
+    def subscribe(self, listener: Callable[[int, str], None]) -> None:
+        """Add a listener, replaying the steps it missed"""
+        for index, step in self.steps:
+            listener(index, step)
+        self.listeners.append(listener)
+    
+    def unsubscribe(self, listener: Callable[[int, str], None]) -> None:
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+    
+    def publish(self, index: int, step: str) -> None:
+        self.steps.append((index, step))
+        for listener in list(self.listeners):
+            listener(index, step)
+
+
+class EvaluationPipeline:
+    """
+    Shared evaluation entry point for the REST API and the batch CLI
+    """
+    
+    def __init__(
+        self,
+        orchestrator: OrchestratorAgent,
+        agents: Dict[str, Any],
+        result_store: ResultStore,
+        sample_folder: str = "data/samples"
+    ):
+        """
+        Initialize pipeline
+        
+        Args:
+            orchestrator: Orchestrator agent
+            agents: Dictionary of initialized agents
+            result_store: Result storage backend
+            sample_folder: Default folder to look up contract JSON files
+        """
+        self.orchestrator = orchestrator
+        self.agents = agents
+        
+        reasoning = agents.get("reasoning")
+        self.fingerprinter = InputFingerprinter(reasoning.loader if reasoning else DocumentLoader())
+        self.config_path = next(
+            (agent.config_path for agent in agents.values() if hasattr(agent, "config_path")), "config.yaml"
+        )
+        self.result_store = result_store
+        self.sample_folder = sample_folder
+        
+        # Concurrent evaluations of the same inputs share one run
+        self.flights = SingleFlight()
+        self._step_fanouts: Dict[Tuple, _StepFanout] = {}
+    
+    @classmethod
+    def from_config(cls, config_path: str = "config.yaml") -> "EvaluationPipeline":
+        """
+        Build a pipeline with all agents from configuration
+        
+        Args:
+            config_path: Path to configuration file
+            
+        Returns:
+            Configured pipeline
+        """
+        config = load_config(config_path)
+        agents_config = config.get("agents", {})
+        data_config = config.get("data", {})
+        audit_config = config.get("audit", {})
+        audit_log_path = data_config.get("audit_log_file", "data/audit_logs.jsonl")
+        rotate_max_mb = audit_config.get("rotate_max_mb")
+        
+        orchestrator = OrchestratorAgent(
+            audit_log_path=audit_log_path,
+            audit_writer=get_audit_writer(
+                audit_log_path,
+                fsync=audit_config.get("fsync", "batch"),
+                fsync_interval=audit_config.get("fsync_interval", 1.0),
+                max_bytes=int(rotate_max_mb * 1024 * 1024) if rotate_max_mb else None,
+                rotate_daily=audit_config.get("rotate_daily", False),
+                compress=audit_config.get("compress", False)
+            ),
+            max_retries=agents_config.get("max_retries", 3),
+            # Profile timeouts win over the older agents.step_timeouts
+            step_timeouts={**(agents_config.get("step_timeouts") or {}), **get_task_timeouts(config_path)},
+            default_step_timeout=agents_config.get("timeout_seconds")
+        )
+        agents = {
+            "data_intake": DataIntakeAgent(),
+            "performance": PerformanceAnalysisAgent(config_path),
+            "risk": RiskAssessmentAgent(config_path),
+            "reasoning": ReasoningAgent(config_path)
+        }
+        
+        return cls(
+            orchestrator,
+            agents,
+            get_result_store(config_path),
+            sample_folder=data_config.get("sample_folder", "data/samples")
+        )
+    
+    async def aevaluate(
+        self,
+        contract: Dict,
+        save: bool = True,
+        refresh: bool = False,
+        on_reasoning_step: Optional[Callable[[int, str], None]] = None,
+        narrative: Optional[str] = None,
+        bundle: Optional[ContractBundle] = None
+    ) -> Dict:
+        """
+        Evaluate one contract
+        
+        Concurrent calls for the same contract and input fingerprint are
+        coalesced: the first call runs the evaluation (and saves it, if it
+        asked to) and later callers wait for and receive the same result,
+        including any reasoning steps already streamed. A caller asking to
+        save that joins a run started without saving (e.g. a batch) saves
+        the result itself. The run keeps the rate-limit priority of the
+        caller that started it.
+        
+        Args:
+            contract: Contract data dictionary
+            save: Persist the result immediately (batch runs save in bulk instead)
+            refresh: Skip LLM response cache lookups
+            on_reasoning_step: Called with (index, step) as reasoning steps stream in
+            narrative: Narrative mode for this evaluation ("deterministic", "llm"
+                or "auto"; default: narrative.mode in config.yaml)
+            bundle: Source data already loaded for the contract (batch runs
+                preload these with DocumentLoader.load_bundles())
+            
+        Returns:
+            Evaluation result dictionary
+        """
+        # Fingerprint before evaluating so edits made mid-run trigger another pass
+        fingerprint = await asyncio.to_thread(self.fingerprint, contract, narrative)
+        
+        key = (contract.get("contract_id"), fingerprint, refresh, narrative)
+        fanout = self._step_fanouts.setdefault(key, _StepFanout())
+        if on_reasoning_step:
+            fanout.subscribe(on_reasoning_step)
+        
+        try:
+            (result, saved), shared = await self.flights.do(
+                key, lambda: self._run_evaluation(key, contract, fingerprint, save, refresh, narrative, bundle)
+            )
+        finally:
+            if on_reasoning_step:
+                fanout.unsubscribe(on_reasoning_step)
+        
+        # Joiners get their own copy so callers cannot modify each other's result
+        if shared:
+            result = copy.deepcopy(result)
+            if save and not saved:
+                await asyncio.to_thread(self.result_store.save_result, result)
+        return result
+    
+    async def _run_evaluation(
+        self,
+        key: Tuple,
+        contract: Dict,
+        fingerprint: str,
+        save: bool,
+        refresh: bool,
+        narrative: Optional[str],
+        bundle: Optional[ContractBundle]
+    ) -> Tuple[Dict, bool]:
+        """Run one evaluation for every caller sharing its key; returns (result, saved)"""
+        try:
+            evaluation = self.orchestrator.aevaluate_contract(
+                contract, self.agents, self._step_fanouts[key].publish, bundle
+            )
+            with narrative_mode(narrative):
+                if refresh:
+                    with cache_bypass():
+                        result = await evaluation
+                else:
+                    result = await evaluation
+            result["input_fingerprint"] = fingerprint
+            
+            if save:
+                # Storage I/O runs off the event loop
+                await asyncio.to_thread(self.result_store.save_result, result)
+            
+            return result, save
+        finally:
+            self._step_fanouts.pop(key, None)
+    
+    def fingerprint(self, contract: Dict, narrative: Optional[str] = None) -> str:
+        """
+        Fingerprint a contract's evaluation inputs
+        
+        Args:
+            contract: Contract data dictionary
+            narrative: Narrative mode override for the evaluation
+            
+        Returns:
+            Fingerprint of the contract, its source files, prompt version,
+            models, narrative settings and prompt budgets
+        """
+        model_ids = []
+        for agent in self.agents.values():
+            provider = getattr(agent, "llm_provider", None)
+            if provider is not None:
+                model_ids.append(provider.model_id())
+        
+        config = load_config(self.config_path)
+        narrative_config = dict(config.get("narrative") or {})
+        narrative_config["mode"] = narrative or current_narrative_mode(narrative_config.get("mode", "llm"))
+        settings = {"narrative": narrative_config, "prompt": config.get("prompt") or {}}
+        return self.fingerprinter.fingerprint(contract, model_ids, settings)
+    
+    def select_changed(self, contracts: List[Dict], force: bool = False) -> Tuple[List[Dict], List[str]]:
+        """
+        Split contracts into those whose inputs changed since their last
+        successful evaluation and those that can be skipped
+        
+        Args:
+            contracts: Contract data dictionaries
+            force: Re-evaluate everything
+            
+        Returns:
+            Tuple of (contracts to evaluate, unchanged contract IDs)
+        """
+        if force or not contracts:
+            return list(contracts), []
+        
+        stored = self.result_store.get_fingerprints([c["contract_id"] for c in contracts])
+        changed, unchanged = [], []
+        for contract in contracts:
+            if stored.get(contract["contract_id"]) == self.fingerprint(contract):
+                unchanged.append(contract["contract_id"])
+            else:
+                changed.append(contract)
+        
+        return changed, unchanged
+    
+    def resolve_folder(self, folder: Optional[str] = None) -> Path:
+        """
+        Resolve a contract folder, falling back to the project root
+        
+        Args:
+            folder: Folder path (defaults to the configured sample folder)
+            
+        Returns:
+            Resolved folder path
+        """
+        folder_path = Path(folder or self.sample_folder)
+        
+        # Resolve path relative to project root if not found in current directory
+        if not folder_path.exists():
+            root_path = Path(__file__).parent.parent.parent
+            folder_path = root_path / (folder or self.sample_folder)
+        
+        return folder_path
+    
+    def load_contracts(
+        self,
+        contract_ids: Optional[List[str]] = None,
+        folder: Optional[str] = None
+    ) -> Tuple[List[Dict], List[str]]:
+        """
+        Load contract JSON files from a folder
+        
+        Args:
+            contract_ids: Only return these contracts (default: every contract in the folder)
+            folder: Folder with contract JSON files (default: configured sample folder)
+            
+        Returns:
+            Tuple of (contracts, requested contract IDs that were not found)
+        """
+        folder_path = self.resolve_folder(folder)
+        if not folder_path.is_dir():
+            raise FileNotFoundError(f"Contract folder not found: {folder_path}")
+        
+        wanted = set(contract_ids) if contract_ids else None
+        contracts = []
+        
+        for contract_path in sorted(folder_path.glob("*.json")):
+            try:
+                with open(contract_path, 'r', encoding='utf-8') as f:
+                    contract = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Warning: Could not load contract file {contract_path}: {e}")
+                continue
+            
+            if not isinstance(contract, dict) or "contract_id" not in contract:
+                continue
+            if wanted is None or contract["contract_id"] in wanted:
+                contracts.append(contract)
+        
+        found = {c["contract_id"] for c in contracts}
+        missing = [cid for cid in (contract_ids or []) if cid not in found]
+        
+        return contracts, missing
+    
+    @staticmethod
+    def summarize(result: Dict) -> Dict:
+        """
+        Reduce a full evaluation result to the fields returned to clients
+        
+        Args:
+            result: Evaluation result dictionary
+            
+        Returns:
+            Summary dictionary (intermediate agent steps omitted)
+        """
+        return {field: result.get(field) for field in SUMMARY_FIELDS if field in result}
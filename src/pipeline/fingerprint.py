@@ -0,0 +1,96 @@
+"""
+Input Fingerprints
+Content hashes of everything that feeds a contract evaluation
+"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.ingestion.document_loader import DocumentLoader
+from src.prompts.reasoning_prompts import PROMPT_TEMPLATE_VERSION, REASONING_PROMPT_TEMPLATE
+
+
+class InputFingerprinter:
+    """
+    Computes a per-contract fingerprint of evaluation inputs
+    
+    The fingerprint covers the contract data, the content of each source
+    file (performance CSV, incidents JSON, market context, reviews), the
+    prompt template version, the models used and settings that change the
+    output (narrative mode, prompt budgets). File contents are only
+    re-hashed when a file's mtime or size changes, so fingerprinting an
+    unchanged portfolio costs one stat() per file.
+    """
+    
+    def __init__(self, loader: DocumentLoader):
+        """
+        Initialize fingerprinter
+        
+        Args:
+            loader: Document loader that locates a contract's source files
+        """
+        self.loader = loader
+        self.prompt_version = PROMPT_TEMPLATE_VERSION + ":" + _digest(REASONING_PROMPT_TEMPLATE.encode("utf-8"))[:12]
+        self._file_hashes: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+    
+    def fingerprint(self, contract: Dict, model_ids: List[str], settings: Optional[Dict] = None) -> str:
+        """
+        Fingerprint one contract's inputs
+        
+        Args:
+            contract: Contract data dictionary
+            model_ids: Identifiers of the models used by the agents
+            settings: Configuration that affects the evaluation output
+            
+        Returns:
+            Fingerprint string ("sha256:<hex>")
+        """
+        contract_id = contract.get("contract_id", "")
+        components = {
+            "contract": _digest(json.dumps(contract, sort_keys=True, default=str).encode("utf-8")),
+            "sources": {
+                name: self.file_hash(path)
+                for name, path in self.loader.source_paths(contract_id).items()
+            },
+            "prompt_version": self.prompt_version,
+            "models": sorted(set(model_ids)),
+            "settings": settings or {}
+        }
+        return "sha256:" + _digest(json.dumps(components, sort_keys=True).encode("utf-8"))
+    
+    def file_hash(self, path: Path) -> str:
+        """
+        Content hash of a file, cached by mtime and size
+        
+        Args:
+            path: File path
+            
+        Returns:
+            Hex digest, or "missing" if the file does not exist
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return "missing"
+        
+        key = str(path)
+        with self._lock:
+            cached = self._file_hashes.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        
+        with self._lock:
+            self._file_hashes[key] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+        return digest.hexdigest()
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
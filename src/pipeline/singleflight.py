@@ -0,0 +1,64 @@
+"""
+Single-Flight Coalescing
+Concurrent calls with the same key share one in-flight computation
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time
+    
+    The first caller for a key starts the computation; callers that arrive
+    while it is running await the same task and receive its result (or
+    exception). A caller that is cancelled stops waiting without cancelling
+    the shared computation for everyone else. Once it finishes the key is
+    released, so later calls start a fresh computation.
+    """
+    
+    def __init__(self):
+        """Initialize with no calls in flight"""
+        self._calls: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self._stats = {"executed": 0, "shared": 0}
+    
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run factory() for this key, or join the call already in flight
+        
+        Args:
+            key: Identity of the computation
+            factory: Returns the awaitable to run when no call is in flight
+        
+        Returns:
+            Tuple of (result, shared) where shared is True for callers that
+            joined another caller's computation
+        """
+        # Tasks belong to one event loop; the API server and CLI runs each have their own
+        call_key = (asyncio.get_running_loop(), key)
+        task = self._calls.get(call_key)
+        shared = task is not None
+        
+        if shared:
+            self._stats["shared"] += 1
+        else:
+            self._stats["executed"] += 1
+            task = asyncio.ensure_future(self._run(call_key, factory))
+            self._calls[call_key] = task
+        
+        return await asyncio.shield(task), shared
+    
+    async def _run(self, call_key: Tuple[asyncio.AbstractEventLoop, Hashable], factory: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            return await factory()
+        finally:
+            self._calls.pop(call_key, None)
+    
+    def stats(self) -> Dict:
+        """
+        Get coalescing counters
+        
+        Returns:
+            Dictionary with executed, shared and in_flight counts
+        """
+        return {**self._stats, "in_flight": len(self._calls)}
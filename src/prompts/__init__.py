@@ -1,4 +1,11 @@
 """Prompts module"""
-from .reasoning_prompts import REASONING_PROMPT_TEMPLATE, SIMPLE_REASONING_PROMPT
+from .packer import PromptPacker, count_tokens
+from .reasoning_prompts import PROMPT_TEMPLATE_VERSION, REASONING_PROMPT_TEMPLATE, SIMPLE_REASONING_PROMPT
 
-__all__ = ["REASONING_PROMPT_TEMPLATE", "SIMPLE_REASONING_PROMPT"]
+__all__ = [
+    "PROMPT_TEMPLATE_VERSION",
+    "REASONING_PROMPT_TEMPLATE",
+    "SIMPLE_REASONING_PROMPT",
+    "PromptPacker",
+    "count_tokens"
+]
@@ -0,0 +1,201 @@
+"""
+Prompt Packer
+Fits prompt sections into a token budget by priority
+"""
+import re
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+# Section budgets used when config.yaml has no prompt section; market context
+# and reviews match the old 2000/3000 character cut-offs (~4 characters per token)
+DEFAULT_TOKEN_BUDGET = 3500
+DEFAULT_SECTIONS = {
+    "performance_summary": {"priority": 4, "budget": 1200},
+    "incidents_summary": {"priority": 3, "budget": 1000},
+    "past_reviews": {"priority": 2, "budget": 750},
+    "market_context": {"priority": 1, "budget": 500}
+}
+
+# Word runs, digit runs and single symbols, roughly how BPE tokenizers split text
+_PIECES = re.compile(r"[^\W\d_]+|\d+|\S")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+TRUNCATION_NOTE = "[... truncated to fit the prompt budget]"
+
+# A section's text, or its renderings from most to least detailed (callables
+# are only called when the packer needs that rendering)
+Rendering = Union[str, Callable[[], str]]
+
+
+def count_tokens(text: str) -> int:
+    """
+    Approximate the token count of text without a model tokenizer
+    
+    English words count one token per 6 letters (rounded up), other
+    scripts one per 2 characters, digits one per 3, and every other
+    symbol one token. Close to GPT/Gemini tokenizers for prompt-style
+    text, and additive across lines.
+    
+    Args:
+        text: Text to measure
+    
+    Returns:
+        Estimated token count
+    """
+    total = 0
+    for piece in _PIECES.findall(text):
+        if piece.isdigit():
+            total += (len(piece) + 2) // 3
+        elif piece.isascii() and piece.isalpha():
+            total += (len(piece) + 5) // 6
+        elif piece.isalpha():
+            total += (len(piece) + 1) // 2
+        else:
+            total += 1
+    return total
+
+
+class PromptPacker:
+    """
+    Fills a prompt template's sections within a total token budget
+    
+    Each section has a priority and its own budget. A section over its
+    budget falls back to its next, more compact rendering (e.g. coarser
+    history, incidents without details); if even the most compact one
+    is too long it is cut at a line or sentence boundary and marked as
+    truncated. When the sections together still exceed the total
+    budget, the lowest-priority sections shrink first; tokens left over
+    by short sections go to the highest-priority sections that were cut.
+    """
+    
+    def __init__(
+        self,
+        template: str,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        sections: Optional[Dict[str, Dict]] = None,
+        counter: Callable[[str], int] = count_tokens
+    ):
+        """
+        Initialize packer
+        
+        Args:
+            template: str.format template with one placeholder per section
+            token_budget: Maximum tokens for the whole prompt
+            sections: Section name -> {"priority": int, "budget": int}
+                (higher priority keeps its content longer)
+            counter: Token counting function
+        """
+        self.template = template
+        self.token_budget = token_budget
+        self.sections = sections or DEFAULT_SECTIONS
+        self.counter = counter
+        self.fixed_tokens = counter(template.format(**{name: "" for name in self.sections}))
+    
+    def pack(self, renderings: Dict[str, Union[Rendering, Sequence[Rendering]]]) -> Tuple[str, Dict]:
+        """
+        Build the prompt
+        
+        Args:
+            renderings: Section name -> text, or list of renderings from most
+                to least detailed
+        
+        Returns:
+            Tuple of (prompt text, report with "tokens", "budget" and per-section
+            "tokens", "level" (rendering used) and "truncated")
+        """
+        options = {
+            name: _Options(renderings[name], self.counter)
+            for name in self.sections
+        }
+        order = sorted(self.sections, key=lambda name: self.sections[name]["priority"])
+        available = max(self.token_budget - self.fixed_tokens, 0)
+        
+        # 1. Every section within its own budget
+        packed = {name: options[name].fit(self.sections[name]["budget"]) for name in order}
+        
+        # 2. Over the total: shrink the lowest-priority sections first
+        for name in order:
+            excess = sum(section[1] for section in packed.values()) - available
+            if excess <= 0:
+                break
+            packed[name] = options[name].fit(max(packed[name][1] - excess, 0))
+        
+        # 3. Spare tokens: restore the highest-priority sections that were cut
+        for name in reversed(order):
+            spare = available - sum(section[1] for section in packed.values())
+            if spare <= 0:
+                break
+            text, tokens, level, truncated = packed[name]
+            if level or truncated:
+                packed[name] = options[name].fit(tokens + spare)
+        
+        prompt = self.template.format(**{name: section[0] for name, section in packed.items()})
+        report = {
+            "tokens": self.counter(prompt),
+            "budget": self.token_budget,
+            "sections": {
+                name: {"tokens": tokens, "level": level, "truncated": truncated}
+                for name, (_, tokens, level, truncated) in packed.items()
+            }
+        }
+        return prompt, report
+
+
+class _Options:
+    """A section's renderings, measured on first use"""
+    
+    def __init__(self, renderings: Union[Rendering, Sequence[Rendering]], counter: Callable[[str], int]):
+        self.renderings = [renderings] if isinstance(renderings, str) or callable(renderings) else list(renderings)
+        self.counter = counter
+        self._measured: Dict[int, Tuple[str, int]] = {}
+    
+    def fit(self, limit: int) -> Tuple[str, int, int, bool]:
+        """Most detailed rendering within limit: (text, tokens, level, truncated)"""
+        for level in range(len(self.renderings)):
+            text, tokens = self._measure(level)
+            if tokens <= limit:
+                return text, tokens, level, False
+        
+        level = len(self.renderings) - 1
+        text = truncate_to_tokens(self._measure(level)[0], limit, self.counter)
+        return text, self.counter(text), level, True
+    
+    def _measure(self, level: int) -> Tuple[str, int]:
+        if level not in self._measured:
+            rendering = self.renderings[level]
+            text = rendering() if callable(rendering) else rendering
+            self._measured[level] = (text, self.counter(text))
+        return self._measured[level]
+
+
+def truncate_to_tokens(text: str, limit: int, counter: Callable[[str], int] = count_tokens) -> str:
+    """
+    Keep the leading whole sentences and lines of text that fit in limit tokens
+    
+    Never cuts inside a sentence. TRUNCATION_NOTE is appended when it fits.
+    
+    Args:
+        text: Text to shorten
+        limit: Token limit
+        counter: Token counting function
+        
+    Returns:
+        Shortened text (may be empty)
+    """
+    # (separator before, sentence) for every sentence of every line
+    pieces = [
+        ("\n" if index and not position else " " if position else "", sentence)
+        for index, line in enumerate(text.rstrip("\n").split("\n"))
+        for position, sentence in enumerate(_SENTENCE_END.split(line))
+    ]
+    
+    note_cost = counter(TRUNCATION_NOTE)
+    budget = limit - note_cost if limit >= note_cost else limit
+    kept, used = 0, 0
+    while kept < len(pieces) and used + counter(pieces[kept][1]) <= budget:
+        used += counter(pieces[kept][1])
+        kept += 1
+    
+    shortened = "".join(separator + sentence for separator, sentence in pieces[:kept]).lstrip("\n ")
+    if limit >= note_cost:
+        return f"{shortened}\n{TRUNCATION_NOTE}" if shortened else TRUNCATION_NOTE
+    return shortened
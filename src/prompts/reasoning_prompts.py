@@ -3,6 +3,10 @@ Reasoning Prompts for Contract Evaluation
 Chain-of-thought prompts that require LLM to reason over multiple sources
 """
 
+# Bump when any prompt wording changes (including the justification and risk
+# reason prompts built in the agents) so stored results are re-evaluated
+PROMPT_TEMPLATE_VERSION = "3"
+
 # Main reasoning prompt for contract evaluation (OPTIMIZED for token efficiency)
 REASONING_PROMPT_TEMPLATE = """You are a contract analyst for Daleel Petroleum with 15+ years in vendor management and risk assessment.
 
@@ -0,0 +1,12 @@
+"""Storage module"""
+from .result_store import ResultStore
+from .csv_store import CSVResultStore
+from .sqlite_store import SQLiteResultStore
+from .config import get_result_store
+
+__all__ = [
+    "ResultStore",
+    "CSVResultStore",
+    "SQLiteResultStore",
+    "get_result_store"
+]
@@ -0,0 +1,33 @@
+"""
+Result Store Factory
+Handles storage backend selection based on configuration
+"""
+from src.llm import load_config
+from .result_store import ResultStore
+from .csv_store import CSVResultStore
+from .sqlite_store import SQLiteResultStore
+
+
+def get_result_store(config_path: str = "config.yaml") -> ResultStore:
+    """
+    Factory function to get the result store based on configuration
+    
+    Args:
+        config_path: Path to configuration file
+        
+    Returns:
+        Configured result store instance
+    """
+    data_config = load_config(config_path).get("data", {})
+    backend = data_config.get("result_store", "sqlite").lower()
+    csv_path = data_config.get("evaluation_file", "data/evaluations.csv")
+    
+    if backend == "sqlite":
+        return SQLiteResultStore(
+            db_path=data_config.get("result_db", "data/evaluations.db"),
+            csv_path=csv_path
+        )
+    elif backend == "csv":
+        return CSVResultStore(csv_path)
+    else:
+        raise ValueError(f"Unknown result store: {backend}. Use 'sqlite' or 'csv'.")
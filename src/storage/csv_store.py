@@ -0,0 +1,162 @@
+"""
+CSV Result Store
+Flat-file backend kept for small deployments and as the export format
+"""
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Optional
+from src.utils import CSVOutputHandler
+from .result_store import ResultStore, SORT_FIELDS, encode_cursor, decode_cursor, date_bounds
+
+
+class CSVResultStore(CSVOutputHandler, ResultStore):
+    """
+    Result store backed by the evaluations CSV file
+    
+    Every write rewrites the whole file and every lookup re-parses it,
+    so prefer SQLiteResultStore for large portfolios. Input fingerprints
+    are kept in a JSON sidecar next to the CSV, so the file keeps the
+    export columns.
+    """
+    
+    def __init__(self, csv_path: str = "data/evaluations.csv"):
+        """
+        Initialize CSV store
+        
+        Args:
+            csv_path: Path to CSV file
+        """
+        super().__init__(csv_path)
+        self.fingerprint_path = self.csv_path.with_name(self.csv_path.name + ".fingerprints.json")
+        self._fingerprint_lock = threading.Lock()
+    
+    def save_results(self, new_results: List[Dict]) -> None:
+        """Upsert results and record their input fingerprints in the sidecar"""
+        with self._fingerprint_lock:
+            super().save_results(new_results)
+            if not new_results:
+                return
+            
+            fingerprints = self._read_fingerprints()
+            for result in new_results:
+                contract_id = result.get("contract_id", "")
+                if result.get("input_fingerprint"):
+                    fingerprints[contract_id] = result["input_fingerprint"]
+                else:
+                    fingerprints.pop(contract_id, None)
+            
+            temp_path = self.fingerprint_path.with_suffix(".tmp")
+            temp_path.write_text(json.dumps(fingerprints, sort_keys=True), encoding="utf-8")
+            os.replace(temp_path, self.fingerprint_path)
+    
+    def list_results(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """List stored results ordered by contract ID"""
+        results = sorted(self.read_results(), key=lambda r: r.get("contract_id", ""))
+        end = offset + limit if limit is not None else None
+        return results[offset:end]
+    
+    def query_results(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: str = "contract_id",
+        descending: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[List[str]] = None
+    ) -> Dict:
+        """Query one page of results (filters and sorts the parsed file in memory)"""
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{sort}'. Use one of: {', '.join(SORT_FIELDS)}")
+        if fields:
+            unknown = [name for name in fields if name not in self.fieldnames]
+            if unknown:
+                raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+        fields = list(fields) if fields else list(self.fieldnames)
+        
+        filters = filters or {}
+        lower, upper = date_bounds(filters.get("date_from"), filters.get("date_to"))
+        vendor = (filters.get("vendor") or "").lower()
+        
+        def matches(row: Dict) -> bool:
+            for column in ["risk_level", "recommendation"]:
+                if filters.get(column) and row.get(column) not in filters[column]:
+                    return False
+            if vendor and vendor not in row.get("vendor_name", "").lower():
+                return False
+            if lower and row.get("timestamp", "") < lower:
+                return False
+            if upper and row.get("timestamp", "") >= upper:
+                return False
+            return True
+        
+        def sort_key(row: Dict) -> tuple:
+            value = row.get(sort, "")
+            if sort == "performance_score":
+                value = float(value or 0)
+            return (value, row.get("contract_id", ""))
+        
+        rows = sorted(filter(matches, self.read_results()), key=sort_key, reverse=descending)
+        total = len(rows)
+        
+        if cursor:
+            last_key = decode_cursor(cursor)
+            if descending:
+                rows = [row for row in rows if sort_key(row) < tuple(last_key)]
+            else:
+                rows = [row for row in rows if sort_key(row) > tuple(last_key)]
+        
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(*sort_key(page[-1]))
+        
+        return {
+            "results": [{name: row.get(name) for name in fields} for row in page],
+            "next_cursor": next_cursor,
+            "total": total
+        }
+    
+    def get_fingerprints(self, contract_ids: List[str]) -> Dict[str, str]:
+        """Get stored input fingerprints (one parse of the file and the sidecar)"""
+        wanted = set(contract_ids)
+        stored = self._read_fingerprints()
+        fingerprints = {}
+        for row in self.read_results():
+            contract_id = row.get("contract_id")
+            if contract_id not in wanted or row.get("status") != "completed":
+                continue
+            # Files written before the sidecar kept the fingerprint as a column
+            fingerprint = stored.get(contract_id) or row.get("input_fingerprint")
+            if fingerprint:
+                fingerprints[contract_id] = fingerprint
+        return fingerprints
+    
+    def _read_fingerprints(self) -> Dict[str, str]:
+        """Contract ID -> input fingerprint from the sidecar file"""
+        try:
+            return json.loads(self.fingerprint_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def revision(self) -> str:
+        """File modification time and size"""
+        if not self.csv_path.exists():
+            return "0"
+        stat = self.csv_path.stat()
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+    
+    def count(self) -> int:
+        """Count stored results"""
+        return len(self.read_results())
+    
+    def export_csv(self, csv_path: Optional[str] = None) -> str:
+        """Copy the evaluations CSV to csv_path"""
+        if not self.csv_path.exists():
+            self.save_results([])  # Header-only file
+        
+        if csv_path and str(csv_path) != str(self.csv_path):
+            shutil.copyfile(self.csv_path, csv_path)
+            return str(csv_path)
+        return str(self.csv_path)
@@ -0,0 +1,196 @@
+"""
+Result Store Abstraction Layer
+Allows switching between CSV and SQLite result storage
+"""
+import base64
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Columns that GET /results can sort by (contract_id breaks ties)
+SORT_FIELDS = ["contract_id", "timestamp", "performance_score", "vendor_name", "risk_level", "recommendation"]
+
+# Filters accepted by query_results()
+FILTER_KEYS = ["risk_level", "recommendation", "vendor", "date_from", "date_to"]
+
+
+def encode_cursor(sort_value: Any, contract_id: str) -> str:
+    """Encode the last row's sort key as an opaque pagination cursor"""
+    payload = json.dumps([sort_value, contract_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """
+    Decode a pagination cursor
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, contract_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return sort_value, str(contract_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def date_bounds(date_from: Optional[str], date_to: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Convert an inclusive date range to [lower, upper) timestamp bounds
+    
+    A bare date (YYYY-MM-DD) as date_to includes that whole day.
+    
+    Raises:
+        ValueError: If a date is not ISO formatted
+    """
+    lower = upper = None
+    if date_from:
+        datetime.fromisoformat(date_from.replace("Z", ""))
+        lower = date_from
+    if date_to:
+        parsed = datetime.fromisoformat(date_to.replace("Z", ""))
+        if len(date_to) == 10:
+            upper = (parsed + timedelta(days=1)).date().isoformat()
+        else:
+            upper = date_to + "\uffff"  # Inclusive of the exact timestamp
+    return lower, upper
+
+
+class ResultStore(ABC):
+    """Abstract base class for evaluation result storage"""
+    
+    def save_result(self, result: Dict) -> None:
+        """
+        Upsert a single evaluation result
+        
+        Args:
+            result: Evaluation result dictionary
+        """
+        self.save_results([result])
+    
+    @abstractmethod
+    def save_results(self, results: List[Dict]) -> None:
+        """
+        Upsert many evaluation results in one commit
+        
+        Args:
+            results: Evaluation result dictionaries
+        """
+        pass
+    
+    @abstractmethod
+    def get_by_contract_id(self, contract_id: str) -> Optional[Dict]:
+        """
+        Get result by contract ID
+        
+        Args:
+            contract_id: Contract ID to look up
+            
+        Returns:
+            Result row dictionary or None
+        """
+        pass
+    
+    @abstractmethod
+    def list_results(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """
+        List stored results ordered by contract ID
+        
+        Args:
+            limit: Maximum number of rows (None = all)
+            offset: Number of rows to skip
+            
+        Returns:
+            Result row dictionaries
+        """
+        pass
+    
+    @abstractmethod
+    def count(self) -> int:
+        """
+        Count stored results
+        
+        Returns:
+            Number of stored results
+        """
+        pass
+    
+    @abstractmethod
+    def export_csv(self, csv_path: Optional[str] = None) -> str:
+        """
+        Export all results in the evaluations CSV format
+        
+        Args:
+            csv_path: Destination file (defaults to the configured evaluation file)
+            
+        Returns:
+            Path of the written CSV file
+        """
+        pass
+    
+    @abstractmethod
+    def query_results(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: str = "contract_id",
+        descending: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Query one page of results with keyset (cursor) pagination
+        
+        Args:
+            filters: Optional risk_level / recommendation (lists of values),
+                vendor (case-insensitive substring), date_from / date_to (ISO dates)
+            sort: Column to sort by (one of SORT_FIELDS)
+            descending: Sort direction
+            cursor: next_cursor from the previous page
+            limit: Page size
+            fields: Columns to return (default: all)
+            
+        Returns:
+            {"results": List[Dict], "next_cursor": str or None, "total": int}
+        """
+        pass
+    
+    @abstractmethod
+    def revision(self) -> str:
+        """
+        Opaque token that changes whenever stored results change
+        
+        Returns:
+            Revision string (used to build HTTP ETags)
+        """
+        pass
+    
+    def get_fingerprints(self, contract_ids: List[str]) -> Dict[str, str]:
+        """
+        Get stored input fingerprints of successfully completed evaluations
+        
+        Args:
+            contract_ids: Contract IDs to look up
+            
+        Returns:
+            Dictionary of contract ID to fingerprint (errored or
+            unfingerprinted results are omitted so they get re-evaluated)
+        """
+        fingerprints = {}
+        for contract_id in contract_ids:
+            row = self.get_by_contract_id(contract_id)
+            if row and row.get("status") == "completed" and row.get("input_fingerprint"):
+                fingerprints[contract_id] = row["input_fingerprint"]
+        return fingerprints
+    
+    def read_results(self) -> List[Dict]:
+        """
+        Read all results
+        
+        Returns:
+            List of result dictionaries
+        """
+        return self.list_results()
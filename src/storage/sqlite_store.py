@@ -0,0 +1,287 @@
+"""
+SQLite Result Store
+Embedded, indexed result storage with transactional upserts
+"""
+import csv
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.utils import CSVOutputHandler
+from .result_store import ResultStore, SORT_FIELDS, encode_cursor, decode_cursor, date_bounds
+
+
+class SQLiteResultStore(ResultStore):
+    """
+    Result store backed by an embedded SQLite database
+    
+    contract_id is the primary key, so upserts and lookups are index
+    operations instead of full-file scans. WAL mode lets API workers
+    read while a batch run is writing.
+    """
+    
+    def __init__(self, db_path: str = "data/evaluations.db", csv_path: str = "data/evaluations.csv"):
+        """
+        Initialize SQLite store
+        
+        Args:
+            db_path: Path to SQLite database file
+            csv_path: Evaluations CSV used for export (and imported once
+                into an empty database)
+        """
+        self.db_path = Path(db_path)
+        self.csv_handler = CSVOutputHandler(csv_path)
+        self.fieldnames = self.csv_handler.fieldnames
+        # Table columns: the export columns plus the input fingerprint
+        self.columns = self.fieldnames + ["input_fingerprint"]
+        self._local = threading.local()
+        
+        # Ensure directory exists
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._create_schema()
+        self._import_existing_csv()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections are not thread-safe)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _create_schema(self) -> None:
+        """Create the evaluations table"""
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS evaluations (
+                    contract_id TEXT PRIMARY KEY,
+                    timestamp TEXT,
+                    vendor_name TEXT,
+                    performance_score REAL,
+                    grade TEXT,
+                    risk_level TEXT,
+                    recommendation TEXT,
+                    status TEXT,
+                    justification TEXT,
+                    confidence_level TEXT,
+                    input_fingerprint TEXT
+                )
+            """)
+            # Databases created before input fingerprints were stored
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(evaluations)")}
+            if "input_fingerprint" not in existing:
+                conn.execute("ALTER TABLE evaluations ADD COLUMN input_fingerprint TEXT")
+            # Secondary indexes for GET /results filters and sort orders
+            for column in ["timestamp", "performance_score", "vendor_name", "risk_level", "recommendation"]:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_evaluations_{column} "
+                    f"ON evaluations ({column}, contract_id)"
+                )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO store_meta (key, value) VALUES ('revision', 0)")
+    
+    def _import_existing_csv(self) -> None:
+        """Seed an empty database from the legacy evaluations CSV"""
+        if self.count() > 0 or not self.csv_handler.csv_path.exists():
+            return
+        
+        rows = self.csv_handler.read_results()
+        if rows:
+            self._upsert_rows(rows)
+            print(f"[SQLiteResultStore] Imported {len(rows)} result(s) from {self.csv_handler.csv_path}")
+    
+    def save_results(self, results: List[Dict]) -> None:
+        """
+        Upsert many evaluation results in one transaction
+        
+        Args:
+            results: Evaluation result dictionaries
+        """
+        self._upsert_rows([
+            {**self.csv_handler.build_row(result), "input_fingerprint": result.get("input_fingerprint", "")}
+            for result in results
+        ])
+    
+    def _upsert_rows(self, rows: List[Dict]) -> None:
+        """Insert or replace rows keyed by contract_id"""
+        columns = ", ".join(self.columns)
+        placeholders = ", ".join(f":{name}" for name in self.columns)
+        updates = ", ".join(
+            f"{name} = excluded.{name}" for name in self.columns if name != "contract_id"
+        )
+        
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO evaluations ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT(contract_id) DO UPDATE SET {updates}",
+                [{name: row.get(name) for name in self.columns} for row in rows]
+            )
+            # Bumped in the same transaction, so readers never see new rows with an old revision
+            conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'revision'")
+    
+    def get_by_contract_id(self, contract_id: str) -> Optional[Dict]:
+        """Get result by contract ID (primary key lookup)"""
+        row = self._connect().execute(
+            "SELECT * FROM evaluations WHERE contract_id = ?", (contract_id,)
+        ).fetchone()
+        return dict(row) if row else None
+    
+    def get_fingerprints(self, contract_ids: List[str]) -> Dict[str, str]:
+        """Get stored input fingerprints (batched primary key lookups)"""
+        contract_ids = list(contract_ids)
+        fingerprints = {}
+        for start in range(0, len(contract_ids), 500):
+            chunk = contract_ids[start:start + 500]
+            rows = self._connect().execute(
+                "SELECT contract_id, input_fingerprint FROM evaluations "
+                f"WHERE contract_id IN ({', '.join('?' for _ in chunk)}) "
+                "AND status = 'completed' AND input_fingerprint IS NOT NULL AND input_fingerprint != ''",
+                chunk
+            ).fetchall()
+            fingerprints.update((row["contract_id"], row["input_fingerprint"]) for row in rows)
+        return fingerprints
+    
+    def list_results(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """List stored results ordered by contract ID"""
+        rows = self._connect().execute(
+            "SELECT * FROM evaluations ORDER BY contract_id LIMIT ? OFFSET ?",
+            (limit if limit is not None else -1, offset)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def query_results(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        sort: str = "contract_id",
+        descending: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Query one page of results with keyset (cursor) pagination
+        
+        Pages are fetched with an indexed range condition on (sort column,
+        contract_id) instead of OFFSET, so deep pages cost the same as the first.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{sort}'. Use one of: {', '.join(SORT_FIELDS)}")
+        fields = self._validate_fields(fields)
+        
+        where, params = self._build_filters(filters or {})
+        conn = self._connect()
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM evaluations {self._where_sql(where)}", params
+        ).fetchone()[0]
+        
+        page_where = list(where)
+        page_params = list(params)
+        if cursor:
+            sort_value, last_id = decode_cursor(cursor)
+            page_where.append(f"({sort}, contract_id) {'<' if descending else '>'} (?, ?)")
+            page_params.extend([sort_value, last_id])
+        
+        direction = "DESC" if descending else "ASC"
+        columns = ", ".join(dict.fromkeys(fields + [sort, "contract_id"]))
+        rows = conn.execute(
+            f"SELECT {columns} FROM evaluations {self._where_sql(page_where)} "
+            f"ORDER BY {sort} {direction}, contract_id {direction} LIMIT ?",
+            page_params + [limit + 1]
+        ).fetchall()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][sort], rows[-1]["contract_id"]) if has_more else None
+        
+        return {
+            "results": [{name: row[name] for name in fields} for row in rows],
+            "next_cursor": next_cursor,
+            "total": total
+        }
+    
+    def _validate_fields(self, fields: Optional[List[str]]) -> List[str]:
+        """Validate a column projection (default: all columns)"""
+        if not fields:
+            return list(self.fieldnames)
+        unknown = [name for name in fields if name not in self.fieldnames]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+        return list(fields)
+    
+    def _build_filters(self, filters: Dict[str, Any]) -> tuple:
+        """Translate query filters into SQL conditions and parameters"""
+        where, params = [], []
+        
+        for column in ["risk_level", "recommendation"]:
+            values = filters.get(column)
+            if values:
+                where.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+        
+        if filters.get("vendor"):
+            where.append("vendor_name LIKE ? ESCAPE '\\'")
+            escaped = filters["vendor"].replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        
+        lower, upper = date_bounds(filters.get("date_from"), filters.get("date_to"))
+        if lower:
+            where.append("timestamp >= ?")
+            params.append(lower)
+        if upper:
+            where.append("timestamp < ?")
+            params.append(upper)
+        
+        return where, params
+    
+    def _where_sql(self, where: List[str]) -> str:
+        """Join conditions into a WHERE clause"""
+        return f"WHERE {' AND '.join(where)}" if where else ""
+    
+    def revision(self) -> str:
+        """Revision counter, incremented by every write transaction"""
+        row = self._connect().execute(
+            "SELECT value FROM store_meta WHERE key = 'revision'"
+        ).fetchone()
+        return str(row[0]) if row else "0"
+    
+    def count(self) -> int:
+        """Count stored results"""
+        return self._connect().execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+    
+    def export_csv(self, csv_path: Optional[str] = None) -> str:
+        """
+        Export all results in the evaluations CSV format
+        
+        Rows are streamed from the database and written to a temporary
+        file that replaces the target atomically.
+        
+        Args:
+            csv_path: Destination file (defaults to the evaluations CSV)
+            
+        Returns:
+            Path of the written CSV file
+        """
+        target = Path(csv_path) if csv_path else self.csv_handler.csv_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        
+        cursor = self._connect().execute(
+            f"SELECT {', '.join(self.fieldnames)} FROM evaluations ORDER BY contract_id"
+        )
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+            writer.writeheader()
+            for row in cursor:
+                writer.writerow(dict(row))
+        
+        tmp_path.replace(target)
+        return str(target)
@@ -1,4 +1,5 @@
 """Utils module"""
 from .csv_handler import CSVOutputHandler
+from .json_stream import IncrementalJSONParser
 
-__all__ = ["CSVOutputHandler"]
+__all__ = ["CSVOutputHandler", "IncrementalJSONParser"]
@@ -4,8 +4,9 @@ Saves evaluation results to CSV file for tracking and reporting
 """
 import csv
 import os
+import threading
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 from datetime import datetime
 
 
@@ -33,6 +34,9 @@ class CSVOutputHandler:
             "confidence_level"
         ]
         
+        # Serializes read-modify-write cycles from concurrent saves
+        self._write_lock = threading.Lock()
+        
         # Ensure directory exists
         self.csv_path.parent.mkdir(parents=True, exist_ok=True)
     
@@ -44,14 +48,45 @@ class CSVOutputHandler:
         Args:
             result: Evaluation result dictionary
         """
-        # Read all existing results
-        results = self.read_results()
-        contract_id = result.get("contract_id", "")
+        self.save_results([result])
+    
+    def save_results(self, new_results: List[Dict]) -> None:
+        """
+        Upsert many evaluation results with a single file rewrite
         
-        # Prepare row data
-        row = {
+        Args:
+            new_results: Evaluation result dictionaries
+        """
+        with self._write_lock:
+            # Read all existing results
+            results = self.read_results()
+            positions = {existing.get("contract_id"): i for i, existing in enumerate(results)}
+            
+            for result in new_results:
+                row = self.build_row(result)
+                contract_id = row["contract_id"]
+                
+                # Check if contract already exists
+                if contract_id in positions:
+                    results[positions[contract_id]] = row
+                else:
+                    positions[contract_id] = len(results)
+                    results.append(row)
+            
+            # Rewrite the entire CSV with headers, then swap it in so readers
+            # never see a half-written file
+            temp_path = self.csv_path.with_suffix(self.csv_path.suffix + ".tmp")
+            with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(results)
+            os.replace(temp_path, self.csv_path)
+    
+    def build_row(self, result: Dict) -> Dict:
+        """Prepare CSV row data from an evaluation result"""
+        return {
             "timestamp": result.get("timestamp", datetime.utcnow().isoformat() + "Z"),
-            "contract_id": contract_id,
+            "contract_id": result.get("contract_id", ""),
             "vendor_name": result.get("vendor_name", ""),
             "performance_score": result.get("performance_score", 0),
             "grade": self._get_grade(result),
@@ -61,23 +96,6 @@ class CSVOutputHandler:
             "justification": result.get("justification", ""),
             "confidence_level": result.get("confidence_level", "")
         }
-        
-        # Check if contract already exists
-        updated = False
-        for i, existing in enumerate(results):
-            if existing.get("contract_id") == contract_id:
-                results[i] = row
-                updated = True
-                break
-        
-        if not updated:
-            results.append(row)
-        
-        # Rewrite the entire CSV with headers
-        with open(self.csv_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-            writer.writeheader()
-            writer.writerows(results)
     
     def _get_grade(self, result: Dict) -> str:
         """Extract grade from result steps"""
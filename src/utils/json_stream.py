@@ -0,0 +1,236 @@
+"""
+Incremental JSON Parser
+Parses a JSON object as it streams in, reporting each value once it closes
+"""
+import copy
+import json
+import re
+from typing import Any, List, Optional, Tuple, Union
+
+JSONPath = Tuple[Union[str, int], ...]
+
+_WHITESPACE = re.compile(r'[\s,:]+')
+_STRING_TEXT = re.compile(r'[^"\\]+')
+_SCALAR_TEXT = re.compile(r'[^\s,:\]}"]+')
+_DECODER = json.JSONDecoder(strict=False)  # Models emit raw newlines inside strings
+_MISSING = object()
+
+
+class _Frame:
+    """An open object or array and where it sits in the document"""
+    
+    __slots__ = ("container", "path", "key")
+    
+    def __init__(self, container: Union[dict, list], path: JSONPath):
+        self.container = container
+        self.path = path
+        self.key: Optional[str] = None  # Objects only: key awaiting its value
+    
+    def child_path(self) -> JSONPath:
+        if isinstance(self.container, dict):
+            return self.path + (self.key,)
+        return self.path + (len(self.container),)
+    
+    def add(self, value: Any) -> None:
+        if isinstance(self.container, dict):
+            self.container[self.key] = value
+        else:
+            self.container.append(value)
+
+
+class IncrementalJSONParser:
+    """
+    Single-pass JSON object parser fed one chunk at a time
+    
+    Text before the first '{' (such as a markdown fence) and anything after
+    the top-level object closes is ignored. Commas and colons are treated as
+    separators only, so trailing commas and similar model slips are tolerated.
+    
+    Each feed() returns the values completed by that chunk as (path, value)
+    pairs, e.g. (("reasoning_chain", 0), "Step 1: ...") or
+    (("recommendation",), "RENEW"). result() returns everything parsed so far,
+    closing whatever the parser state says is still open, so a response cut
+    off by max_tokens still yields its completed fields.
+    """
+    
+    def __init__(self):
+        self.root: Optional[dict] = None
+        self.complete = False
+        self._stack: List[_Frame] = []
+        self._string: Optional[List[str]] = None  # Raw text of an open string
+        self._escape = False
+        self._scalar: Optional[str] = None  # Text of an open number or literal
+    
+    @property
+    def truncated(self) -> bool:
+        """True if the object was started but has not closed"""
+        return self.root is not None and not self.complete
+    
+    def feed(self, text: str) -> List[Tuple[JSONPath, Any]]:
+        """
+        Consume the next chunk of the document
+        
+        Args:
+            text: Next chunk of response text
+        
+        Returns:
+            (path, value) for each value completed in this chunk, in order
+        """
+        completed = []
+        position = 0
+        length = len(text)
+        
+        while position < length and not self.complete:
+            if self._string is not None:
+                position = self._read_string(text, position, completed)
+                continue
+            
+            if self._scalar is not None:
+                match = _SCALAR_TEXT.match(text, position)
+                if match:
+                    self._scalar += match.group()
+                    position = match.end()
+                    if position == length:
+                        break  # Scalar may continue in the next chunk
+                self._close_scalar(completed)
+                continue
+            
+            if self.root is None:
+                position = text.find('{', position)
+                if position == -1:
+                    break
+                self.root = {}
+                self._stack.append(_Frame(self.root, ()))
+                position += 1
+                continue
+            
+            char = text[position]
+            if char == '"':
+                self._string = []
+                position += 1
+            elif char == '{' or char == '[':
+                container = {} if char == '{' else []
+                frame = self._stack[-1]
+                child = _Frame(container, frame.child_path())
+                frame.add(container)
+                self._stack.append(child)
+                position += 1
+            elif char == '}' or char == ']':
+                self._close_container(completed)
+                position += 1
+            else:
+                match = _WHITESPACE.match(text, position)
+                if match:
+                    position = match.end()
+                else:
+                    self._scalar = ""
+        
+        return completed
+    
+    def result(self) -> Optional[dict]:
+        """
+        Get the object parsed so far
+        
+        Open strings, numbers, arrays and objects are closed as they stand.
+        A key still being written, or a literal cut short, is dropped.
+        
+        Returns:
+            Copy of the parsed object, or None if no object has started
+        """
+        if self.root is None:
+            return None
+        
+        frame = self._stack[-1] if self._stack else None
+        pending = self._pending_value()
+        if frame is None or pending is _MISSING or (isinstance(frame.container, dict) and frame.key is None):
+            return copy.deepcopy(self.root)
+        
+        frame.add(pending)
+        try:
+            return copy.deepcopy(self.root)
+        finally:
+            if isinstance(frame.container, dict):
+                del frame.container[frame.key]
+            else:
+                frame.container.pop()
+    
+    def _read_string(self, text: str, position: int, completed: List[Tuple[JSONPath, Any]]) -> int:
+        """Consume string content; returns the next position"""
+        if self._escape:
+            self._string.append(text[position])
+            self._escape = False
+            return position + 1
+        
+        match = _STRING_TEXT.match(text, position)
+        if match:
+            self._string.append(match.group())
+            return match.end()
+        
+        if text[position] == '\\':
+            self._string.append('\\')
+            self._escape = True
+            return position + 1
+        
+        # Closing quote
+        value = self._decode_string("".join(self._string))
+        self._string = None
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict) and frame.key is None:
+            frame.key = value
+        else:
+            self._add_value(value, completed)
+        return position + 1
+    
+    def _close_scalar(self, completed: List[Tuple[JSONPath, Any]]) -> None:
+        value = self._decode_scalar(self._scalar)
+        self._scalar = None
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict) and frame.key is None:
+            return  # Unquoted key
+        if value is not _MISSING:
+            self._add_value(value, completed)
+    
+    def _close_container(self, completed: List[Tuple[JSONPath, Any]]) -> None:
+        frame = self._stack.pop()
+        if not self._stack:
+            self.complete = True
+            completed.append(((), frame.container))
+            return
+        
+        completed.append((frame.path, frame.container))
+        parent = self._stack[-1]
+        if isinstance(parent.container, dict):
+            parent.key = None
+    
+    def _add_value(self, value: Any, completed: List[Tuple[JSONPath, Any]]) -> None:
+        frame = self._stack[-1]
+        completed.append((frame.child_path(), value))
+        frame.add(value)
+        frame.key = None
+    
+    def _pending_value(self) -> Any:
+        """The value being parsed when input stopped, repaired if possible"""
+        if self._string is not None:
+            raw = "".join(self._string)
+            if self._escape:
+                raw = raw[:-1]
+            # Drop an incomplete \uXXXX escape
+            raw = re.sub(r'\\u[0-9a-fA-F]{0,3}$', '', raw)
+            return self._decode_string(raw)
+        if self._scalar is not None:
+            return self._decode_scalar(self._scalar)
+        return _MISSING
+    
+    @staticmethod
+    def _decode_string(raw: str) -> str:
+        try:
+            return _DECODER.decode(f'"{raw}"')
+        except json.JSONDecodeError:
+            return raw
+    
+    @staticmethod
+    def _decode_scalar(raw: str) -> Any:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return _MISSING
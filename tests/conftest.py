@@ -0,0 +1,161 @@
+"""
+Shared Test Fixtures
+Stub LLM providers, a stub config and data-file writers used across the test modules
+"""
+import json
+import time
+import asyncio
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.agents import DataIntakeAgent, PerformanceAnalysisAgent, RiskAssessmentAgent
+from src.llm import LLMProvider
+from src.storage import CSVResultStore
+
+
+PERFORMANCE_CSV_HEADER = "month,uptime_pct,avg_response_hours,incidents_count,critical_incidents,user_satisfaction\n"
+
+
+class SlowStubProvider(LLMProvider):
+    """Stub provider whose async calls take a fixed time without blocking"""
+    
+    def __init__(self, delay: float = 0.2, response: str = "Stub summary of the vendor's performance for testing."):
+        self.delay = delay
+        self.response = response
+        self.calls = 0
+    
+    def generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.response
+    
+    async def agenerate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.response
+    
+    def validate_health(self) -> bool:
+        return True
+    
+    def get_model_info(self) -> dict:
+        return {"provider": "stub", "model": "stub"}
+
+
+class ChunkedStubProvider(SlowStubProvider):
+    """Stub provider that streams its response a few characters at a time"""
+    
+    chunks_sent = 0
+    
+    def stream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0):
+        self.calls += 1
+        for i in range(0, len(self.response), 7):
+            self.chunks_sent += 1
+            yield self.response[i:i + 7]
+    
+    async def astream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0):
+        self.calls += 1
+        for i in range(0, len(self.response), 7):
+            await asyncio.sleep(self.delay)  # Per chunk
+            self.chunks_sent += 1
+            yield self.response[i:i + 7]
+
+
+class CountingCSVHandler(CSVResultStore):
+    """CSV store that counts full-file rewrites"""
+    
+    def __init__(self, csv_path: str):
+        super().__init__(csv_path)
+        self.writes = 0
+    
+    def save_results(self, new_results):
+        self.writes += 1
+        super().save_results(new_results)
+
+
+@pytest.fixture
+def slow_provider() -> type:
+    """SlowStubProvider class (call it to build a provider)"""
+    return SlowStubProvider
+
+
+@pytest.fixture
+def chunked_provider() -> type:
+    """ChunkedStubProvider class (call it to build a provider)"""
+    return ChunkedStubProvider
+
+
+@pytest.fixture
+def counting_store() -> type:
+    """CountingCSVHandler class (call it with a CSV path)"""
+    return CountingCSVHandler
+
+
+@pytest.fixture
+def stub_config(tmp_path: Path) -> str:
+    """Path of a config that selects Ollama (no network on construction)"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        "llm:\n"
+        "  provider: ollama\n"
+        "  ollama:\n"
+        "    model: stub\n"
+        "    temperature: 0.0\n"
+        "    max_tokens: 64\n"
+    )
+    return str(config_path)
+
+
+@pytest.fixture
+def stub_agents(stub_config: str) -> Callable[[LLMProvider], dict]:
+    """Build data intake, performance and risk agents sharing one stub provider"""
+    def build(provider: LLMProvider) -> dict:
+        performance = PerformanceAnalysisAgent(stub_config)
+        risk = RiskAssessmentAgent(stub_config)
+        performance.llm_provider = provider
+        risk.llm_provider = provider
+        return {
+            "data_intake": DataIntakeAgent(),
+            "performance": performance,
+            "risk": risk
+        }
+    
+    return build
+
+
+@pytest.fixture
+def write_sources() -> Callable[..., None]:
+    """Write a contract's performance history and incident log, plus the shared market file"""
+    def write(base: Path, contract_id: str, months: int = 3) -> None:
+        for folder in ("performance", "incidents", "market", "reviews"):
+            (base / folder).mkdir(parents=True, exist_ok=True)
+        
+        rows = "".join(f"{2020 + m // 12}-{m % 12 + 1:02d},99.{m},2.{m},{m},0,4.{m}\n" for m in range(months))
+        (base / "performance" / f"{contract_id}_history.csv").write_text(PERFORMANCE_CSV_HEADER + rows)
+        (base / "incidents" / f"{contract_id}_incidents.json").write_text(json.dumps([
+            {"date": "2024-01-05", "severity": "low", "title": "Slow ticket", "description": "Late reply"}
+        ]))
+        (base / "market" / "industry_benchmarks.txt").write_text("Industry uptime: 99.5%")
+    
+    return write
+
+
+@pytest.fixture
+def performance_history() -> Callable[..., pd.DataFrame]:
+    """Monthly history from 2019-01: uptime drops at shift_at, response time creeps up"""
+    def build(months: int = 72, shift_at: int = 40) -> pd.DataFrame:
+        rng = np.random.default_rng(3)
+        index = np.arange(months)
+        return pd.DataFrame({
+            "month": pd.period_range("2019-01", periods=months, freq="M").astype(str),
+            "uptime_pct": np.where(index < shift_at, 99.5, 96.0) + rng.normal(0, 0.2, months),
+            "avg_response_hours": 2.0 + 0.05 * index,
+            "incidents_count": np.full(months, 2),
+            "critical_incidents": np.where(index % 12 == 0, 1, 0),
+            "user_satisfaction": np.full(months, 4.2),
+            "monthly_cost": np.full(months, 10000)
+        })
+    
+    return build
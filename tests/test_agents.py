@@ -17,7 +17,7 @@ from src.agents import (
 )
 
 
-def test_agents():
+def test_agents(tmp_path):
     """Test agent implementation with sample contracts"""
     print("=" * 60)
     print("Phase 3 - Agent Implementation Test")
@@ -26,7 +26,7 @@ def test_agents():
     # Initialize agents
     print("\n[1/5] Initializing agents...")
     try:
-        orchestrator = OrchestratorAgent()
+        orchestrator = OrchestratorAgent(audit_log_path=str(tmp_path / "audit_logs.jsonl"))
         data_intake = DataIntakeAgent()
         performance = PerformanceAnalysisAgent()
         risk = RiskAssessmentAgent()
@@ -96,7 +96,8 @@ def test_agents():
     print("✅ Orchestration working")
     
     # Check audit log
-    audit_log_path = Path("data/audit_logs.jsonl")
+    orchestrator.audit_writer.flush()
+    audit_log_path = tmp_path / "audit_logs.jsonl"
     if audit_log_path.exists():
         with open(audit_log_path, 'r') as f:
             log_lines = f.readlines()
@@ -116,5 +117,7 @@ def test_agents():
 
 
 if __name__ == "__main__":
-    success = test_agents()
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        success = test_agents(Path(tmp))
     sys.exit(0 if success else 1)
@@ -0,0 +1,223 @@
+"""
+Test Batch Evaluation
+Verifies portfolio evaluation through the bounded worker pool and
+incremental re-evaluation of changed contracts
+"""
+import os
+import sys
+import shutil
+import asyncio
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agents import OrchestratorAgent, ReasoningAgent
+from src.ingestion.document_loader import DocumentLoader
+from src.pipeline import EvaluationPipeline, BatchEvaluator
+from src.pipeline.fingerprint import InputFingerprinter
+from src.storage import SQLiteResultStore
+
+
+def test_batch_evaluation(tmp_path, slow_provider, counting_store, stub_agents):
+    """Batch run evaluates a folder, honours concurrency and saves once"""
+    print("=" * 60)
+    print("Batch Evaluation Test")
+    print("=" * 60)
+    
+    provider = slow_provider(delay=0.05)
+    agents = stub_agents(provider)
+    csv_handler = counting_store(str(tmp_path / "evaluations.csv"))
+    pipeline = EvaluationPipeline(
+        OrchestratorAgent(audit_log_path=str(tmp_path / "audit.jsonl")),
+        agents,
+        csv_handler
+    )
+    
+    # 1. Resolve contracts by ID from the sample folder
+    print("\n[1/3] Resolving contracts...")
+    contracts, missing = pipeline.load_contracts(["CNT-2024-001", "CNT-9999-999"], "data/samples")
+    assert [c["contract_id"] for c in contracts] == ["CNT-2024-001"]
+    assert missing == ["CNT-9999-999"]
+    contracts, missing = pipeline.load_contracts(folder="data/samples")
+    assert len(contracts) == 3 and not missing
+    print(f"✅ Found {len(contracts)} contracts in data/samples")
+    
+    # 2. Run the batch with a concurrency limit
+    print("\n[2/3] Running batch with concurrency=2...")
+    in_flight = {"now": 0, "peak": 0}
+    original = pipeline.aevaluate
+    
+    async def tracked(contract, **kwargs):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        try:
+            return await original(contract, **kwargs)
+        finally:
+            in_flight["now"] -= 1
+    
+    pipeline.aevaluate = tracked
+    
+    async def collect():
+        return [r async for r in BatchEvaluator(pipeline, concurrency=2).run(contracts)]
+    
+    results = asyncio.run(collect())
+    assert len(results) == 3
+    assert all(r["status"] == "completed" for r in results)
+    assert in_flight["peak"] == 2
+    print(f"✅ {len(results)} results, peak in flight: {in_flight['peak']}")
+    
+    # 3. Results are written in one bulk commit
+    print("\n[3/3] Checking bulk save...")
+    assert csv_handler.writes == 1
+    saved = csv_handler.read_results()
+    assert sorted(r["contract_id"] for r in saved) == sorted(c["contract_id"] for c in contracts)
+    print(f"✅ {len(saved)} rows saved in {csv_handler.writes} write")
+
+
+def test_incremental_batch(tmp_path, slow_provider, stub_agents):
+    """Only contracts whose inputs changed are re-evaluated"""
+    print("=" * 60)
+    print("Incremental Batch Test")
+    print("=" * 60)
+    
+    # Work on a copy of the data sources so they can be edited
+    data_dir = tmp_path / "data"
+    for folder in ["performance", "incidents", "market", "reviews"]:
+        shutil.copytree(Path("data") / folder, data_dir / folder)
+    
+    provider = slow_provider(delay=0)
+    pipeline = EvaluationPipeline(
+        OrchestratorAgent(audit_log_path=str(tmp_path / "audit.jsonl")),
+        stub_agents(provider),
+        SQLiteResultStore(str(tmp_path / "evaluations.db"), str(tmp_path / "evaluations.csv"))
+    )
+    pipeline.fingerprinter = InputFingerprinter(DocumentLoader(str(data_dir)))
+    contracts, _ = pipeline.load_contracts(folder="data/samples")
+    
+    async def run(selected):
+        return [r async for r in BatchEvaluator(pipeline, concurrency=2).run(selected)]
+    
+    # 1. First run evaluates everything and stores fingerprints
+    print("\n[1/3] Initial run...")
+    changed, unchanged = pipeline.select_changed(contracts)
+    assert len(changed) == 3 and not unchanged
+    results = asyncio.run(run(changed))
+    assert all(r["input_fingerprint"].startswith("sha256:") for r in results)
+    assert len(pipeline.result_store.get_fingerprints([c["contract_id"] for c in contracts])) == 3
+    print("✅ 3 contracts evaluated and fingerprinted")
+    
+    # 2. Nothing changed: nothing to do, even if a file is touched
+    print("\n[2/3] Re-running unchanged portfolio...")
+    reviews = data_dir / "reviews" / "CNT-2024-002_reviews.md"
+    os.utime(reviews, ns=(reviews.stat().st_atime_ns, reviews.stat().st_mtime_ns + 10 ** 9))
+    changed, unchanged = pipeline.select_changed(contracts)
+    assert not changed and len(unchanged) == 3
+    print("✅ All contracts skipped")
+    
+    # 3. Editing one source re-evaluates only that contract; force overrides
+    print("\n[3/3] Editing one contract's incidents...")
+    incidents = data_dir / "incidents" / "CNT-2024-001_incidents.json"
+    incidents.write_text(incidents.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    changed, unchanged = pipeline.select_changed(contracts)
+    assert [c["contract_id"] for c in changed] == ["CNT-2024-001"]
+    assert len(pipeline.select_changed(contracts, force=True)[0]) == 3
+    
+    # Narrative mode and prompt budgets change the output, so they count as inputs
+    contract = contracts[1]
+    assert pipeline.fingerprint(contract, "deterministic") != pipeline.fingerprint(contract, "llm")
+    config_path = Path(pipeline.config_path)
+    previous = config_path.stat().st_mtime_ns
+    config_path.write_text(config_path.read_text() + "prompt:\n  token_budget: 2000\n")
+    os.utime(config_path, ns=(previous + 10 ** 9, previous + 10 ** 9))
+    assert len(pipeline.select_changed(contracts)[0]) == 3
+    print("✅ Only the edited contract re-evaluated; config edits re-evaluate all")
+
+
+def test_batch_consumer_stops_early(tmp_path, slow_provider, counting_store, stub_agents):
+    """Results finished before the consumer went away are saved off the event loop"""
+    csv_handler = counting_store(str(tmp_path / "evaluations.csv"))
+    pipeline = EvaluationPipeline(
+        OrchestratorAgent(audit_log_path=str(tmp_path / "audit.jsonl")),
+        stub_agents(slow_provider(delay=0.05)),
+        csv_handler
+    )
+    contracts, _ = pipeline.load_contracts(folder="data/samples")
+    
+    save_threads = []
+    save_results = csv_handler.save_results
+    
+    def tracked_save(results):
+        save_threads.append(threading.current_thread())
+        save_results(results)
+    
+    csv_handler.save_results = tracked_save
+    
+    async def first_only():
+        results = BatchEvaluator(pipeline, concurrency=1).run(contracts)
+        first = await results.__anext__()
+        await results.aclose()
+        return first
+    
+    first = asyncio.run(first_only())
+    assert [r["contract_id"] for r in csv_handler.read_results()] == [first["contract_id"]]
+    assert save_threads and save_threads[0] is not threading.main_thread()
+    print("✅ Partial batch saved from a worker thread")
+
+
+def test_batch_preloads_bundles(tmp_path, slow_provider, counting_store, stub_config, stub_agents):
+    """Batch runs feed bundles preloaded by load_bundles() to the reasoning step"""
+    print("=" * 60)
+    print("Batch Bundle Preloading Test")
+    print("=" * 60)
+    
+    provider = slow_provider(delay=0)
+    agents = stub_agents(provider)
+    reasoning = ReasoningAgent(stub_config)
+    reasoning.llm_provider = provider
+    agents["reasoning"] = reasoning
+    pipeline = EvaluationPipeline(
+        OrchestratorAgent(audit_log_path=str(tmp_path / "audit.jsonl")),
+        agents,
+        counting_store(str(tmp_path / "evaluations.csv"))
+    )
+    contracts, _ = pipeline.load_contracts(folder="data/samples")
+    
+    preloaded = []
+    load_bundles = reasoning.loader.load_bundles
+    
+    def tracked_load_bundles(contract_ids, **kwargs):
+        for bundle in load_bundles(contract_ids, **kwargs):
+            preloaded.append(bundle)
+            yield bundle
+    
+    received = {}
+    aevaluate = reasoning.aevaluate
+    
+    async def tracked_aevaluate(contract_id, bundle=None, **kwargs):
+        received[contract_id] = bundle
+        return await aevaluate(contract_id, bundle=bundle, **kwargs)
+    
+    reasoning.loader.load_bundles = tracked_load_bundles
+    reasoning.aevaluate = tracked_aevaluate
+    
+    print("\n[1/1] Running a batch with a reasoning agent...")
+    
+    async def collect():
+        evaluator = BatchEvaluator(pipeline, concurrency=2, loader_threads=2, loader_processes=0)
+        return [r async for r in evaluator.run(contracts)]
+    
+    results = asyncio.run(collect())
+    assert len(results) == 3
+    assert sorted(received) == sorted(c["contract_id"] for c in contracts)
+    for contract_id, bundle in received.items():
+        assert any(bundle is loaded for loaded in preloaded)  # The preloaded object itself
+        assert bundle.contract_id == contract_id
+        assert bundle.loaded_sources()  # Read before evaluation started
+    print(f"✅ {len(received)} contracts reasoned over preloaded bundles")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
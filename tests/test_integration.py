@@ -18,7 +18,7 @@ from src.agents import (
 from src.utils import CSVOutputHandler
 
 
-def test_integration():
+def test_integration(tmp_path):
     """Test full integration with all 3 sample contracts"""
     print("=" * 60)
     print("Phase 4 - Integration Test")
@@ -26,7 +26,7 @@ def test_integration():
     
     # Initialize components
     print("\n[1/4] Initializing system...")
-    orchestrator = OrchestratorAgent()
+    orchestrator = OrchestratorAgent(audit_log_path=str(tmp_path / "audit_logs.jsonl"))
     csv_handler = CSVOutputHandler()
     
     agents = {
@@ -81,7 +81,8 @@ def test_integration():
     print(f"   ✅ CSV file: {len(csv_results)} records")
     
     # Check audit log
-    audit_log_path = Path("data/audit_logs.jsonl")
+    orchestrator.audit_writer.flush()
+    audit_log_path = tmp_path / "audit_logs.jsonl"
     if audit_log_path.exists():
         with open(audit_log_path, 'r') as f:
             audit_entries = len(f.readlines())
@@ -106,7 +107,7 @@ def test_integration():
     print("=" * 60)
     print(f"\nOutputs:")
     print(f"  • CSV: data/evaluations.csv ({len(csv_results)} records)")
-    print(f"  • Audit Log: data/audit_logs.jsonl")
+    print(f"  • Audit Log: {audit_log_path}")
     print(f"  • 3 contracts evaluated successfully")
     print(f"  • System ready for production demo")
     
@@ -114,5 +115,7 @@ def test_integration():
 
 
 if __name__ == "__main__":
-    success = test_integration()
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        success = test_integration(Path(tmp))
     sys.exit(0 if success else 1)
@@ -0,0 +1,101 @@
+"""
+Test Incremental JSON Parser
+Verifies streamed field events and truncation repair for reasoning responses
+"""
+import sys
+import json
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agents import ReasoningAgent
+from src.utils import IncrementalJSONParser
+
+
+DOCUMENT = {
+    "reasoning_chain": [
+        "Step 1: Uptime averaged 99.1% against a 99.5% target",
+        "Step 2: Two \"critical\" incidents {P1}, both resolved [within SLA]",
+        "Step 3: Vendor café costs rose 4% \U0001F4C8 year on year"
+    ],
+    "performance_assessment": {"score": 82.5, "trend": -0.4, "flags": [True, False, None]},
+    "recommendation": "RENEW",
+    "confidence_level": "HIGH",
+    "justification": "Line one\nLine two"
+}
+
+
+def test_json_stream(stub_config):
+    """Values are reported as they close and cut-off responses stay usable"""
+    print("=" * 60)
+    print("Incremental JSON Parser Test")
+    print("=" * 60)
+    
+    response = "```json\n" + json.dumps(DOCUMENT, indent=2) + "\n```\nHope this helps!"
+    
+    # 1. One character at a time gives the same object as json.loads
+    print("\n[1/4] Feeding one character at a time...")
+    parser = IncrementalJSONParser()
+    events = []
+    for char in response:
+        events.extend(parser.feed(char))
+    
+    assert parser.complete and not parser.truncated
+    assert parser.result() == DOCUMENT
+    chain_events = [value for path, value in events if path[:1] == ("reasoning_chain",) and len(path) == 2]
+    assert chain_events == DOCUMENT["reasoning_chain"]
+    assert (("recommendation",), "RENEW") in events
+    assert (("performance_assessment", "score"), 82.5) in events
+    print(f"✅ {len(events)} values emitted, result matches json.loads")
+    
+    # 2. Each step is emitted before the next one starts streaming
+    print("\n[2/4] Checking event order...")
+    paths = [path for path, _ in events]
+    assert paths.index(("reasoning_chain", 0)) < paths.index(("reasoning_chain", 1))
+    assert paths.index(("reasoning_chain",)) < paths.index(("recommendation",))
+    assert paths[-1] == ()
+    print("✅ Events follow document order, root last")
+    
+    # 3. Every prefix parses into a usable object
+    print("\n[3/4] Repairing truncated responses...")
+    body = json.dumps(DOCUMENT)
+    for cut in range(1, len(body)):
+        parser = IncrementalJSONParser()
+        parser.feed(body[:cut])
+        partial = parser.result()
+        assert isinstance(partial, dict), cut
+        json.dumps(partial)
+    
+    cut = body.index("Step 3") + 10
+    parser = IncrementalJSONParser()
+    parser.feed(body[:cut])
+    partial = parser.result()
+    assert parser.truncated
+    assert partial["reasoning_chain"][:2] == DOCUMENT["reasoning_chain"][:2]
+    assert partial["reasoning_chain"][2] == "Step 3: Ve"
+    
+    parser = IncrementalJSONParser()
+    parser.feed('{"recommendation": "TERMINATE", "reasoning_chain": ["a", "b",], "confidence_level": "LOW"} {"x": 1}')
+    assert parser.result() == {"recommendation": "TERMINATE", "reasoning_chain": ["a", "b"], "confidence_level": "LOW"}
+    print(f"✅ {len(body) - 1} prefixes repaired; trailing commas and extra data ignored")
+    
+    # 4. ReasoningAgent keeps completed fields from a response cut off by max_tokens
+    print("\n[4/4] Parsing a truncated reasoning response...")
+    agent = ReasoningAgent(stub_config)
+    truncated = body[:body.index('"justification"') + 26]
+    result = agent._parse_llm_response(truncated)
+    assert result["reasoning_chain"] == DOCUMENT["reasoning_chain"]
+    assert result["recommendation"] == "RENEW"
+    assert result["confidence_level"] == "HIGH"
+    assert result["justification"] == "Line one"
+    
+    result = agent._parse_llm_response("The vendor should be terminated.")
+    assert result["recommendation"] == "TERMINATE"
+    assert result["confidence_level"] == "LOW"
+    print("✅ Completed fields kept, free text falls back to keyword extraction")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,138 @@
+"""
+Test LLM Response Cache
+Verifies memory/disk tiers, TTL, eviction, bypass, metrics and partial streams
+"""
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm import (
+    CachedLLMProvider,
+    LLMResponseCache,
+    cache_bypass,
+    get_llm_provider,
+    stream_completion
+)
+
+
+def test_llm_cache(tmp_path, slow_provider):
+    """Identical requests are served from cache; anything else misses"""
+    print("=" * 60)
+    print("LLM Response Cache Test")
+    print("=" * 60)
+    
+    db_path = str(tmp_path / "llm_cache.db")
+    stub = slow_provider(delay=0)
+    provider = CachedLLMProvider(stub, LLMResponseCache(db_path))
+    
+    # 1. Repeats hit memory; any change to the key misses
+    print("\n[1/5] Checking cache keys...")
+    assert provider.generate("prompt A") == stub.response
+    assert provider.generate("prompt A") == stub.response
+    assert stub.calls == 1
+    provider.generate("prompt A", temperature=0.5)
+    provider.generate("prompt A", max_tokens=64)
+    provider.generate("prompt B")
+    assert stub.calls == 4
+    print("✅ Keyed on prompt, temperature and max_tokens")
+    
+    # 2. A fresh process (new cache object) hits the disk tier
+    print("\n[2/5] Checking disk tier...")
+    restarted = CachedLLMProvider(stub, LLMResponseCache(db_path))
+    assert asyncio.run(restarted.agenerate("prompt A")) == stub.response
+    assert stub.calls == 4
+    assert restarted.cache.stats()["disk_hits"] == 1
+    print("✅ Disk hit served and promoted to memory")
+    
+    # 3. Expired entries are regenerated
+    print("\n[3/5] Checking TTL...")
+    expiring = CachedLLMProvider(stub, LLMResponseCache(str(tmp_path / "ttl.db"), ttl_seconds=0.05))
+    expiring.generate("prompt C")
+    time.sleep(0.1)
+    expiring.generate("prompt C")
+    assert stub.calls == 6
+    print("✅ Expired entry regenerated")
+    
+    # 4. Both tiers are bounded
+    print("\n[4/5] Checking eviction...")
+    cache = LLMResponseCache(str(tmp_path / "small.db"), max_memory_entries=2, max_disk_entries=3)
+    small = CachedLLMProvider(stub, cache)
+    for i in range(5):
+        small.generate(f"prompt {i}")
+    assert cache.trim() == 2
+    stats = cache.stats()
+    assert stats["memory_entries"] == 2 and stats["disk_entries"] == 3
+    print("✅ LRU tiers bounded")
+    
+    # 5. Bypass skips the lookup but refreshes the entry
+    print("\n[5/5] Checking bypass and metrics...")
+    with cache_bypass():
+        provider.generate("prompt A")
+    assert stub.calls == 12
+    stats = provider.cache.stats()
+    assert stats["bypassed"] == 1 and stats["memory_hits"] == 1 and stats["misses"] == 4
+    print(f"✅ Bypass working, hit rate {stats['hit_rate']}")
+
+
+def test_partial_streams(tmp_path, chunked_provider):
+    """Streams cut short are cached only when the consumer marks them complete"""
+    response = '{"reasoning_chain": ["a", "b"], "recommendation": "RENEW"}'
+    stub = chunked_provider(delay=0, response=response)
+    provider = CachedLLMProvider(stub, LLMResponseCache(str(tmp_path / "llm_cache.db")))
+    
+    # A consumer error (here on the first chunk) closes the stream early
+    for _ in range(2):
+        try:
+            for chunk in provider.stream("prompt"):
+                raise ValueError("on_step failed")
+        except ValueError:
+            pass
+    
+    async def fail_async():
+        try:
+            async for chunk in provider.astream("async prompt"):
+                raise ValueError("on_step failed")
+        except ValueError:
+            pass
+    
+    asyncio.run(fail_async())
+    assert stub.calls == 3
+    assert "".join(provider.stream("prompt")) == response
+    assert stub.calls == 4
+    
+    # Stopped early after done(): what was read is cached
+    with stream_completion() as completion:
+        stream = provider.stream("complete prompt")
+        first = next(stream)
+        completion.done()
+        stream.close()
+    assert list(provider.stream("complete prompt")) == [first]
+    assert stub.calls == 5
+    print("✅ Partial streams cached only after done()")
+
+
+def test_cache_config(tmp_path):
+    """The provider factory wraps providers when llm.cache is enabled"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        "llm:\n"
+        "  provider: ollama\n"
+        "  cache:\n"
+        "    enabled: true\n"
+        f"    db_path: {tmp_path / 'llm_cache.db'}\n"
+    )
+    first = get_llm_provider(str(config_path))
+    second = get_llm_provider(str(config_path))
+    assert isinstance(first, CachedLLMProvider)
+    assert first.cache is second.cache  # One shared cache per database
+    assert first.model_id() == "ollama:llama3.2:1b"
+    print("✅ Cache enabled from configuration")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
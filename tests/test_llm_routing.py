@@ -0,0 +1,200 @@
+"""
+Test LLM Provider Routing
+Verifies hedged requests, failover and circuit breaking across providers
+"""
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm import LLMProvider, RoutingLLMProvider
+
+
+class NamedStubProvider(LLMProvider):
+    """Stub provider with its own model id that can be made to fail"""
+    
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.response = f"answer from {name}"
+        self.calls = 0
+        self.cancelled = 0
+        self.chunks_sent = 0
+    
+    def generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        if self.fail:
+            self.calls += 1
+            time.sleep(self.delay)
+            raise RuntimeError(f"{self.name} is down")
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.response
+    
+    async def agenerate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        if self.fail:
+            self.calls += 1
+            await asyncio.sleep(self.delay)
+            raise RuntimeError(f"{self.name} is down")
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+            return self.response
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+    
+    def stream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0):
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        self.calls += 1
+        for i in range(0, len(self.response), 7):
+            self.chunks_sent += 1
+            yield self.response[i:i + 7]
+    
+    async def astream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0):
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        self.calls += 1
+        for i in range(0, len(self.response), 7):
+            await asyncio.sleep(self.delay)  # Per chunk
+            self.chunks_sent += 1
+            yield self.response[i:i + 7]
+    
+    def validate_health(self) -> bool:
+        return True
+    
+    def get_model_info(self) -> dict:
+        return {"provider": "stub", "model": self.name}
+    
+    def model_id(self) -> str:
+        return f"stub:{self.name}"
+
+
+def test_llm_routing():
+    """Slow providers are hedged, failed ones skipped and unhealthy ones circuit-broken"""
+    print("=" * 60)
+    print("LLM Provider Routing Test")
+    print("=" * 60)
+    
+    # 1. A primary slower than its p95 is hedged; the backup wins and the primary is cancelled
+    print("\n[1/6] Checking hedged requests...")
+    primary = NamedStubProvider("primary", delay=0.01)
+    backup = NamedStubProvider("backup", delay=0.01)
+    router = RoutingLLMProvider([primary, backup], min_samples=5, default_hedge_delay=None)
+    
+    async def warm_up_then_stall():
+        for _ in range(10):
+            assert await router.agenerate("warm-up") == "answer from primary"
+        primary.delay = 1.0  # Stalls far beyond its p95 of ~10ms
+        started = time.perf_counter()
+        answer = await router.agenerate("stalled")
+        return answer, time.perf_counter() - started
+    
+    answer, elapsed = asyncio.run(warm_up_then_stall())
+    assert answer == "answer from backup"
+    assert elapsed < 0.5, elapsed
+    assert primary.cancelled == 1
+    stats = router.stats()
+    assert stats["hedged"] == 1
+    assert stats["backends"]["stub:backup"]["hedges_won"] == 1
+    print(f"✅ Hedged after primary p95, answered in {elapsed:.3f}s")
+    
+    # 2. Errors fail over to the next provider (sync, async and streaming)
+    print("\n[2/6] Checking failover...")
+    primary = NamedStubProvider("primary", fail=True)
+    backup = NamedStubProvider("backup")
+    router = RoutingLLMProvider([primary, backup], failure_threshold=100)
+    assert router.generate("sync") == "answer from backup"
+    assert asyncio.run(router.agenerate("async")) == "answer from backup"
+    assert "".join(router.stream("stream")) == "answer from backup"
+    
+    async def collect():
+        return "".join([chunk async for chunk in router.astream("astream")])
+    
+    assert asyncio.run(collect()) == "answer from backup"
+    assert router.stats()["failovers"] == 4
+    print(f"✅ {router.stats()['failovers']} requests failed over to the backup")
+    
+    # 3. Streams hedge on time to first chunk and continue from the winner
+    print("\n[3/6] Checking hedged streams...")
+    slow = NamedStubProvider("slow", delay=1.0)
+    fast = NamedStubProvider("fast", delay=0.001)
+    router = RoutingLLMProvider([slow, fast], default_hedge_delay=0.05)
+    started = time.perf_counter()
+    assert asyncio.run(collect()) == "answer from fast"
+    assert time.perf_counter() - started < 0.5
+    print("✅ Stream served by the provider that answered first")
+    
+    # 4. Repeated failures open the circuit, which is probed again after recovery
+    print("\n[4/6] Checking circuit breaker...")
+    primary = NamedStubProvider("primary", fail=True)
+    backup = NamedStubProvider("backup")
+    router = RoutingLLMProvider([primary, backup], failure_threshold=3, recovery_seconds=0.2)
+    for _ in range(6):
+        assert router.generate("call") == "answer from backup"
+    assert primary.calls == 3  # Skipped once its circuit opened
+    assert router.stats()["backends"]["stub:primary"]["circuit"] == "open"
+    
+    time.sleep(0.25)
+    primary.fail = False
+    assert router.generate("probe") == "answer from primary"
+    assert router.stats()["backends"]["stub:primary"]["circuit"] == "closed"
+    
+    backup.fail = True
+    primary.fail = True
+    router = RoutingLLMProvider([primary, backup], failure_threshold=1, recovery_seconds=60)
+    for _ in range(2):
+        try:
+            router.generate("all down")
+            assert False, "Expected RuntimeError"
+        except RuntimeError as e:
+            message = str(e)
+    assert "unavailable" in message  # Fails fast once every circuit is open
+    assert router.stats()["unavailable"] == 1
+    print(f"✅ Circuit opened after 3 failures and closed after a successful probe")
+    
+    # 5. A recovered backup that was never tried keeps its probe for the next failover
+    print("\n[5/6] Checking probes are only claimed when a provider is tried...")
+    primary = NamedStubProvider("primary", fail=True)
+    backup = NamedStubProvider("backup", fail=True)
+    router = RoutingLLMProvider([primary, backup], failure_threshold=1, recovery_seconds=0.2)
+    try:
+        router.generate("both down")
+        assert False, "Expected RuntimeError"
+    except RuntimeError:
+        pass
+    
+    time.sleep(0.25)
+    primary.fail = False
+    assert router.generate("primary back") == "answer from primary"
+    assert asyncio.run(router.agenerate("primary back")) == "answer from primary"
+    assert "".join(router.stream("primary back")) == "answer from primary"
+    assert asyncio.run(collect()) == "answer from primary"
+    assert router.stats()["backends"]["stub:backup"]["circuit"] == "open"  # Not half-open
+    
+    primary.fail = True
+    backup.fail = False
+    assert router.generate("primary down") == "answer from backup"
+    assert router.stats()["backends"]["stub:backup"]["circuit"] == "closed"
+    print("✅ Backup probed on the next failover after the primary answered")
+    
+    # 6. After a late failure, the hedge timer restarts for the provider now in flight
+    print("\n[6/6] Checking hedge delay after failover...")
+    primary = NamedStubProvider("primary", delay=0.15, fail=True)
+    backup = NamedStubProvider("backup", delay=0.1)
+    spare = NamedStubProvider("spare")
+    router = RoutingLLMProvider([primary, backup, spare], default_hedge_delay=0.2, failure_threshold=100)
+    assert asyncio.run(router.agenerate("late failure")) == "answer from backup"
+    assert router.generate("late failure") == "answer from backup"
+    assert spare.calls == 0
+    assert router.stats()["hedged"] == 0
+    print("✅ Backup given its own hedge delay from its launch")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
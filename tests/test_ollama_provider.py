@@ -0,0 +1,138 @@
+"""
+Test Ollama Provider
+Verifies connection reuse, retries and streaming against a local stub server
+"""
+import sys
+import json
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm import OllamaProvider
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    """Answers /api/generate, failing the first `failures` requests with 503"""
+    
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+            server.client_ports.add(self.client_address[1])
+            fail = server.failures > 0
+            if fail:
+                server.failures -= 1
+        
+        if fail:
+            payload, status = b'{"error": "overloaded"}', 503
+        elif body.get("stream"):
+            self._stream_words(body["prompt"])
+            return
+        else:
+            payload, status = json.dumps({"response": f" echo: {body['prompt']} "}).encode(), 200
+        
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def _stream_words(self, prompt: str):
+        """Send one NDJSON line per word using chunked transfer encoding"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        
+        lines = [{"response": word + " ", "done": False} for word in prompt.split()]
+        lines.append({"response": "", "done": True})
+        for line in lines:
+            data = (json.dumps(line) + "\n").encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllamaHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.failures = 0
+    server.client_ports = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_ollama_provider():
+    """Requests reuse pooled connections and retry transient failures"""
+    print("=" * 60)
+    print("Ollama Provider Test")
+    print("=" * 60)
+    
+    server = _start_server()
+    provider = OllamaProvider(
+        model="stub",
+        base_url=f"http://127.0.0.1:{server.server_address[1]}",
+        pool_size=2,
+        retry_backoff=0.01
+    )
+    
+    try:
+        # 1. Sequential calls share one keep-alive connection
+        print("\n[1/4] Checking connection reuse...")
+        for i in range(5):
+            assert provider.generate(f"prompt {i}") == f"echo: prompt {i}"
+        assert len(server.client_ports) == 1
+        print("✅ 5 requests over 1 connection")
+        
+        # 2. 5xx responses are retried with backoff
+        print("\n[2/4] Checking retries...")
+        server.failures = 2
+        assert provider.generate("retry me") == "echo: retry me"
+        server.failures = 3
+        try:
+            provider.generate("give up")
+            assert False, "Expected RuntimeError"
+        except RuntimeError as e:
+            assert "503" in str(e)
+        server.failures = 0
+        print("✅ Transient 503s retried, persistent ones raised")
+        
+        # 3. Async path pools and retries the same way
+        print("\n[3/4] Checking async client...")
+        server.client_ports.clear()
+        server.failures = 1
+        
+        async def run():
+            return await asyncio.gather(*(provider.agenerate(f"async {i}") for i in range(6)))
+        
+        results = asyncio.run(run())
+        assert results == [f"echo: async {i}" for i in range(6)]
+        assert len(server.client_ports) <= 2  # Bounded by pool_size
+        print(f"✅ 6 concurrent requests over {len(server.client_ports)} connection(s)")
+        
+        # 4. Streaming yields each NDJSON chunk as it arrives
+        print("\n[4/4] Checking streaming...")
+        assert list(provider.stream("one two three")) == ["one ", "two ", "three "]
+        
+        async def collect():
+            return [chunk async for chunk in provider.astream("four five")]
+        
+        assert asyncio.run(collect()) == ["four ", "five "]
+        print("✅ Sync and async streams yield one chunk per line")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_ollama_provider()
@@ -0,0 +1,95 @@
+"""
+Test Columnar Performance Store
+Verifies compaction, downcast dtypes, zero-copy reads and the CSV fallback
+for changed files
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+from src.ingestion import DocumentLoader, PerformanceStore, compact_performance
+from src.ingestion import document_loader
+
+
+def test_performance_store(tmp_path, monkeypatch, write_sources):
+    """Compacted histories load without CSV parsing and in less memory"""
+    print("=" * 60)
+    print("Columnar Performance Store Test")
+    print("=" * 60)
+    
+    contract_ids = [f"CNT-{i:03d}" for i in range(20)]
+    for contract_id in contract_ids:
+        write_sources(tmp_path, contract_id, months=60 if contract_id == "CNT-007" else 12)
+    store_path = tmp_path / "performance_store"
+    
+    # 1. Compaction downcasts every column
+    print("\n[1/4] Compacting 20 CSVs...")
+    stats = compact_performance(str(tmp_path / "performance"), str(store_path))
+    assert stats["contracts"] == 20 and stats["rows"] == 19 * 12 + 60
+    store = PerformanceStore(str(store_path))
+    history = store.load("CNT-007")
+    assert str(history["month"].dtype) == "period[M]"
+    assert history["uptime_pct"].dtype == np.float32
+    assert history["incidents_count"].dtype == np.int16
+    assert np.shares_memory(history["uptime_pct"].to_numpy(), store.columns("CNT-007")["uptime_pct"])
+    print(f"✅ {stats['csv_bytes']} CSV bytes stored as {stats['store_bytes']} bytes")
+    
+    # 2. Same values as the CSV, far less memory
+    print("\n[2/4] Comparing with the CSV...")
+    csv = pd.read_csv(tmp_path / "performance" / "CNT-007_history.csv")
+    assert history["month"].astype(str).tolist() == csv["month"].tolist()
+    assert np.allclose(history["uptime_pct"], csv["uptime_pct"], atol=1e-4)
+    assert history["critical_incidents"].tolist() == csv["critical_incidents"].tolist()
+    stored_bytes = history.memory_usage(deep=True).sum()
+    csv_bytes = csv.memory_usage(deep=True).sum()
+    assert stored_bytes * 2 < csv_bytes
+    print(f"✅ {stored_bytes} bytes per history instead of {csv_bytes}")
+    
+    # 3. DocumentLoader reads the store, never the CSVs
+    print("\n[3/4] Loading bundles through DocumentLoader...")
+    parses = {"count": 0}
+    original = pd.read_csv
+    
+    def counting_read_csv(*args, **kwargs):
+        parses["count"] += 1
+        return original(*args, **kwargs)
+    
+    monkeypatch.setattr(document_loader, "SOURCE_READERS", {
+        **document_loader.SOURCE_READERS,
+        "performance_history": ("performance data", counting_read_csv)
+    })
+    loader = DocumentLoader(str(tmp_path), performance_store=str(store_path))
+    bundles = list(loader.load_bundles(contract_ids, processes=0))
+    assert parses["count"] == 0
+    assert all(len(bundle["performance_history"]) in (12, 60) for bundle in bundles)
+    assert loader.load_contract_bundle("CNT-003")["data_completeness"] == 0.75
+    
+    portfolio = store.portfolio_frame(["uptime_pct", "incidents_count"])
+    assert len(portfolio) == stats["rows"]
+    assert portfolio.groupby("contract_id", observed=True).size()["CNT-007"] == 60
+    print("✅ 20 bundles and the portfolio table built without parsing a CSV")
+    
+    # 4. A CSV edited after compaction is parsed again until the next compaction
+    print("\n[4/4] Editing a CSV after compaction...")
+    csv_path = tmp_path / "performance" / "CNT-003_history.csv"
+    csv_path.write_text(csv_path.read_text() + "2025-01,90.0,9.0,9,3,2.0\n")
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert len(loader.load_contract_bundle("CNT-003")["performance_history"]) == 13
+    assert parses["count"] == 1
+    
+    compact_performance(str(tmp_path / "performance"), str(store_path))
+    assert len(loader.load_contract_bundle("CNT-003")["performance_history"]) == 13
+    assert parses["count"] == 1
+    assert len(list(store_path.glob("*.npy"))) == len(csv.columns)  # Old generation removed
+    print("✅ Stale copy skipped, rebuilt store picked up")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
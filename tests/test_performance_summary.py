@@ -0,0 +1,76 @@
+"""
+Test Performance Summarizer
+Verifies multi-resolution breakdowns, trend slopes and change points for
+long performance histories
+"""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from src.ingestion import PerformanceSummarizer
+from src.ingestion.performance_summary import least_squares_slopes
+
+
+def test_performance_summary(performance_history):
+    """Long histories are rolled up; every metric gets a trend line"""
+    print("=" * 60)
+    print("Performance Summarizer Test")
+    print("=" * 60)
+    
+    summarizer = PerformanceSummarizer()
+    df = performance_history()
+    text = summarizer.summarize(df)
+    
+    # 1. Recent months monthly, then quarters, then years
+    print("\n[1/4] Checking resolutions...")
+    yearly = text.split("Yearly Breakdown:\n")[1].split("\n\n")[0].splitlines()
+    quarterly = text.split("Quarterly Breakdown:\n")[1].split("\n\n")[0].splitlines()
+    monthly = text.split("Monthly Breakdown:\n")[1].rstrip().splitlines()
+    assert [line.split(":")[0].strip() for line in yearly] == ["2019", "2020", "2021"]
+    assert quarterly[0].startswith("  2022-Q1:") and len(quarterly) == 8
+    assert monthly[0].startswith("  2024-01:") and len(monthly) == 12
+    assert "24 incidents (1 critical)" in yearly[0]  # Sums per year
+    assert "Response 2.3h" in yearly[0]  # Mean of 2.00 .. 2.55
+    assert "PERFORMANCE HISTORY (72 months, 2019-01 to 2024-12)" in text
+    print(f"✅ 72 months in {len(yearly) + len(quarterly) + len(monthly)} breakdown lines")
+    
+    # 2. Slopes match a per-column polyfit
+    print("\n[2/4] Checking slopes...")
+    values = df[["uptime_pct", "avg_response_hours", "incidents_count"]].to_numpy(dtype=float)
+    expected = [np.polyfit(np.arange(len(df)), values[:, i], 1)[0] for i in range(3)]
+    assert np.allclose(least_squares_slopes(values), expected)
+    assert "- Response Time: DECLINING (+0.05h/month" in text
+    assert "- User Satisfaction: STABLE (+0.00/month, volatility 0.00)" in text
+    print("✅ Least-squares slopes correct")
+    
+    # 3. The uptime step is found at the right month
+    print("\n[3/4] Checking change points...")
+    split, before, after = summarizer.change_points(df[["uptime_pct", "user_satisfaction"]].to_numpy(dtype=float))
+    assert split.tolist() == [40, -1]
+    assert abs(before[0] - 99.5) < 0.1 and abs(after[0] - 96.0) < 0.1
+    assert "- Uptime: DECLINING" in text and "shifted at 2022-05 from 99.5% to 96.0% average" in text
+    print("✅ Uptime shift detected at 2022-05, none for flat satisfaction")
+    
+    # 4. Short histories stay monthly, unusual labels still roll up
+    print("\n[4/4] Checking short and unlabeled histories...")
+    short = summarizer.summarize(df.tail(6))
+    assert "Quarterly" not in short and "shifted" not in short.split("- Response Time")[1].split("\n")[0]
+    assert short.count("\n  2024-") == 6
+    assert "Trends" not in summarizer.summarize(df.head(1))
+    assert summarizer.summarize(None) == "No performance data available."
+    
+    levels = [summarizer.summarize(df, level) for level in range(4)]
+    assert [len(text) for text in levels] == sorted((len(text) for text in levels), reverse=True)
+    assert "Breakdown" not in levels[3] and "Trends" in levels[3]
+    
+    odd = df.assign(month=[f"M{i}" for i in range(len(df))])
+    assert "  M0 to M11:" in summarizer.summarize(odd)
+    print("✅ Edge cases handled")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
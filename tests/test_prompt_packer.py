@@ -0,0 +1,104 @@
+"""
+Test Prompt Packer
+Verifies token counting, sentence-safe truncation and priority-based packing
+of the reasoning prompt
+"""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agents import ReasoningAgent
+from src.prompts import PromptPacker, count_tokens
+from src.prompts.packer import TRUNCATION_NOTE, truncate_to_tokens
+
+
+TEMPLATE = "HEADER\n{high}\n---\n{middle}\n---\n{low}\nFOOTER"
+SECTIONS = {
+    "high": {"priority": 3, "budget": 60},
+    "middle": {"priority": 2, "budget": 60},
+    "low": {"priority": 1, "budget": 60}
+}
+
+
+def _prose(sentences: int, word: str) -> str:
+    return " ".join(f"{word} sentence number {i} ends here." for i in range(sentences))
+
+
+def test_prompt_packer(tmp_path, slow_provider, stub_config, write_sources, performance_history):
+    """Prompts stay within budget, losing low-priority detail first"""
+    print("=" * 60)
+    print("Prompt Packer Test")
+    print("=" * 60)
+    
+    # 1. Token estimates
+    print("\n[1/4] Counting tokens...")
+    assert count_tokens("") == 0
+    assert count_tokens("Uptime 99.2%") == 5  # Uptime, 99, ., 2, %
+    assert count_tokens("availability") == 2
+    assert count_tokens("a\nb") == count_tokens("a") + count_tokens("b")
+    print("✅ Local token estimates")
+    
+    # 2. Truncation keeps whole sentences
+    print("\n[2/4] Truncating prose...")
+    text = _prose(20, "Review")
+    cut = truncate_to_tokens(text, 40)
+    assert count_tokens(cut) <= 40 and cut.endswith(TRUNCATION_NOTE)
+    kept = cut[:-len(TRUNCATION_NOTE)].strip()
+    assert kept.endswith("ends here.") and text.startswith(kept)
+    assert truncate_to_tokens("line one\nline two\nline three", 3) == "line one"  # No room for the note
+    print(f"✅ Cut after {kept.count('ends here.')} whole sentences")
+    
+    # 3. Compact renderings first, lowest priority shrinks first, spare tokens reused
+    print("\n[3/4] Packing sections...")
+    packer = PromptPacker(TEMPLATE, token_budget=140, sections=SECTIONS)
+    calls = []
+    
+    def compact():
+        calls.append("compact")
+        return "High compact."
+    
+    prompt, report = packer.pack({
+        "high": [_prose(20, "High"), compact],
+        "middle": _prose(3, "Middle"),
+        "low": _prose(20, "Low")
+    })
+    assert report["tokens"] == count_tokens(prompt) <= 140
+    assert report["sections"]["high"]["level"] == 1 and not report["sections"]["high"]["truncated"]
+    assert report["sections"]["middle"] == {"tokens": count_tokens(_prose(3, "Middle")), "level": 0, "truncated": False}
+    assert report["sections"]["low"]["truncated"]
+    assert calls == ["compact"]  # Measured once, reused across passes
+    
+    roomy, report = PromptPacker(TEMPLATE, token_budget=1000, sections=SECTIONS).pack({
+        "high": [_prose(20, "High"), "High compact."],
+        "middle": "Middle.",
+        "low": _prose(20, "Low")
+    })
+    assert report["sections"]["high"]["level"] == 0  # Spare tokens restore full detail
+    assert report["sections"]["low"]["tokens"] > 60
+    assert report["tokens"] <= 1000
+    print(f"✅ Tight budget: {report['tokens']} tokens; high priority restored when room allows")
+    
+    # 4. Reasoning prompt for a long history and a long review
+    print("\n[4/4] Packing a reasoning prompt...")
+    write_sources(tmp_path, "CNT-LONG")
+    performance_history(96).to_csv(tmp_path / "performance" / "CNT-LONG_history.csv", index=False)
+    (tmp_path / "reviews" / "CNT-LONG_reviews.md").write_text("# Review\n\n" + _prose(400, "Reviewer"))
+    
+    agent = ReasoningAgent(stub_config)
+    agent.loader.base_path = tmp_path
+    _, prompt, tokens = agent._prepare_prompt("CNT-LONG")
+    assert tokens == count_tokens(prompt) <= 3500
+    assert "Summary Statistics" in prompt and "Trends (" in prompt
+    assert prompt.count("Reviewer sentence") < 400 and TRUNCATION_NOTE in prompt
+    
+    agent.llm = slow_provider(delay=0, response='{"recommendation": "RENEW", "justification": "Strong."}')
+    result = agent.evaluate("CNT-LONG")
+    assert result["prompt_tokens"] == tokens
+    print(f"✅ 96-month history and long review packed into {tokens} tokens")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,122 @@
+"""
+Test Provider Registry
+Verifies config caching, shared provider instances, hot reload and task profiles
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import yaml
+from src.agents import PerformanceAnalysisAgent, RiskAssessmentAgent, ReasoningAgent
+from src.llm import get_llm_config, get_llm_provider, get_task_timeouts, load_config
+from src.llm.config import _providers
+
+
+def _write(config_path: Path, model: str) -> None:
+    """Write an Ollama config and move its mtime forward"""
+    previous = config_path.stat().st_mtime_ns if config_path.exists() else 0
+    config_path.write_text(
+        "llm:\n"
+        "  provider: ollama\n"
+        "  ollama:\n"
+        f"    model: {model}\n"
+        "    temperature: 0.2\n"
+    )
+    os.utime(config_path, ns=(previous + 10 ** 9, previous + 10 ** 9))
+
+
+def test_provider_registry(tmp_path, monkeypatch, slow_provider):
+    """Agents share one provider; config edits apply without a restart"""
+    print("=" * 60)
+    print("Provider Registry Test")
+    print("=" * 60)
+    
+    monkeypatch.delenv("OLLAMA_MODEL", raising=False)
+    config_path = tmp_path / "config.yaml"
+    _write(config_path, "model-a")
+    
+    parses = {"count": 0}
+    original_load = yaml.safe_load
+    
+    def counting_load(stream):
+        parses["count"] += 1
+        return original_load(stream)
+    
+    monkeypatch.setattr(yaml, "safe_load", counting_load)
+    
+    # 1. One parse and one provider shared by every agent
+    print("\n[1/4] Building agents...")
+    agents = [cls(str(config_path)) for cls in (PerformanceAnalysisAgent, RiskAssessmentAgent, ReasoningAgent)]
+    providers = {id(agent.llm_provider) for agent in agents}
+    assert len(providers) == 1
+    assert parses["count"] == 1
+    assert agents[0].llm_config["temperature"] == 0.2
+    assert agents[2].llm_config["temperature"] == 0.3  # Reasoning default without a profile
+    first_provider = agents[0].llm_provider
+    print("✅ Config parsed once, provider shared by 3 agents")
+    
+    # 2. Editing the file switches every agent to the new provider
+    print("\n[2/4] Editing config.yaml...")
+    _write(config_path, "model-b")
+    assert all(agent.llm_provider.model_id() == "ollama:model-b" for agent in agents)
+    assert parses["count"] == 2
+    assert all(provider is not first_provider for provider in _providers.values())  # Stale stack evicted
+    assert load_config(str(config_path))["llm"]["ollama"]["model"] == "model-b"
+    print("✅ Hot reload picked up the new model")
+    
+    # 3. Assigned providers are pinned; cached config cannot be mutated
+    print("\n[3/4] Checking overrides...")
+    stub = slow_provider(delay=0)
+    agents[2].llm = stub
+    assert agents[2].llm_provider is stub
+    assert agents[0].llm_provider is get_llm_provider(str(config_path))
+    load_config(str(config_path))["llm"]["provider"] = "gemini"
+    assert load_config(str(config_path))["llm"]["provider"] == "ollama"
+    print("✅ Overrides pinned, cached config isolated")
+    
+    # 4. Task profiles pick a model, token cap and timeout per agent
+    print("\n[4/4] Checking task profiles...")
+    previous = config_path.stat().st_mtime_ns
+    config_path.write_text(
+        "llm:\n"
+        "  provider: ollama\n"
+        "  ollama:\n"
+        "    model: strong-model\n"
+        "    max_tokens: 4096\n"
+        "  profiles:\n"
+        "    performance_justification:\n"
+        "      model: small-model\n"
+        "      max_tokens: 150\n"
+        "    risk_reason:\n"
+        "      model: small-model\n"
+        "      max_tokens: 150\n"
+        "      timeout: 5\n"
+        "    reasoning:\n"
+        "      temperature: 0.3\n"
+        "      timeout: 60\n"
+    )
+    os.utime(config_path, ns=(previous + 10 ** 9, previous + 10 ** 9))
+    agents[2].llm = None
+    
+    assert [agent.llm_provider.model_id() for agent in agents] == [
+        "ollama:small-model", "ollama:small-model", "ollama:strong-model"
+    ]
+    monkeypatch.setenv("OLLAMA_MODEL", "env-model")  # As in .env.example
+    assert [agent.llm_provider.model_id() for agent in agents] == [
+        "ollama:small-model", "ollama:small-model", "ollama:env-model"
+    ]  # Replaces the base model only; profile models still win
+    assert agents[0].llm_provider is agents[1].llm_provider  # Same effective settings
+    assert agents[0].llm_config["max_tokens"] == 150
+    assert agents[2].llm_config["max_tokens"] == 4096
+    assert agents[2].llm_config["temperature"] == 0.3
+    assert get_llm_config(str(config_path))["max_tokens"] == 4096  # No task, no profile
+    assert get_task_timeouts(str(config_path)) == {"risk_reason": 5, "reasoning": 60}
+    print("✅ Short tasks on the small model, reasoning on the strong one")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
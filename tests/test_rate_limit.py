@@ -0,0 +1,200 @@
+"""
+Test LLM Rate Limiter
+Verifies pacing, priority scheduling, 429 backoff and queue metrics
+"""
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm import (
+    BATCH,
+    INTERACTIVE,
+    LLMProvider,
+    RateLimitedLLMProvider,
+    RateLimiter,
+    RateLimitError,
+    get_llm_provider,
+    request_priority
+)
+from src.llm.config import _with_rate_limit
+from src.llm.rate_limit import parse_retry_after
+
+
+class QuotaStubProvider(LLMProvider):
+    """Stub provider that answers 429 to the first `rejections` calls"""
+    
+    def __init__(self, rejections: int = 0, retry_after: float = 0.2):
+        self.response = "ok"
+        self.calls = 0
+        self.rejections = rejections
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+    
+    def _check_quota(self):
+        with self.lock:
+            self.calls += 1
+            if self.rejections > 0:
+                self.rejections -= 1
+                raise RateLimitError("429 RESOURCE_EXHAUSTED", self.retry_after)
+    
+    def generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        self._check_quota()
+        return self.response
+    
+    async def agenerate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        self._check_quota()
+        return self.response
+    
+    def validate_health(self) -> bool:
+        return True
+    
+    def get_model_info(self) -> dict:
+        return {"provider": "stub", "model": "stub"}
+
+
+def test_rate_limit():
+    """Requests are paced under budget, prioritized and paused on 429"""
+    print("=" * 60)
+    print("LLM Rate Limiter Test")
+    print("=" * 60)
+    
+    # 1. The burst is admitted at once, the rest at the refill rate
+    print("\n[1/4] Checking pacing...")
+    limiter = RateLimiter(requests_per_minute=1200)  # Burst of 120, then 18/s
+    started = time.perf_counter()
+    for _ in range(120):
+        limiter.acquire()
+    burst_elapsed = time.perf_counter() - started
+    for _ in range(9):
+        limiter.acquire()
+    paced_elapsed = time.perf_counter() - started - burst_elapsed
+    assert burst_elapsed < 0.1
+    assert 0.35 < paced_elapsed < 1.0, paced_elapsed
+    print(f"✅ Burst of 120 in {burst_elapsed:.3f}s, 9 more in {paced_elapsed:.2f}s")
+    
+    # 2. Interactive requests are admitted ahead of queued batch requests
+    print("\n[2/4] Checking priorities...")
+    limiter = RateLimiter(requests_per_minute=1200)
+    limiter.backoff(0.2)
+    order = []
+    order_lock = threading.Lock()
+    
+    def request(label, priority):
+        with request_priority(priority):
+            limiter.acquire()
+        with order_lock:
+            order.append(label)
+    
+    threads = [threading.Thread(target=request, args=(f"batch-{i}", BATCH)) for i in range(3)]
+    threads.append(threading.Thread(target=request, args=("interactive", INTERACTIVE)))
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert limiter.stats()["queued"] == {"interactive": 1, "batch": 3}
+    for thread in threads:
+        thread.join()
+    assert order[0] == "interactive", order
+    assert order[1:] == ["batch-0", "batch-1", "batch-2"], order
+    print(f"✅ Admission order: {order}")
+    
+    # 3. A 429 pauses every caller for Retry-After instead of each retrying
+    print("\n[3/4] Checking 429 backoff...")
+    stub = QuotaStubProvider(rejections=1, retry_after=0.3)
+    provider = RateLimitedLLMProvider(stub, RateLimiter(requests_per_minute=6000))
+    
+    async def run_many():
+        first = asyncio.create_task(provider.agenerate("first"))
+        await asyncio.sleep(0.05)  # First call has been rejected and paused the limiter
+        return await asyncio.gather(first, *(provider.agenerate(f"p{i}") for i in range(5)))
+    
+    started = time.perf_counter()
+    results = asyncio.run(run_many())
+    elapsed = time.perf_counter() - started
+    assert results == ["ok"] * 6
+    assert stub.calls == 7  # One rejection, then each request exactly once
+    assert elapsed >= 0.3
+    assert provider.limiter.stats()["rate_limited"] == 1
+    
+    stub = QuotaStubProvider(rejections=10, retry_after=0.01)
+    provider = RateLimitedLLMProvider(stub, RateLimiter(requests_per_minute=6000), max_retries=2)
+    try:
+        provider.generate("give up")
+        assert False, "Expected RateLimitError"
+    except RateLimitError:
+        pass
+    assert stub.calls == 3
+    print(f"✅ 6 requests finished in {elapsed:.2f}s after one 429; persistent 429s raised")
+    
+    # 4. Retry delays are read from provider error messages; metrics are reported
+    print("\n[4/4] Checking Retry-After parsing and metrics...")
+    assert parse_retry_after("429 RESOURCE_EXHAUSTED {'retryDelay': '37s'}") == 37.0
+    assert parse_retry_after('"retryDelay": "1.5s"') == 1.5
+    assert parse_retry_after("Retry-After: 20") == 20.0
+    assert parse_retry_after("500 Internal error") is None
+    
+    stats = provider.limiter.stats()
+    for key in ("granted", "queued", "rate_limited", "paused_seconds", "wait_seconds_mean", "requests_available"):
+        assert key in stats, key
+    assert "tokens_available" not in stats  # No token budget configured
+    print(f"✅ Metrics: {stats}")
+
+
+def test_rate_limit_disabled(tmp_path):
+    """Without budgets, 429s are still waited out and retried"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        "llm:\n"
+        "  provider: ollama\n"
+        "  rate_limit:\n"
+        "    enabled: false\n"
+    )
+    provider = get_llm_provider(str(config_path))
+    assert isinstance(provider, RateLimitedLLMProvider)
+    assert "requests_available" not in provider.limiter.stats()  # No budget enforced
+    
+    stub = QuotaStubProvider(rejections=2, retry_after=0.05)
+    provider = _with_rate_limit(stub, {"rate_limit": {"enabled": False}})
+    assert provider.generate("retried") == "ok"
+    assert stub.calls == 3
+    print("✅ 429s retried with the rate limiter disabled")
+
+
+def test_failed_calls_refunded(slow_provider):
+    """Errors, timeouts and cancellations give their reservation back"""
+    class FailingStubProvider(slow_provider):
+        def generate(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+            raise RuntimeError("500 Internal error")
+    
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=6000)  # 6 requests, 600 tokens at once
+    provider = RateLimitedLLMProvider(FailingStubProvider(delay=1.0), limiter)
+    
+    try:
+        provider.generate("fails", max_tokens=500)
+        assert False, "Expected RuntimeError"
+    except RuntimeError:
+        pass
+    
+    async def timed_out():
+        try:
+            await asyncio.wait_for(provider.agenerate("too slow", max_tokens=500), timeout=0.05)
+            assert False, "Expected TimeoutError"
+        except asyncio.TimeoutError:
+            pass
+    
+    asyncio.run(timed_out())
+    stats = limiter.stats()
+    assert stats["granted"] == 2
+    assert stats["requests_available"] == 6
+    assert stats["tokens_available"] == 600
+    print("✅ Failed and timed-out calls refunded their request and tokens")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
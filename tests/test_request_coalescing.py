@@ -0,0 +1,136 @@
+"""
+Test Request Coalescing
+Verifies concurrent identical evaluations share one in-flight run
+"""
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agents import OrchestratorAgent, ReasoningAgent
+from src.pipeline import EvaluationPipeline, SingleFlight
+
+
+CHAIN = ["Step 1: Uptime on target", "Step 2: One minor incident", "Step 3: Costs flat"]
+
+
+def test_request_coalescing(tmp_path, slow_provider, chunked_provider, counting_store, stub_config, stub_agents):
+    """Identical concurrent evaluations run once and all callers get the result"""
+    print("=" * 60)
+    print("Request Coalescing Test")
+    print("=" * 60)
+    
+    # 1. SingleFlight runs one computation per key and shares its outcome
+    print("\n[1/4] Checking single-flight semantics...")
+    flights = SingleFlight()
+    runs = {"count": 0}
+    
+    async def compute(value):
+        runs["count"] += 1
+        await asyncio.sleep(0.05)
+        if value == "bad":
+            raise ValueError("boom")
+        return value
+    
+    async def exercise():
+        same = await asyncio.gather(*(flights.do("a", lambda: compute("a")) for _ in range(5)))
+        other = await flights.do("b", lambda: compute("b"))
+        
+        failures = await asyncio.gather(
+            *(flights.do("bad", lambda: compute("bad")) for _ in range(3)), return_exceptions=True
+        )
+        
+        # A cancelled caller does not cancel the computation for the others
+        first = asyncio.ensure_future(flights.do("c", lambda: compute("c")))
+        second = asyncio.ensure_future(flights.do("c", lambda: compute("c")))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return same, other, failures, await second
+    
+    same, other, failures, survivor = asyncio.run(exercise())
+    assert [result for result, _ in same] == ["a"] * 5
+    assert [shared for _, shared in same] == [False, True, True, True, True]
+    assert other == ("b", False)
+    assert all(isinstance(f, ValueError) for f in failures)
+    assert survivor == ("c", True)
+    assert runs["count"] == 4
+    assert flights.stats() == {"executed": 4, "shared": 7, "in_flight": 0}
+    print(f"✅ {flights.stats()}")
+    
+    # 2. Concurrent evaluations of one contract share LLM calls and one save
+    print("\n[2/4] Evaluating the same contract 5 times concurrently...")
+    provider = slow_provider(delay=0.1)
+    agents = stub_agents(provider)
+    reasoning = ReasoningAgent(stub_config)
+    reasoning.llm = chunked_provider(delay=0.0, response=json.dumps({
+        "reasoning_chain": CHAIN,
+        "recommendation": "RENEW",
+        "confidence_level": "HIGH",
+        "justification": "Stub justification"
+    }))
+    agents["reasoning"] = reasoning
+    store = counting_store(str(tmp_path / "evaluations.csv"))
+    pipeline = EvaluationPipeline(
+        OrchestratorAgent(audit_log_path=str(tmp_path / "audit.jsonl")),
+        agents,
+        store
+    )
+    
+    with open("data/samples/vendor_abc_it_solutions.json", "r") as f:
+        contract = json.load(f)
+    
+    async def evaluate_many():
+        return await asyncio.gather(*(pipeline.aevaluate(contract) for _ in range(5)))
+    
+    results = asyncio.run(evaluate_many())
+    assert all(r["status"] == "completed" for r in results)
+    assert len({r["input_fingerprint"] for r in results}) == 1
+    assert provider.calls == 2  # Justification + risk reason, once
+    assert reasoning.llm.calls == 1
+    assert store.writes == 1
+    results[1]["recommendation"] = "CHANGED"
+    assert results[0]["recommendation"] == "RENEW"  # Callers get independent copies
+    print(f"✅ 5 requests, {provider.calls + reasoning.llm.calls} LLM calls, {store.writes} save")
+    
+    # 3. A caller joining mid-stream still receives every reasoning step
+    print("\n[3/4] Joining an evaluation that is already streaming...")
+    leader_steps, joiner_steps = [], []
+    reasoning.llm.delay = 0.01
+    
+    async def join_late():
+        leader = asyncio.ensure_future(pipeline.aevaluate(
+            contract, on_reasoning_step=lambda i, s: leader_steps.append((i, s))
+        ))
+        while not leader_steps:
+            await asyncio.sleep(0)
+        joiner = pipeline.aevaluate(contract, on_reasoning_step=lambda i, s: joiner_steps.append((i, s)))
+        return await asyncio.gather(leader, joiner)
+    
+    asyncio.run(join_late())
+    assert leader_steps == list(enumerate(CHAIN))
+    assert joiner_steps == list(enumerate(CHAIN))
+    assert reasoning.llm.calls == 2  # The previous run finished, so this is a fresh one
+    print(f"✅ Late joiner received all {len(joiner_steps)} steps")
+    
+    # 4. An interactive caller joining a batch run (save=False) still gets its result saved
+    print("\n[4/4] Joining an unsaved batch evaluation...")
+    writes = store.writes
+    
+    async def join_batch():
+        batch = asyncio.ensure_future(pipeline.aevaluate(contract, save=False))
+        await asyncio.sleep(0)
+        interactive = pipeline.aevaluate(contract)
+        return await asyncio.gather(batch, interactive)
+    
+    asyncio.run(join_batch())
+    assert reasoning.llm.calls == 3  # One shared run
+    assert store.writes == writes + 1
+    print("✅ Joiner saved the shared result")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,145 @@
+"""
+Test Result Store
+Verifies SQLite upserts, lookups, pagination and CSV export
+"""
+import sys
+import csv
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.storage import SQLiteResultStore, CSVResultStore
+from src.utils import CSVOutputHandler
+
+
+def _result(contract_id: str, score: float, recommendation: str = "RENEW") -> dict:
+    return {
+        "contract_id": contract_id,
+        "vendor_name": f"Vendor {contract_id}",
+        "timestamp": "2024-06-01T00:00:00Z",
+        "status": "completed",
+        "performance_score": score,
+        "risk_level": "LOW",
+        "recommendation": recommendation,
+        "justification": "Stub justification, with a comma",
+        "confidence_level": "HIGH",
+        "steps": [{"agent": "performance_analysis", "output": {"grade": "A"}}]
+    }
+
+
+def test_sqlite_result_store(tmp_path):
+    """SQLite store upserts by contract_id and exports the CSV format"""
+    print("=" * 60)
+    print("Result Store Test")
+    print("=" * 60)
+    
+    # 1. Existing CSV results are imported into a new database
+    print("\n[1/4] Importing legacy CSV...")
+    legacy_csv = tmp_path / "evaluations.csv"
+    CSVOutputHandler(str(legacy_csv)).save_result(_result("CNT-2023-015", 45.0, "TERMINATE"))
+    store = SQLiteResultStore(str(tmp_path / "evaluations.db"), str(legacy_csv))
+    assert store.count() == 1
+    print("✅ Legacy row imported")
+    
+    # 2. Upserts replace rows instead of duplicating them
+    print("\n[2/4] Upserting results...")
+    store.save_results([_result(f"CNT-2024-{i:03d}", 80.0 + i) for i in range(1, 6)])
+    store.save_result(_result("CNT-2024-003", 12.5, "TERMINATE"))
+    assert store.count() == 6
+    row = store.get_by_contract_id("CNT-2024-003")
+    assert row["performance_score"] == 12.5
+    assert row["recommendation"] == "TERMINATE"
+    assert row["grade"] == "A"
+    assert store.get_by_contract_id("CNT-0000-000") is None
+    print("✅ Upsert and primary-key lookup working")
+    
+    # 3. Paginated listing
+    print("\n[3/4] Paginating...")
+    page = store.list_results(limit=2, offset=2)
+    assert [r["contract_id"] for r in page] == ["CNT-2024-002", "CNT-2024-003"]
+    assert len(store.list_results()) == 6
+    print("✅ Pagination working")
+    
+    # 4. CSV export keeps the evaluations file format
+    print("\n[4/4] Exporting CSV...")
+    export_path = store.export_csv(str(tmp_path / "export.csv"))
+    with open(export_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    assert reader.fieldnames == CSVOutputHandler(str(legacy_csv)).fieldnames
+    assert len(rows) == 6
+    
+    csv_store = CSVResultStore(export_path)
+    assert csv_store.get_by_contract_id("CNT-2024-003")["justification"] == "Stub justification, with a comma"
+    
+    # Input fingerprints are stored, but never exported as a CSV column
+    fingerprinted = dict(_result("CNT-2024-007", 70.0), input_fingerprint="sha256:abc")
+    for backend in (store, csv_store):
+        backend.save_result(fingerprinted)
+        assert backend.get_fingerprints(["CNT-2024-007", "CNT-2024-001"]) == {"CNT-2024-007": "sha256:abc"}
+    with open(store.export_csv(str(tmp_path / "export2.csv")), newline="", encoding="utf-8") as f:
+        assert "input_fingerprint" not in csv.DictReader(f).fieldnames
+    with open(export_path, newline="", encoding="utf-8") as f:
+        assert "input_fingerprint" not in csv.DictReader(f).fieldnames
+    print(f"✅ Exported {len(rows)} rows to {Path(export_path).name}")
+
+
+
+def test_result_queries(tmp_path):
+    """Cursor pagination, filters, sorting and projection on both backends"""
+    print("=" * 60)
+    print("Result Query Test")
+    print("=" * 60)
+    
+    results = []
+    for i in range(1, 26):
+        result = _result(f"CNT-2024-{i:03d}", float(i * 4), ["RENEW", "MONITOR", "TERMINATE"][i % 3])
+        result["risk_level"] = ["LOW", "MEDIUM", "HIGH"][i % 3]
+        result["vendor_name"] = "Acme Corp" if i % 5 == 0 else f"Vendor {i}"
+        result["timestamp"] = f"2024-{(i % 12) + 1:02d}-15T10:00:00Z"
+        results.append(result)
+    
+    stores = {
+        "sqlite": SQLiteResultStore(str(tmp_path / "q.db"), str(tmp_path / "unused.csv")),
+        "csv": CSVResultStore(str(tmp_path / "q.csv"))
+    }
+    
+    for name, store in stores.items():
+        print(f"\n[{name}] Querying...")
+        store.save_results(results)
+        revision = store.revision()
+        
+        # Walk every page by score descending; no duplicates, no gaps
+        seen, cursor = [], None
+        while True:
+            page = store.query_results(sort="performance_score", descending=True, limit=7, cursor=cursor)
+            assert page["total"] == 25
+            seen.extend(row["contract_id"] for row in page["results"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert seen == [f"CNT-2024-{i:03d}" for i in range(25, 0, -1)]
+        
+        # Filters combine with AND
+        page = store.query_results(filters={"risk_level": ["HIGH"], "vendor": "acme"})
+        assert {row["contract_id"] for row in page["results"]} == {"CNT-2024-005", "CNT-2024-020"}
+        page = store.query_results(filters={"date_from": "2024-03-01", "date_to": "2024-03-15"})
+        assert {row["timestamp"][:7] for row in page["results"]} == {"2024-03"}
+        
+        # Projection only returns the requested columns
+        page = store.query_results(fields=["contract_id", "risk_level"], limit=3)
+        assert set(page["results"][0]) == {"contract_id", "risk_level"}
+        
+        # Writes change the revision used for ETags
+        store.save_result(dict(results[0], justification="Updated justification"))
+        assert store.revision() != revision
+        print(f"✅ {name}: pagination, filters, projection and revision working")
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_sqlite_result_store(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_result_queries(Path(tmp))
@@ -0,0 +1,92 @@
+"""
+Test Source File Cache
+Verifies DocumentLoader reuses parsed files until they change, loads
+bundle sources lazily and stays under its memory cap
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+from src.ingestion import DocumentLoader, SourceCache
+
+
+def _touch_forward(path: Path) -> None:
+    """Move a file's mtime forward so the edit is visible on coarse clocks"""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_source_cache(tmp_path, write_sources):
+    """Repeated bundles hit the cache; edits and the memory cap are respected"""
+    print("=" * 60)
+    print("Source File Cache Test")
+    print("=" * 60)
+    
+    write_sources(tmp_path, "CNT-1")
+    loader = DocumentLoader(str(tmp_path))
+    
+    # 1. Only consumed sources are read
+    print("\n[1/4] Loading a bundle lazily...")
+    bundle = loader.load_contract_bundle("CNT-1")
+    assert bundle["contract_id"] == "CNT-1"
+    assert bundle.loaded_sources() == []
+    assert bundle["data_completeness"] == 0.75  # No review file
+    history = bundle["performance_history"]
+    assert isinstance(history, pd.DataFrame) and len(history) == 3
+    assert bundle.loaded_sources() == ["performance_history"]
+    assert loader.cache.stats()["misses"] == 1
+    
+    full = dict(bundle)
+    assert full["past_reviews"] is None
+    assert full["incidents"][0]["title"] == "Slow ticket"
+    assert bundle.get("market_context") == "Industry uptime: 99.5%"
+    print("✅ Sources loaded on first access, completeness unchanged")
+    
+    # 2. Unchanged files are served from memory
+    print("\n[2/4] Reloading unchanged files...")
+    again = loader.load_contract_bundle("CNT-1")
+    assert again["performance_history"] is history
+    assert loader.cache.stats()["hits"] == 1
+    print("✅ Parsed DataFrame reused")
+    
+    # 3. An edited file is re-read
+    print("\n[3/4] Editing the performance history...")
+    csv_path = tmp_path / "performance" / "CNT-1_history.csv"
+    csv_path.write_text(csv_path.read_text() + "2024-04,97.0,5.0,4,1,3.5\n")
+    _touch_forward(csv_path)
+    edited = loader.load_contract_bundle("CNT-1")["performance_history"]
+    assert len(edited) == 4
+    
+    csv_path.unlink()
+    missing = loader.load_contract_bundle("CNT-1")
+    assert missing["performance_history"] is None
+    assert missing["data_completeness"] == 0.5
+    print("✅ Edits and deletions picked up")
+    
+    # 4. Least recently used histories are evicted under the cap
+    print("\n[4/4] Filling a small cache...")
+    for i in range(2, 6):
+        write_sources(tmp_path, f"CNT-{i}", months=200)
+    frame_size = SourceCache().get(tmp_path / "performance" / "CNT-2_history.csv", pd.read_csv).memory_usage(deep=True).sum()
+    small = DocumentLoader(str(tmp_path), cache_max_bytes=int(frame_size * 2.5))
+    
+    for i in range(2, 6):
+        small.load_contract_bundle(f"CNT-{i}")["performance_history"]
+    stats = small.cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 2
+    assert stats["bytes"] <= small.cache.max_bytes
+    
+    small.load_contract_bundle("CNT-5")["performance_history"]
+    small.load_contract_bundle("CNT-2")["performance_history"]
+    assert small.cache.stats()["hits"] == 1  # CNT-5 cached, CNT-2 evicted
+    print(f"✅ {stats['entries']} histories kept within {small.cache.max_bytes} bytes")
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))